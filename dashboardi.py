@@ -1,176 +1,247 @@
 import streamlit as st
-import sqlite3
+import time
+import numpy as np
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
+from collections import deque
 from datetime import datetime
+from tenis import analise, consultas, medicao
+from tenis.criar_banco import conectar, impressao_digital
+from tenis.estatisticas import montar_stats
+from tenis.graficos import linhas_gl
+from tenis.historico import (JANELA_FORMA, calcular_historico, carregar_historico, confronto_direto,
+                             desempenho_por_faixa, forma_recente)
+from tenis.importancia import resumir_importancia
+from tenis.importar_dados import ETAPAS_IMPORTACAO
+from tenis.tarefas import CONCLUIDA, ERRO, FINAIS, Importador
+from tenis.medicao import etapa
+from tenis.sequencias import MINIMO_MOMENTO, linha_do_tempo, resumir_sequencias
+
+# Cliente fino: leitura e análise ficam no pacote tenis (tenis/analise.py); aqui
+# só o cache por (filtro, geração), os widgets e as figuras.
 
 # Configuração do dashboard
 st.set_page_config(page_title="Análise de Tênis - Rodrigo", layout="wide")
 
-# Conexão com o banco de dados
-@st.cache_data
-def carregar_dados():
-    conn = sqlite3.connect('tenis_analises_db.db')
-    
-    # Carrega dados das partidas
-    partidas = pd.read_sql("SELECT * FROM partidas", conn)
-    
-    # Carrega dados dos rallys
-    rallys = pd.read_sql("""
-        SELECT 
-            partida_id, set_num, game_num, ponto_num,
-            ace, servidor, primeiro_servico, falha_servico,
-            devolucao_dentro, tipo_ponto, golpe_vencedor,
-            direcao_golpe, num_trocas, direcao_servico, placar
-        FROM rallys
-    """, conn)
-    
+# Os caches são chaveados por escalares: filtro + impressão digital do banco
+# (geração gravada pelo importar_dados e mtime), nunca pelo hash dos DataFrames.
+# Uma importação nova muda a chave; entradas antigas saem pelo limite de tamanho.
+MAX_ENTRADAS_CACHE = 32
+# Com a importação contínua (vigia.py), intervalo entre verificações da geração
+INTERVALO_ATUALIZACAO = 10
+# Enquanto uma importação enviada por upload roda, intervalo entre atualizações do progresso
+INTERVALO_IMPORTACAO = 1
+
+# Conexão com o banco de dados: só a partida (ou o set) escolhida é lida
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def carregar_dados(partida_id, set_num, chave_dados):
+    conn = conectar()
+    dados = analise.carregar_dados_partida(conn, partida_id, set_num, geracao=chave_dados[0])
     conn.close()
-    
-    return partidas, rallys
-
-# Processamento dos dados com nova lógica de placar
-@st.cache_data
-def processar_dados(partidas, rallys):
-    # Adiciona nome do jogador
-    partidas['jogador'] = 'Rodrigo R'
-    df = pd.merge(rallys, partidas, on='partida_id')
-    
-    # Calcula quem ganhou o ponto (0 = adversário, 1 = Rodrigo)
-    df['ganhador_ponto'] = df['ponto_num']
-    
-    # Nova lógica de placar - inicia em 00-00
-    def calcular_placar(df):
-        placar_sacador = 0
-        placar_receptor = 0
-        placares = []
-        
-        for idx, row in df.iterrows():
-            placares.append(f"{placar_sacador}-{placar_receptor}")
-            
-            if row['ganhador_ponto'] == row['servidor']:
-                # Ponto para o sacador
-                if placar_sacador == 0: placar_sacador = 15
-                elif placar_sacador == 15: placar_sacador = 30
-                elif placar_sacador == 30: placar_sacador = 40
-                elif placar_sacador == 40:
-                    if placar_receptor == 40: placar_sacador = 'ADV'
-                    elif placar_receptor == 'ADV': placar_sacador, placar_receptor = 40, 40
-                    else: placar_sacador = 'V'
-            else:
-                # Ponto para o receptor
-                if placar_receptor == 0: placar_receptor = 15
-                elif placar_receptor == 15: placar_receptor = 30
-                elif placar_receptor == 30: placar_receptor = 40
-                elif placar_receptor == 40:
-                    if placar_sacador == 40: placar_receptor = 'ADV'
-                    elif placar_sacador == 'ADV': placar_sacador, placar_receptor = 40, 40
-                    else: placar_receptor = 'V'
-            
-            if 'V' in [placar_sacador, placar_receptor]:
-                placar_sacador = placar_receptor = 0
-        
-        return placares
-    
-    # Aplica a nova lógica de placar para cada game
-    df['novo_placar'] = df.groupby(['partida_id', 'set_num', 'game_num']).apply(calcular_placar).explode().values
-    
-    # Estatísticas por jogador
-    def calcular_stats_jogador(df, jogador):
-        jogador_df = df[df['ganhador_ponto'] == jogador]
-        adversario_df = df[df['ganhador_ponto'] == 1 - jogador]
-        
-        stats = {
-            'total_pontos': len(jogador_df),
-            'total_erros': len(jogador_df[jogador_df['tipo_ponto'].str.contains('Erro', na=False)]),
-            'erros_backhand': len(jogador_df[jogador_df['golpe_vencedor'] == 'Backhand']),
-            'erros_forehand': len(jogador_df[jogador_df['golpe_vencedor'] == 'Forehand']),
-            'total_winners': len(jogador_df[jogador_df['tipo_ponto'] == 'Winner']),
-            'winners_backhand': len(jogador_df[(jogador_df['tipo_ponto'] == 'Winner') & 
-                                             (jogador_df['golpe_vencedor'] == 'Backhand')]),
-            'winners_forehand': len(jogador_df[(jogador_df['tipo_ponto'] == 'Winner') & 
-                                             (jogador_df['golpe_vencedor'] == 'Forehand')]),
-            'duplas_faltas': len(adversario_df[(adversario_df['tipo_ponto'] == 'Dupla Falta') & 
-                                             (adversario_df['falha_servico'] == 1)]),
-            'devolucao_fora': len(jogador_df[(jogador_df['servidor'] == 1 - jogador) & 
-                                           (jogador_df['devolucao_dentro'] == 0)]),
-            'pontos_saque': len(jogador_df[jogador_df['servidor'] == jogador]),
-            'pontos_recebimento': len(jogador_df[jogador_df['servidor'] == 1 - jogador])
-        }
-        
-        # Estatísticas de saque apenas para o jogador
-        if jogador == 1:
-            saque_jogador = df[df['servidor'] == jogador]
-            stats.update({
-                'pct_primeiro_servico': (saque_jogador['primeiro_servico'] == 1).mean() * 100,
-                'pct_pontos_1serv': (saque_jogador[saque_jogador['primeiro_servico'] == 1]['ganhador_ponto'] == jogador).mean() * 100,
-                'pct_pontos_2serv': (saque_jogador[saque_jogador['primeiro_servico'] == 0]['ganhador_ponto'] == jogador).mean() * 100,
-                'aces': saque_jogador['ace'].sum()
-            })
-        
-        return stats
-    
-    # Calcula estatísticas para ambos os jogadores
-    stats_rodrigo = calcular_stats_jogador(df, 1)
-    stats_adversario = calcular_stats_jogador(df, 0)
-    
-    # Heatmap de pressão
-    def calcular_pressao(placar):
-        try:
-            a, b = placar.split('-')
-            if a == 'ADV' or b == 'ADV':
-                return 'Vantagem'
-            elif a == b:
-                return 'Empate'
-            elif a.isdigit() and b.isdigit():
-                if int(a) > int(b):
-                    return 'Frente'
-                else:
-                    return 'Atras'
-            return 'Outro'
-        except:
-            return 'Outro'
-    
-    df['situacao_pressao'] = df['novo_placar'].apply(calcular_pressao)
-    heatmap_data = df.groupby(['situacao_pressao', 'ganhador_ponto']).size().unstack().fillna(0)
-    heatmap_data['Total'] = heatmap_data.sum(axis=1)
-    heatmap_data = heatmap_data.div(heatmap_data['Total'], axis=0) * 100
-    heatmap_data = heatmap_data.drop(columns='Total')
-    
-    # Sequência de pontos
-    df['sequencia'] = (df['ganhador_ponto'].diff() != 0).cumsum()
-    sequencia_pontos = df.groupby(['partida_id', 'set_num', 'sequencia', 'ganhador_ponto']).size().reset_index(name='count')
-    
-    return df, stats_rodrigo, stats_adversario, heatmap_data, sequencia_pontos
+    return dados
 
-# Carrega e processa os dados
-partidas, rallys = carregar_dados()
-df_full, stats_rodrigo, stats_adversario, heatmap_data, sequencia_pontos = processar_dados(partidas, rallys)
+# Placar, pressão e importância de cada ponto, e o heatmap de pressão
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def processar_dados(partida_id, set_num, chave_dados):
+    return analise.processar_partida(carregar_dados(partida_id, set_num, chave_dados), set_num)
+
+# Resumo por set (ou por game, com um set escolhido) para a aba de detalhamento
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def calcular_resumo(partida_id, set_num, chave_dados):
+    return analise.resumo_por_set(carregar_dados(partida_id, set_num, chave_dados), set_num)
+
+# Histórico de todas as partidas: uma linha por partida, mantida pela importação
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def carregar_dados_historico(chave_dados):
+    conn = conectar()
+    with etapa("dashboard.historico") as medida:
+        historico = carregar_historico(conn)
+        if historico.empty:
+            # Tabela ainda vazia (rode: python -m tenis.historico)
+            historico = calcular_historico(conn)
+        medida.linhas = len(historico)
+    conn.close()
+    return historico
+
+# ===== FIGURAS =====
+# Também em cache por (filtro, geração): um clique que não muda o filtro não refaz a
+# figura, e cada uma só é montada quando a sua seção é aberta. Linhas do tempo usam
+# WebGL com orçamento fixo de pontos (graficos.py), em vez de um ponto SVG por rally.
+# Fatores da aba Histórico: rótulo exibido -> coluna de Historico (faixas em historico.FAIXAS)
+FATORES = {
+    'Ranking do adversário': 'ranking_adversario',
+    'Cansaço pré-jogo': 'cansaco_pre_jogo',
+    'Qualidade do sono': 'qualidade_sono',
+    'Dias de descanso': 'dias_descanso',
+}
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def figuras_distribuicao(partida_id, set_num, jogador_selecionado, chave_dados):
+    _, _, estatisticas, _ = carregar_dados(partida_id, set_num, chave_dados)
+    stats = montar_stats(estatisticas, 1 if jogador_selecionado == 'Rodrigo' else 0)
+    fig_erros = px.pie(
+        names=['Backhand', 'Forehand', 'Outros'],
+        values=[
+            stats['erros_backhand'],
+            stats['erros_forehand'],
+            stats['total_erros'] - stats['erros_backhand'] - stats['erros_forehand']
+        ],
+        title=f'Erros de {jogador_selecionado}',
+        hole=0.4,
+        color_discrete_sequence=['#FFA15A', '#19D3F3', '#FF6692']
+    )
+    fig_winners = px.pie(
+        names=['Backhand', 'Forehand', 'Outros'],
+        values=[
+            stats['winners_backhand'],
+            stats['winners_forehand'],
+            stats['total_winners'] - stats['winners_backhand'] - stats['winners_forehand']
+        ],
+        title=f'Winners de {jogador_selecionado}',
+        hole=0.4,
+        color_discrete_sequence=['#00CC96', '#636EFA', '#AB63FA']
+    )
+    return fig_erros, fig_winners
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def figura_pressao(partida_id, set_num, chave_dados):
+    _, heatmap_data = processar_dados(partida_id, set_num, chave_dados)
+    fig_heatmap = px.imshow(
+        heatmap_data,
+        labels=dict(x="Ganhador do Ponto", y="Situação", color="%"),
+        x=['Adversário', 'Rodrigo'],
+        y=heatmap_data.index,
+        text_auto=".1f",
+        aspect="auto",
+        color_continuous_scale='RdYlGn'
+    )
+    fig_heatmap.update_xaxes(side="top")
+    return fig_heatmap
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def figura_probabilidade(partida_id, set_num, chave_dados):
+    df, _ = processar_dados(partida_id, set_num, chave_dados)
+    # Eixo x = número do ponto na seleção (não o índice global do DataFrame)
+    fig_probabilidade = linhas_gl(
+        [('Rodrigo', np.arange(1, len(df) + 1), df['prob_vitoria'].to_numpy(), '#636EFA')],
+        'Probabilidade de Vitória de Rodrigo ' + ('na Partida' if set_num is None else 'no Set'),
+        'Ponto', 'Probabilidade'
+    )
+    fig_probabilidade.update_yaxes(range=[0, 1], tickformat='.0%')
+    return fig_probabilidade
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def figura_sequencia(partida_id, set_num, chave_dados):
+    _, _, _, sequencias = carregar_dados(partida_id, set_num, chave_dados)
+    # Linha do tempo expandida da tabela de sequências (sem reler os rallys)
+    with etapa("dashboard.sequencia", len(sequencias)):
+        linha_tempo = linha_do_tempo(sequencias)
+    series = []
+    for ganhador, nome, cor in ((0, 'Adversário', '#EF553B'), (1, 'Rodrigo', '#00CC96')):
+        pontos = linha_tempo[linha_tempo['ganhador'] == ganhador]
+        series.append((nome, pontos['posicao'].to_numpy(), pontos['acumulado'].to_numpy(), cor))
+    return linhas_gl(series, 'Sequência de Pontos durante a Partida', 'Ponto', 'Pontos Consecutivos')
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def figura_forma(janela, chave_dados):
+    forma = forma_recente(carregar_dados_historico(chave_dados), janela)
+    datas = pd.to_datetime(forma['data'], errors='coerce').to_numpy()
+    return linhas_gl(
+        [('% Pontos', datas, forma['pct_pontos'].to_numpy(), '#636EFA'),
+         ('% Pontos no Saque', datas, forma['pct_pontos_saque'].to_numpy(), '#00CC96'),
+         ('% Pontos na Devolução', datas, forma['pct_pontos_devolucao'].to_numpy(), '#EF553B')],
+        f'Taxas nas últimas {janela} partida(s)', 'Data', '%'
+    )
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def figura_faixas(nome_fator, chave_dados):
+    faixas = desempenho_por_faixa(carregar_dados_historico(chave_dados), FATORES[nome_fator])
+    return px.bar(
+        faixas,
+        x='faixa',
+        y='pct_pontos',
+        text='partidas',
+        labels={'faixa': nome_fator, 'pct_pontos': '% Pontos Ganhos', 'partidas': 'Partidas'},
+        title='% de pontos ganhos por faixa (rótulo = nº de partidas)'
+    )
+
+# Importações por upload: um único importador (processo em segundo plano) para todo o servidor
+@st.cache_resource
+def importador():
+    return Importador()
+
+def mostrar_importacoes():
+    """Progresso das importações enviadas; True enquanto alguma desta sessão estiver na fila ou rodando"""
+    for tarefa in importador().recentes(3):
+        if tarefa['estado'] == CONCLUIDA:
+            totais = tarefa['totais']
+            st.sidebar.success(f"✅ {tarefa['arquivo']}: {totais['partidas']} partida(s) e {totais['rallys']} "
+                               f"rally(s) novos (geração {tarefa['geracao']})")
+        elif tarefa['estado'] == ERRO:
+            st.sidebar.error(f"❌ {tarefa['arquivo']}: {tarefa['erro']}")
+        else:
+            etapa = tarefa['etapa']
+            feitas = ETAPAS_IMPORTACAO.index(etapa) if etapa in ETAPAS_IMPORTACAO else 0
+            texto = f"{tarefa['arquivo']}: {tarefa['estado']}"
+            if etapa:
+                texto += f" - {etapa} ({tarefa['linhas']} linha(s))"
+            st.sidebar.progress(feitas / len(ETAPAS_IMPORTACAO), text=texto)
+    # Só as importações enviadas por esta sessão a mantêm se recarregando
+    pendentes = []
+    for tarefa_id in st.session_state.get('importacoes', []):
+        tarefa = importador().situacao(tarefa_id)
+        if tarefa and tarefa['estado'] not in FINAIS:
+            pendentes.append(tarefa_id)
+    st.session_state['importacoes'] = pendentes
+    return bool(pendentes)
+
+def acompanhar_importacoes(em_andamento):
+    # Só a sessão que enviou a planilha se recarrega; a troca para a nova geração é a
+    # própria chave_dados mudando quando a importação grava
+    if em_andamento:
+        time.sleep(INTERVALO_IMPORTACAO)
+        st.rerun()
+
+# --- Sidebar (Importação) ---
+# A planilha vai para o importador em segundo plano; o dashboard continua respondendo
+st.sidebar.header("Importar Partida")
+planilha = st.sidebar.file_uploader("Planilha de digitação (.xlsx)", type=["xlsx"])
+if planilha is not None and st.sidebar.button("Importar planilha", disabled=importador().em_andamento()):
+    st.session_state.setdefault('importacoes', []).append(importador().enviar(planilha.getvalue(), planilha.name))
+importando = mostrar_importacoes()
 
 # --- Sidebar (Filtros) ---
+# As opções vêm de consultas pequenas e indexadas; os rallys só são lidos depois
 st.sidebar.header("Filtros")
+conn = conectar()
+chave_dados = impressao_digital(conn)
 
 # Filtro por adversário
-adversarios = df_full['adversario'].unique()
+adversarios = consultas.listar_adversarios(conn)
+if not adversarios:
+    conn.close()
+    st.warning("Nenhuma partida cadastrada. Envie a planilha pela barra lateral ou rode python -m tenis import.")
+    acompanhar_importacoes(importando)
+    st.stop()
 adversario_selecionado = st.sidebar.selectbox(
     "Selecione o Adversário",
-    options=sorted(adversarios)
+    options=adversarios
 )
 
 # Filtro por data
-datas = df_full[df_full['adversario'] == adversario_selecionado]['data'].unique()
+datas = consultas.listar_datas(conn, adversario_selecionado)
 data_selecionada = st.sidebar.selectbox(
     "Selecione a Data",
-    options=sorted(datas, reverse=True)
+    options=datas
 )
+partida_id = consultas.buscar_partida_id(conn, adversario_selecionado, data_selecionada)
 
 # Filtro por set
-sets_disponiveis = df_full[(df_full['adversario'] == adversario_selecionado) & 
-                          (df_full['data'] == data_selecionada)]['set_num'].unique()
+sets_disponiveis = consultas.listar_sets(conn, partida_id)
+conn.close()
 set_selecionado = st.sidebar.selectbox(
     "Selecione o Set",
-    options=['Todos'] + sorted(sets_disponiveis.tolist())
+    options=['Todos'] + sets_disponiveis
 )
 
 # Filtro por jogador
@@ -180,12 +251,32 @@ jogador_selecionado = st.sidebar.radio(
     index=0
 )
 
-# Aplica filtros
-filtro = (df_full['adversario'] == adversario_selecionado) & (df_full['data'] == data_selecionada)
-if set_selecionado != 'Todos':
-    filtro &= (df_full['set_num'] == set_selecionado)
+# Importação contínua: a página se recarrega sozinha; como os caches usam a geração
+# como chave, nada é relido enquanto ela não mudar
+atualizar_sozinho = st.sidebar.toggle("Atualização automática", value=False)
+st.sidebar.caption(f"Geração dos dados: {chave_dados[0]}")
+
+# Diagnóstico: mede as etapas de leitura e processamento (o tracemalloc deixa tudo mais lento).
+# Com TENIS_METRICAS definida a medição fica sempre ligada e vai também para o arquivo.
+# A chave e as etapas medidas são desta sessão: outras abas do dashboard não são afetadas.
+diagnostico = st.sidebar.toggle("Diagnóstico de desempenho", value=medicao.ARQUIVO_METRICAS is not None)
+medidas_sessao = st.session_state.setdefault('medicao', deque(maxlen=medicao.MAX_REGISTROS))
+if diagnostico:
+    medicao.ativar_sessao(medidas_sessao)
+else:
+    medicao.desativar_sessao(medidas_sessao)
+marca_medicao = medicao.marca(medidas_sessao)
 
-df_filtrado = df_full[filtro]
+# Carrega e processa só os rallys selecionados
+set_num = None if set_selecionado == 'Todos' else set_selecionado
+partidas, rallys, estatisticas, sequencias = carregar_dados(partida_id, set_num, chave_dados)
+if rallys.empty:
+    st.warning("Esta partida ainda não tem rallys digitados.")
+    acompanhar_importacoes(importando)
+    st.stop()
+# Soma as linhas de cada set (contagens) e deriva os percentuais
+stats_rodrigo = montar_stats(estatisticas, 1)
+stats_adversario = montar_stats(estatisticas, 0)
 
 # Seleciona estatísticas do jogador escolhido
 stats = stats_rodrigo if jogador_selecionado == 'Rodrigo' else stats_adversario
@@ -214,55 +305,27 @@ st.divider()
 # Gráficos de Erros e Winners
 st.subheader("Distribuição de Erros e Winners")
 
+fig_erros, fig_winners = figuras_distribuicao(partida_id, set_num, jogador_selecionado, chave_dados)
 col1, col2 = st.columns(2)
-
-with col1:
-    fig_erros = px.pie(
-        names=['Backhand', 'Forehand', 'Outros'],
-        values=[
-            stats['erros_backhand'],
-            stats['erros_forehand'],
-            stats['total_erros'] - stats['erros_backhand'] - stats['erros_forehand']
-        ],
-        title=f'Erros de {jogador_selecionado}',
-        hole=0.4,
-        color_discrete_sequence=['#FFA15A', '#19D3F3', '#FF6692']
-    )
-    st.plotly_chart(fig_erros, use_container_width=True)
-
-with col2:
-    fig_winners = px.pie(
-        names=['Backhand', 'Forehand', 'Outros'],
-        values=[
-            stats['winners_backhand'],
-            stats['winners_forehand'],
-            stats['total_winners'] - stats['winners_backhand'] - stats['winners_forehand']
-        ],
-        title=f'Winners de {jogador_selecionado}',
-        hole=0.4,
-        color_discrete_sequence=['#00CC96', '#636EFA', '#AB63FA']
-    )
-    st.plotly_chart(fig_winners, use_container_width=True)
+col1.plotly_chart(fig_erros, use_container_width=True)
+col2.plotly_chart(fig_winners, use_container_width=True)
 
 # --- Página de Análise Detalhada ---
 st.header("📊 Análise Detalhada")
 
-tab1, tab2 = st.tabs(["Pressão nos Pontos", "Sequência de Pontos"])
+# Uma seção por vez (st.tabs executaria e enviaria todas a cada clique): só a
+# seção aberta carrega seus dados e monta suas figuras
+secao = st.radio(
+    "Seção",
+    options=["Pressão nos Pontos", "Sequência de Pontos", "Por Set / Game", "Histórico"],
+    horizontal=True,
+    label_visibility="collapsed"
+)
+jogador_num = 1 if jogador_selecionado == 'Rodrigo' else 0
 
-with tab1:
+if secao == "Pressão nos Pontos":
     st.subheader("Desempenho em Situações de Pressão")
-    
-    fig_heatmap = px.imshow(
-        heatmap_data,
-        labels=dict(x="Ganhador do Ponto", y="Situação", color="%"),
-        x=['Adversário', 'Rodrigo'],
-        y=heatmap_data.index,
-        text_auto=".1f",
-        aspect="auto",
-        color_continuous_scale='RdYlGn'
-    )
-    fig_heatmap.update_xaxes(side="top")
-    st.plotly_chart(fig_heatmap, use_container_width=True)
+    st.plotly_chart(figura_pressao(partida_id, set_num, chave_dados), use_container_width=True)
     
     st.markdown("""
     **Legenda:**
@@ -271,40 +334,102 @@ with tab1:
     - **Empate**: Quando o placar estava igualado
     - **Vantagem**: Situação de vantagem no game
     """)
+    
+    # Pontos decisivos: break/game points e importância (modelo de Markov da partida)
+    st.subheader("Pontos Decisivos")
+    df_filtrado, _ = processar_dados(partida_id, set_num, chave_dados)
+    decisivos = resumir_importancia(df_filtrado, jogador_num)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Break Points Convertidos", f"{decisivos['break_points_convertidos']}/{decisivos['break_points']}")
+    col2.metric("Break Points Salvos", f"{decisivos['break_points_salvos']}/{decisivos['break_points_contra']}")
+    col3.metric("Game Points Convertidos", f"{decisivos['game_points_convertidos']}/{decisivos['game_points']}")
+    col4.metric("Pontos Mais Importantes Ganhos", f"{decisivos['pontos_importantes_ganhos']}/{decisivos['pontos_importantes']}")
+    
+    st.plotly_chart(figura_probabilidade(partida_id, set_num, chave_dados), use_container_width=True)
 
-with tab2:
+elif secao == "Sequência de Pontos":
     st.subheader("Sequência de Pontos")
     
-    # Calcula sequência máxima para o jogador selecionado
-    jogador_num = 1 if jogador_selecionado == 'Rodrigo' else 0
-    sequencia_filtrada = sequencia_pontos[
-        (sequencia_pontos['partida_id'].isin(df_filtrado['partida_id'])) &
-        (sequencia_pontos['set_num'] == (set_selecionado if set_selecionado != 'Todos' else sequencia_pontos['set_num'])) &
-        (sequencia_pontos['ganhador_ponto'] == jogador_num)
-    ]
-    
-    max_sequencia = sequencia_filtrada['count'].max() if not sequencia_filtrada.empty else 0
+    # Consultas sobre a tabela de sequências (por set; não atravessam sets nem partidas)
+    resumo_sequencias = resumir_sequencias(sequencias, jogador_num)
     
-    st.metric(f"Maior sequência de pontos ({jogador_selecionado})", max_sequencia)
+    col1, col2, col3 = st.columns(3)
+    col1.metric(f"Maior sequência de pontos ({jogador_selecionado})", resumo_sequencias['maior_sequencia'])
+    col2.metric(f"Sequências de {MINIMO_MOMENTO}+ pontos", resumo_sequencias['sequencias_longas'])
+    col3.metric("Viradas de momento", resumo_sequencias['viradas'])
     
     # Gráfico de sequência de pontos
-    df_sequencia = df_filtrado.copy()
-    df_sequencia['acumulado'] = df_sequencia.groupby(
-        (df_sequencia['ganhador_ponto'].diff() != 0).cumsum()
-    )['ganhador_ponto'].cumcount() + 1
+    st.plotly_chart(figura_sequencia(partida_id, set_num, chave_dados), use_container_width=True)
+
+elif secao == "Por Set / Game":
+    # Mesmo motor das estatísticas, agrupado sobre os rallys já filtrados
+    por = ['set_num'] if set_num is None else ['set_num', 'game_num']
+    st.subheader("Desempenho por Set" if set_selecionado == 'Todos' else f"Desempenho por Game (Set {set_selecionado})")
+    resumo = calcular_resumo(partida_id, set_num, chave_dados)
+    resumo = resumo[resumo['jogador'] == jogador_num].drop(columns='jogador')
+    st.dataframe(
+        resumo[por + ['total_pontos', 'pontos_saque', 'pontos_recebimento', 'total_winners',
+                      'total_erros', 'aces', 'pct_primeiro_servico', 'pct_pontos_1serv', 'pct_pontos_2serv']],
+        hide_index=True,
+        use_container_width=True
+    )
+
+else:
+    # Análises entre partidas sobre a tabela Historico (sem reler rallys)
+    historico = carregar_dados_historico(chave_dados)
     
-    fig_sequencia = px.line(
-        df_sequencia,
-        x=df_sequencia.index,
-        y='acumulado',
-        color='ganhador_ponto',
-        color_discrete_map={0: '#EF553B', 1: '#00CC96'},
-        labels={'acumulado': 'Pontos Consecutivos', 'ganhador_ponto': 'Jogador'},
-        title='Sequência de Pontos durante a Partida'
+    st.subheader(f"Confronto Direto - Rodrigo vs {adversario_selecionado}")
+    confrontos = confronto_direto(historico)
+    confronto = confrontos[confrontos['adversario'] == adversario_selecionado]
+    if not confronto.empty:
+        confronto = confronto.iloc[0]
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Partidas", int(confronto['partidas']))
+        col2.metric("Vitórias / Derrotas", f"{int(confronto['vitorias'])}/{int(confronto['derrotas'])}")
+        col3.metric("% Pontos Ganhos", f"{confronto['pct_pontos']:.1f}%")
+        col4.metric("% Pontos no Saque", f"{confronto['pct_pontos_saque']:.1f}%")
+    st.dataframe(
+        confrontos[['adversario', 'partidas', 'vitorias', 'derrotas', 'pct_vitorias', 'pct_pontos',
+                    'pct_pontos_saque', 'pct_pontos_devolucao', 'ultima_partida']],
+        hide_index=True,
+        use_container_width=True
     )
-    fig_sequencia.update_layout(showlegend=True)
-    st.plotly_chart(fig_sequencia, use_container_width=True)
+    
+    st.subheader("Forma Recente")
+    janela = st.slider("Últimas partidas", min_value=1, max_value=20, value=JANELA_FORMA)
+    st.plotly_chart(figura_forma(janela, chave_dados), use_container_width=True)
+    
+    st.subheader("Desempenho por Ranking e Bem-estar")
+    fator = st.selectbox("Fator", options=list(FATORES))
+    st.plotly_chart(figura_faixas(fator, chave_dados), use_container_width=True)
+
+# Painel de diagnóstico: etapas medidas nesta execução (vazio = tudo veio do cache)
+if diagnostico:
+    with st.expander("🩺 Diagnóstico de desempenho"):
+        medidas = medicao.registros(marca_medicao, medidas_sessao)
+        if medidas:
+            st.dataframe(pd.DataFrame(medidas)[['etapa', 'linhas', 'segundos', 'pico_mb']],
+                         hide_index=True, use_container_width=True)
+        else:
+            st.caption("Nada foi recalculado nesta execução: dados e processamento vieram do cache.")
+        # Etapas da última importação gravadas no arquivo (cada uma termina em 'importar.total')
+        importacoes, atual = [], []
+        for registro in medicao.ler_metricas():
+            if registro['etapa'].startswith('importar.'):
+                atual.append(registro)
+                if registro['etapa'] == 'importar.total':
+                    importacoes.append(atual)
+                    atual = []
+        if importacoes:
+            st.caption(f"Última importação ({importacoes[-1][-1]['quando']})")
+            st.dataframe(pd.DataFrame(importacoes[-1])[['etapa', 'linhas', 'segundos', 'pico_mb']],
+                         hide_index=True, use_container_width=True)
 
 # Rodapé
 st.divider()
-st.caption(f"Dashboard criado por Rodrigo R | Dados atualizados em {datetime.now().strftime('%d/%m/%Y %H:%M')}")
\ No newline at end of file
+st.caption(f"Dashboard criado por Rodrigo R | Dados atualizados em {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+
+acompanhar_importacoes(importando)
+if atualizar_sozinho:
+    time.sleep(INTERVALO_ATUALIZACAO)
+    st.rerun()
\ No newline at end of file
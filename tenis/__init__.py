@@ -0,0 +1,56 @@
+"""Análise das partidas de tênis do Rodrigo: importação, regras, placar e estatísticas.
+
+Importar o pacote não carrega nada pesado: os submódulos (e com eles pandas,
+openpyxl, pyarrow) só são importados no primeiro acesso a um nome da API,
+ex.: tenis.calcular_placar. Linha de comando: python -m tenis --help
+"""
+import importlib
+
+# Nome público -> submódulo que o define
+_API = {
+    'DB_PATH': 'criar_banco',
+    'EXCEL_PATH': 'criar_banco',
+    'conectar': 'criar_banco',
+    'impressao_digital': 'criar_banco',
+    'enviar_dados': 'importar_dados',
+    'enviar_dados_streaming': 'importar_dados',
+    'enviar_lote': 'importar_dados',
+    'aplicar_regras_logicas': 'importar_dados',
+    'MOTOR': 'regras',
+    'MotorRegras': 'regras',
+    'REGRAS': 'regras',
+    'Regra': 'regras',
+    'calcular_placar': 'placar',
+    'tabelas': 'placar',
+    'calcular_estatisticas': 'estatisticas',
+    'derivar_percentuais': 'estatisticas',
+    'montar_stats': 'estatisticas',
+    'calcular_sequencias': 'sequencias',
+    'resumir_sequencias': 'sequencias',
+    'marcar_importancia': 'importancia',
+    'modelo': 'importancia',
+    'resumir_importancia': 'importancia',
+    'taxas_saque': 'importancia',
+    'carregar_historico': 'historico',
+    'confronto_direto': 'historico',
+    'desempenho_por_faixa': 'historico',
+    'forma_recente': 'historico',
+    'DadosPartida': 'analise',
+    'carregar_dados_partida': 'analise',
+    'processar_partida': 'analise',
+    'resumir_partida': 'analise',
+    'resumo_por_set': 'analise',
+    'exportar_rallys': 'exportar',
+}
+
+__all__ = sorted(_API)
+
+def __getattr__(nome):
+    if nome not in _API:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f".{_API[nome]}", __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+def __dir__():
+    return sorted(set(globals()) | set(_API))
@@ -0,0 +1,138 @@
+import argparse
+import json
+import math
+import os
+import sys
+
+# Linha de comando do pacote, sem Streamlit:
+#   python -m tenis import [--streaming | --lote PASTA|ARQUIVOS [--processos N]]
+#   python -m tenis stats PARTIDA_ID | --adversario NOME [--data DATA] [--set N] [--jogador adversario] [--json]
+#   python -m tenis export TABELA ARQUIVO.csv|.jsonl|.parquet [--de DATA] [--ate DATA] [--adversario NOME] [--partida ID ...]
+# --db e --excel (antes do comando) valem como TENIS_DB e TENIS_EXCEL. Os módulos
+# do pacote só são importados dentro de cada comando: --help responde na hora.
+
+TABELAS_EXPORTAVEIS = ['partidas', 'rallys', 'estatisticas', 'sequencias', 'historico']
+
+def _importar(args):
+    from .importar_dados import enviar_dados, enviar_dados_streaming, enviar_lote
+    if args.lote:
+        enviar_lote(args.lote, processos=args.processos)
+    elif args.streaming:
+        enviar_dados_streaming(limpar_planilha=True)
+    else:
+        enviar_dados()
+
+def _sem_nan(valor):
+    # JSON não tem NaN: percentual sem base vira null
+    if isinstance(valor, dict):
+        return {chave: _sem_nan(v) for chave, v in valor.items()}
+    return None if isinstance(valor, float) and math.isnan(valor) else valor
+
+def _estatisticas(args):
+    from . import analise, consultas
+    from .criar_banco import conectar
+    conn = conectar()
+    try:
+        partida_id = args.partida_id
+        if partida_id is None:
+            if not args.adversario:
+                raise SystemExit("❌ Informe PARTIDA_ID ou --adversario")
+            datas = consultas.listar_datas(conn, args.adversario)
+            data = args.data or (datas[0] if datas else None)
+            partida_id = consultas.buscar_partida_id(conn, args.adversario, data)
+            if partida_id is None:
+                raise SystemExit(f"❌ Partida não encontrada: {args.adversario} em {data}")
+        dados = analise.carregar_dados_partida(conn, partida_id, args.set)
+    finally:
+        conn.close()
+    if dados.partidas.empty:
+        raise SystemExit(f"❌ Partida {partida_id} não encontrada")
+    if dados.rallys.empty:
+        raise SystemExit(f"❌ Partida {partida_id} ainda não tem rallys digitados")
+
+    partida = dados.partidas.iloc[0]
+    resumo = _sem_nan(analise.resumir_partida(dados, args.set, 0 if args.jogador == 'adversario' else 1))
+    resumo = {'partida_id': int(partida_id), 'data': partida['data'], 'adversario': partida['adversario'],
+              'set': args.set, 'jogador': args.jogador, **resumo}
+    if args.json:
+        print(json.dumps(resumo, ensure_ascii=False, indent=2))
+        return
+    print(f"🎾 Partida {resumo['partida_id']}: Rodrigo vs {resumo['adversario']} em {resumo['data']}"
+          f" | Set: {args.set or 'Todos'} | Jogador: {args.jogador}")
+    for secao in ('estatisticas', 'decisivos', 'sequencias'):
+        print(f"\n[{secao}]")
+        for nome, valor in resumo[secao].items():
+            print(f"  {nome:<28} {'-' if valor is None else round(valor, 1) if isinstance(valor, float) else valor}")
+
+def _exportar(args):
+    extensao = os.path.splitext(args.arquivo)[1].lower()
+    if extensao not in ('.csv', '.jsonl', '.json', '.parquet'):
+        raise SystemExit(f"❌ Formato não suportado: {extensao} (use .csv, .jsonl ou .parquet)")
+    import pandas as pd
+    from .criar_banco import conectar
+    from .exportar import abrir_escritor, exportar_rallys, filtrar_partidas
+    filtros = dict(inicio=args.de, fim=args.ate, adversario=args.adversario, partidas=args.partida)
+    conn = conectar()
+    try:
+        if args.tabela == 'rallys':
+            # Em fluxo (fetchmany), com os dados da partida e o placar de cada ponto
+            total = exportar_rallys(conn, args.arquivo, tamanho_bloco=args.bloco, **filtros)
+        else:
+            # Tabelas com uma linha por partida/set: cabem na memória
+            condicao, parametros = filtrar_partidas(**filtros)
+            df = pd.read_sql(f"SELECT * FROM {args.tabela} WHERE partida_id IN "
+                             f"(SELECT partida_id FROM partidas WHERE {condicao})", conn, params=parametros)
+            escritor = abrir_escritor(args.arquivo)
+            try:
+                escritor.escrever(df)
+            finally:
+                escritor.fechar()
+            total = len(df)
+    finally:
+        conn.close()
+    print(f"✅ {total} linha(s) de {args.tabela} exportada(s) para {args.arquivo}")
+
+def montar_parser():
+    parser = argparse.ArgumentParser(prog="python -m tenis", description="Análise das partidas de tênis do Rodrigo")
+    parser.add_argument("--db", help="banco SQLite (padrão: TENIS_DB ou tenis_analises_db.db)")
+    parser.add_argument("--excel", help="planilha de digitação (padrão: TENIS_EXCEL ou dados_tenis.xlsx)")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    importar = comandos.add_parser("import", help="importa a planilha de digitação (ou um lote de planilhas)")
+    importar.add_argument("--streaming", action="store_true", help="lê a planilha em blocos (planilhas grandes)")
+    importar.add_argument("--lote", nargs="+", metavar="PASTA|ARQUIVO", help="importa várias planilhas")
+    importar.add_argument("--processos", type=int, help="processos de leitura no modo --lote")
+    importar.set_defaults(funcao=_importar)
+
+    stats = comandos.add_parser("stats", help="estatísticas de uma partida")
+    stats.add_argument("partida_id", nargs="?", type=int)
+    stats.add_argument("--adversario", help="escolhe a partida pelo adversário (a mais recente sem --data)")
+    stats.add_argument("--data", help="data da partida (com --adversario)")
+    stats.add_argument("--set", type=int, help="só um set")
+    stats.add_argument("--jogador", choices=["rodrigo", "adversario"], default="rodrigo")
+    stats.add_argument("--json", action="store_true", help="saída em JSON")
+    stats.set_defaults(funcao=_estatisticas)
+
+    exportar = comandos.add_parser("export", help="exporta uma tabela para CSV, JSON lines ou Parquet",
+                                   description="rallys sai em fluxo, com os dados da partida e o placar de cada ponto")
+    exportar.add_argument("tabela", choices=TABELAS_EXPORTAVEIS)
+    exportar.add_argument("arquivo", help="destino; o formato vem da extensão")
+    exportar.add_argument("--de", metavar="DATA", help="partidas a partir desta data (AAAA-MM-DD)")
+    exportar.add_argument("--ate", metavar="DATA", help="partidas até esta data (inclusive)")
+    exportar.add_argument("--adversario", help="só as partidas contra um adversário")
+    exportar.add_argument("--partida", type=int, nargs="+", metavar="ID", help="só estas partidas")
+    exportar.add_argument("--bloco", type=int, default=10000, help="rallys lidos e gravados por vez")
+    exportar.set_defaults(funcao=_exportar)
+    return parser
+
+def main(argv=None):
+    args = montar_parser().parse_args(argv)
+    # Antes de qualquer import do pacote: criar_banco lê os caminhos do ambiente
+    if args.db:
+        os.environ["TENIS_DB"] = args.db
+    if args.excel:
+        os.environ["TENIS_EXCEL"] = args.excel
+    args.funcao(args)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
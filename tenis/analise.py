@@ -0,0 +1,102 @@
+from collections import namedtuple
+import pandas as pd
+from . import consultas, snapshot
+from .estatisticas import calcular_estatisticas, carregar_estatisticas, derivar_percentuais, montar_stats
+from .importancia import marcar_importancia, modelo, resumir_importancia, taxas_saque
+from .medicao import etapa
+from .placar import calcular_placar
+from .sequencias import calcular_sequencias, carregar_sequencias, resumir_sequencias
+
+# Análise de uma partida sem Streamlit: a mesma usada pelo dashboard, pela linha de
+# comando (python -m tenis stats) e por scripts. As funções recebem a conexão aberta
+# e não guardam nada; o cache fica com quem chama (ex.: st.cache_data no dashboard).
+
+DadosPartida = namedtuple('DadosPartida', ['partidas', 'rallys', 'estatisticas', 'sequencias'])
+
+def carregar_dados_partida(conn, partida_id, set_num=None, geracao=None):
+    """Partida, rallys, estatísticas e sequências de uma partida (ou de um set)
+
+    Com 'geracao', os rallys vêm do snapshot Parquet dessa geração (partições
+    temporada/adversário, memory-map) quando ele existe; senão do SQLite, com o
+    filtro no SQL.
+    """
+    with etapa("analise.partida"):
+        partidas = consultas.carregar_partida(conn, partida_id)
+
+    caminho = snapshot.snapshot_atual(geracao) if geracao is not None else None
+    rallys = None
+    if caminho and not partidas.empty:
+        try:
+            partida = partidas.iloc[0]
+            with etapa("analise.rallys (snapshot)") as medida:
+                rallys = snapshot.carregar_rallys(caminho, int(str(partida['data'])[:4]), partida['adversario'],
+                                                  partida_id, set_num)
+                medida.linhas = len(rallys)
+        except Exception:
+            rallys = None
+    if rallys is None:
+        with etapa("analise.rallys (sqlite)") as medida:
+            rallys = consultas.carregar_rallys(conn, partida_id, set_num)
+            medida.linhas = len(rallys)
+
+    # Estatísticas já materializadas na importação (contagens por set e jogador)
+    with etapa("analise.estatisticas") as medida:
+        estatisticas = carregar_estatisticas(conn, partida_id, set_num)
+        if estatisticas.empty and not rallys.empty:
+            # Partida ainda fora da tabela (rode: python -m tenis.estatisticas)
+            estatisticas = calcular_estatisticas(rallys)
+        medida.linhas = len(estatisticas)
+
+    # Sequências de pontos (run-length por set), também materializadas na importação
+    with etapa("analise.sequencias") as medida:
+        sequencias = carregar_sequencias(conn, partida_id, set_num)
+        if sequencias.empty and not rallys.empty:
+            sequencias = calcular_sequencias(rallys)
+        medida.linhas = len(sequencias)
+
+    return DadosPartida(partidas, rallys, estatisticas, sequencias)
+
+def processar_partida(dados, set_num=None):
+    """Rallys com placar, pressão e importância de cada ponto, e o heatmap de pressão (%)"""
+    # 'ganhador_ponto' vem do banco (0 = adversário, 1 = Rodrigo)
+    with etapa("analise.merge", len(dados.rallys)):
+        df = pd.merge(dados.rallys, dados.partidas.assign(jogador='Rodrigo R'), on='partida_id')
+
+    # Placar antes de cada ponto (game, set e tiebreak) pelo motor compartilhado
+    with etapa("analise.placar", len(df)):
+        placar = calcular_placar(df, 'ganhador_ponto')
+        df['novo_placar'] = placar['placar_antes']
+        for col in ['games_jogador', 'games_adversario', 'sets_jogador', 'sets_adversario', 'tiebreak', 'estado']:
+            df[col] = placar[col]
+
+    # Heatmap de pressão: situação e importância de cada ponto por consulta em
+    # tabelas pré-calculadas por [estado, servidor] (sem parse do texto do placar)
+    with etapa("analise.pressao", len(df)):
+        df['situacao_pressao'] = placar['pressao']
+        # Modelo de Markov com as taxas de saque desta partida (com um set só, importância do set)
+        marcas = marcar_importancia(df, modelo(*taxas_saque(df)), 'partida' if set_num is None else 'set')
+        for col in marcas.columns:
+            df[col] = marcas[col]
+        # Só pontos com ganhador 0/1 (valores fora disso na planilha não entram no heatmap)
+        heatmap_data = df.groupby(['situacao_pressao', 'ganhador_ponto'], observed=True).size().unstack()
+        heatmap_data = heatmap_data.reindex(columns=[0, 1]).fillna(0)
+        heatmap_data['Total'] = heatmap_data.sum(axis=1)
+        heatmap_data = heatmap_data[heatmap_data['Total'] > 0]
+        heatmap_data = heatmap_data.div(heatmap_data['Total'], axis=0) * 100
+        heatmap_data = heatmap_data.drop(columns='Total')
+
+    return df, heatmap_data
+
+def resumo_por_set(dados, set_num=None):
+    """Contagens e percentuais por set (ou por game, com um set escolhido) e jogador"""
+    por = ['set_num'] if set_num is None else ['set_num', 'game_num']
+    return derivar_percentuais(calcular_estatisticas(dados.rallys, por=por))
+
+def resumir_partida(dados, set_num=None, jogador=1):
+    """Estatísticas, pontos decisivos e sequências de um jogador, num dicionário simples"""
+    df, _ = processar_partida(dados, set_num)
+    return {
+        'estatisticas': montar_stats(dados.estatisticas, jogador),
+        'decisivos': resumir_importancia(df, jogador),
+        'sequencias': resumir_sequencias(dados.sequencias, jogador),
+    }
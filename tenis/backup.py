@@ -0,0 +1,67 @@
+import json
+import os
+from datetime import datetime
+import pandas as pd
+
+# Pasta dos segmentos de backup, configurável pela variável de ambiente TENIS_BACKUP
+BACKUP_DIR = os.environ.get("TENIS_BACKUP", "backups")
+MANIFESTO = "manifesto.jsonl"
+
+def novo_lote():
+    """Identificador de um lote de importação (carimbo de data/hora)"""
+    return datetime.now().strftime('%Y%m%dT%H%M%S%f')
+
+def gravar_segmento(df, tabela, lote, parte=0, origem=None, pasta=None):
+    """Grava as linhas importadas como um segmento imutável (CSV compactado) e registra no manifesto
+
+    Cada importação só acrescenta arquivos novos: nada do histórico é relido ou
+    reescrito, então o custo depende só do tamanho do lote.
+    """
+    if df.empty:
+        return None
+    pasta = pasta or BACKUP_DIR
+    os.makedirs(os.path.join(pasta, tabela), exist_ok=True)
+    nome = os.path.join(tabela, f"{lote}_{parte:04d}.csv.gz")
+    caminho = os.path.join(pasta, nome)
+
+    # Modo 'x': um segmento existente nunca é sobrescrito
+    with open(caminho, 'xb') as arquivo:
+        df.to_csv(arquivo, index=False, compression='gzip')
+
+    entrada = {
+        'segmento': nome,
+        'tabela': tabela,
+        'lote': lote,
+        'linhas': len(df),
+        'criado_em': datetime.now().isoformat(timespec='seconds'),
+        'origem': origem,
+    }
+    with open(os.path.join(pasta, MANIFESTO), 'a', encoding='utf-8') as manifesto:
+        manifesto.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+    return caminho
+
+def ler_manifesto(pasta=None):
+    """Lista as entradas do manifesto (uma por segmento, em ordem de gravação)"""
+    caminho = os.path.join(pasta or BACKUP_DIR, MANIFESTO)
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho, encoding='utf-8') as manifesto:
+        return [json.loads(linha) for linha in manifesto if linha.strip()]
+
+def ler_backup(tabela, pasta=None):
+    """Reúne todos os segmentos de uma tabela (para restauração ou auditoria)"""
+    pasta = pasta or BACKUP_DIR
+    partes = [pd.read_csv(os.path.join(pasta, e['segmento']), compression='gzip')
+              for e in ler_manifesto(pasta) if e['tabela'] == tabela]
+    return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+
+def limpar_abas(excel_path, abas):
+    """Esvazia as abas de digitação (mantendo o cabeçalho) numa única regravação da planilha"""
+    if not abas:
+        return
+    from openpyxl import load_workbook
+    wb = load_workbook(excel_path)
+    for aba in abas:
+        if aba in wb.sheetnames and wb[aba].max_row > 1:
+            wb[aba].delete_rows(2, wb[aba].max_row - 1)
+    wb.save(excel_path)
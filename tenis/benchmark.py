@@ -0,0 +1,134 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from . import consultas
+from .carga import inserir_novos
+from .criar_banco import conectar
+from .estatisticas import calcular_estatisticas, reconstruir_estatisticas
+from .gerar_dados import escrever_planilha, gerar_dados
+from .importar_dados import CHAVE_PARTIDAS, CHAVE_RALLYS, aplicar_regras_logicas, ler_planilha, numerar_pontos
+from .placar import calcular_placar
+from .tipos import tipar_rallys
+
+# Benchmark ponta a ponta sobre dados sintéticos (gerar_dados.py): tempo, vazão e
+# pico de memória (tracemalloc) de cada etapa, acrescentados a um arquivo JSON lines.
+ARQUIVO_RESULTADOS = "resultados_benchmark.jsonl"
+TAMANHOS_PADRAO = [10**3, 10**4, 10**5]
+# Acima disso a etapa de Excel (openpyxl + tracemalloc) domina o tempo total
+LIMITE_EXCEL = 10**4
+PARTIDAS_CONSULTADAS = 20
+
+def _versao():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class Medidor:
+    """Cronometra etapas e guarda uma linha de resultado por etapa"""
+
+    def __init__(self, tamanho):
+        self.tamanho = tamanho
+        self.n_rallys = tamanho
+        self.resultados = []
+
+    def medir(self, etapa, funcao, linhas=None):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        retorno = funcao()
+        segundos = time.perf_counter() - inicio
+        pico = tracemalloc.get_traced_memory()[1] - base
+        linhas = self.n_rallys if linhas is None else linhas
+        self.resultados.append({
+            'tamanho': self.tamanho,
+            'etapa': etapa,
+            'linhas': linhas,
+            'segundos': round(segundos, 6),
+            'linhas_por_segundo': round(linhas / segundos) if segundos else None,
+            'pico_mb': round(pico / 2**20, 2),
+        })
+        print(f"   {etapa:<20} {segundos:9.3f}s  {linhas / max(segundos, 1e-9):>12,.0f} linhas/s  "
+              f"pico {pico / 2**20:8.1f} MB")
+        return retorno
+
+    def corrigir_linhas(self, linhas):
+        """Troca o número de linhas da última etapa (conhecido só depois de medir)"""
+        ultimo = self.resultados[-1]
+        ultimo['linhas'] = linhas
+        ultimo['linhas_por_segundo'] = round(linhas / ultimo['segundos']) if ultimo['segundos'] else None
+
+def rodar(n_rallys, pasta, excel=True):
+    """Executa todas as etapas para um tamanho e devolve os resultados"""
+    print(f"\n⏱️ {n_rallys:,} rallys")
+    m = Medidor(n_rallys)
+    partidas, rallys = m.medir("gerar", lambda: gerar_dados(n_rallys))
+    # O gerador completa a última partida: a vazão usa o número real de rallys
+    m.n_rallys = len(rallys)
+    m.corrigir_linhas(len(rallys))
+
+    if excel and len(rallys) <= LIMITE_EXCEL:
+        caminho = os.path.join(pasta, f"sintetico_{n_rallys}.xlsx")
+        m.medir("excel_gravar", lambda: escrever_planilha(partidas, rallys, caminho))
+        m.medir("excel_ler_regras", lambda: ler_planilha(caminho))
+
+    regras = m.medir("regras", lambda: aplicar_regras_logicas(rallys))
+    m.medir("numerar_pontos", lambda: numerar_pontos(regras))
+
+    conn = conectar(os.path.join(pasta, f"bench_{n_rallys}.db"))
+    try:
+        m.medir("inserir_partidas", lambda: inserir_novos(conn, partidas, "partidas", CHAVE_PARTIDAS),
+                linhas=len(partidas))
+        filtro = "s.partida_id IN (SELECT partida_id FROM partidas)"
+        m.medir("inserir_rallys", lambda: inserir_novos(conn, regras, "rallys", CHAVE_RALLYS,
+                                                        filtro=filtro, synchronous="NORMAL"))
+        # Reimportação: tudo já existe, só o custo da deduplicação
+        m.medir("dedup_rallys", lambda: inserir_novos(conn, regras, "rallys", CHAVE_RALLYS,
+                                                      filtro=filtro, synchronous="NORMAL"))
+        m.medir("estatisticas_banco", lambda: reconstruir_estatisticas(conn))
+
+        ids = partidas.index[:PARTIDAS_CONSULTADAS] + 1
+        lidos = m.medir("consultar_partidas",
+                        lambda: sum(len(consultas.carregar_rallys(conn, int(i))) for i in ids))
+        m.corrigir_linhas(lidos)
+    finally:
+        conn.close()
+
+    m.medir("placar", lambda: calcular_placar(rallys, 'ponto_num'))
+    # Mesmo caminho do dashboard quando a tabela Estatisticas ainda não existe
+    m.medir("estatisticas_memoria", lambda: calcular_estatisticas(tipar_rallys(regras.copy())))
+    return m.resultados
+
+def executar(tamanhos, saida=ARQUIVO_RESULTADOS, excel=True):
+    """Roda o benchmark para cada tamanho e acrescenta os resultados ao arquivo"""
+    execucao = {'quando': datetime.now().isoformat(timespec='seconds'), 'versao': _versao(),
+                'python': sys.version.split()[0]}
+    tracemalloc.start()
+    try:
+        with tempfile.TemporaryDirectory() as pasta, open(saida, 'a', encoding='utf-8') as arquivo:
+            for n in tamanhos:
+                for resultado in rodar(n, pasta, excel):
+                    arquivo.write(json.dumps({**execucao, **resultado}, ensure_ascii=False) + "\n")
+                arquivo.flush()
+    finally:
+        tracemalloc.stop()
+    print(f"\n📄 Resultados acrescentados em {saida}")
+
+# python -m tenis.benchmark [TAMANHO ...] [--saida ARQUIVO] [--sem-excel]
+#   ex.: python -m tenis.benchmark 1e3 1e4 1e5 1e6 1e7 --sem-excel
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    saida = ARQUIVO_RESULTADOS
+    if "--saida" in argumentos:
+        i = argumentos.index("--saida")
+        saida = argumentos[i + 1]
+        argumentos = argumentos[:i] + argumentos[i + 2:]
+    excel = "--sem-excel" not in argumentos
+    tamanhos = [int(float(a)) for a in argumentos if not a.startswith("--")] or TAMANHOS_PADRAO
+    executar(tamanhos, saida, excel)
@@ -0,0 +1,143 @@
+import json
+import sqlite3
+from collections import namedtuple
+from datetime import datetime
+import pandas as pd
+
+TAMANHO_LOTE = 5000
+
+# Linhas rejeitadas vão para a tabela Quarentena (migração 3 do criar_banco)
+ResultadoCarga = namedtuple('ResultadoCarga', ['inseridos', 'ignorados', 'rejeitados'])
+
+def preparar_linhas(df, colunas):
+    """Converte o DataFrame em tuplas de tipos nativos numa única etapa vetorizada"""
+    dados = df[colunas].copy()
+    for col in colunas:
+        serie = dados[col]
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            dados[col] = serie.dt.strftime('%Y-%m-%d')
+        elif serie.dtype == object and pd.api.types.infer_dtype(serie, skipna=True) in ('datetime', 'date'):
+            dados[col] = pd.to_datetime(serie).dt.strftime('%Y-%m-%d')
+    # astype(object) transforma escalares numpy em int/float/bool do Python
+    dados = dados.astype(object).where(dados.notna(), None)
+    return list(dados.itertuples(index=False, name=None))
+
+def _ler_pragma(conn, nome):
+    return conn.execute(f"PRAGMA {nome}").fetchone()[0]
+
+def carregar_em_lote(conn, df, tabela, tamanho_lote=TAMANHO_LOTE, synchronous=None,
+                     journal_mode=None, conflito=None):
+    """Insere o DataFrame com executemany em lotes, cada lote em sua própria transação.
+
+    Um lote com erro é desfeito e reprocessado linha a linha: as linhas válidas
+    entram e as rejeitadas vão para a tabela Quarentena junto com a mensagem de erro.
+    'conflito' permite usar INSERT OR IGNORE / OR REPLACE. Retorna um ResultadoCarga.
+    """
+    colunas_existentes = [col[1] for col in conn.execute(f"PRAGMA table_info({tabela})")]
+    colunas = [col for col in df.columns if col in colunas_existentes]
+
+    if not colunas or df.empty:
+        if not colunas:
+            print(f"Nenhuma coluna do DataFrame existe na tabela {tabela}")
+        return ResultadoCarga(0, 0, 0)
+
+    linhas = preparar_linhas(df, colunas)
+    verbo = f"INSERT OR {conflito}" if conflito else "INSERT"
+    placeholders = ','.join(['?'] * len(colunas))
+    query = f"{verbo} INTO {tabela} ({','.join(colunas)}) VALUES ({placeholders})"
+
+    # Pragmas opcionais só durante a carga (journal_mode exige estar fora de transação)
+    conn.commit()
+    anteriores = {}
+    for nome, valor in (('journal_mode', journal_mode), ('synchronous', synchronous)):
+        if valor is not None:
+            anteriores[nome] = _ler_pragma(conn, nome)
+            conn.execute(f"PRAGMA {nome} = {valor}")
+
+    cursor = conn.cursor()
+    inicio_mudancas = conn.total_changes
+    rejeitadas = []
+    try:
+        for inicio in range(0, len(linhas), tamanho_lote):
+            lote = linhas[inicio:inicio + tamanho_lote]
+            try:
+                cursor.execute("BEGIN")
+                cursor.executemany(query, lote)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                cursor.execute("BEGIN")
+                for linha in lote:
+                    try:
+                        cursor.execute(query, linha)
+                    except sqlite3.Error as e:
+                        rejeitadas.append((linha, str(e)))
+                conn.commit()
+        inseridos = conn.total_changes - inicio_mudancas
+
+        if rejeitadas:
+            agora = datetime.now().isoformat(timespec='seconds')
+            conn.executemany(
+                "INSERT INTO Quarentena (tabela, dados, erro, registrado_em) VALUES (?, ?, ?, ?)",
+                [(tabela, json.dumps(dict(zip(colunas, linha)), default=str, ensure_ascii=False), erro, agora)
+                 for linha, erro in rejeitadas]
+            )
+            conn.commit()
+            print(f"⚠️ {len(rejeitadas)} linha(s) de {tabela} enviada(s) para a Quarentena")
+    finally:
+        conn.commit()
+        for nome, valor in anteriores.items():
+            conn.execute(f"PRAGMA {nome} = {valor}")
+
+    ignorados = len(linhas) - inseridos - len(rejeitadas)
+    return ResultadoCarga(inseridos, ignorados, len(rejeitadas))
+
+def inserir_novos(conn, df, tabela, chave, filtro=None, tamanho_lote=TAMANHO_LOTE, **pragmas):
+    """Insere só as linhas cuja chave natural ainda não existe, deduplicando no banco.
+
+    O lote vai para uma tabela temporária e o anti-join com a tabela de destino
+    usa o índice UNIQUE da chave, então o custo depende do tamanho do lote e não
+    do histórico. 'filtro' é uma condição SQL extra sobre o lote (alias 's').
+    Retorna (ResultadoCarga, DataFrame com as linhas efetivamente novas).
+    """
+    colunas_tabela = [col[1] for col in conn.execute(f"PRAGMA table_info({tabela})")]
+    colunas = [col for col in df.columns if col in colunas_tabela]
+    total = len(df)
+    df = df[colunas].drop_duplicates(subset=chave)
+    lista = ','.join(colunas)
+
+    staging = f"staging_{tabela.lower()}"
+    conn.execute(f"DROP TABLE IF EXISTS temp.{staging}")
+    conn.execute(f"CREATE TEMP TABLE {staging} AS SELECT {lista} FROM {tabela} WHERE 0")
+    carga = carregar_em_lote(conn, df, staging, tamanho_lote=tamanho_lote, **pragmas)
+
+    condicao = ' AND '.join(f"t.{col} IS s.{col}" for col in chave)
+    selecao = f"SELECT {','.join('s.' + col for col in colunas)} FROM {staging} s " \
+              f"WHERE NOT EXISTS (SELECT 1 FROM {tabela} t WHERE {condicao})"
+    if filtro:
+        selecao += f" AND {filtro}"
+
+    # Leitura e INSERT na mesma transação: as linhas lidas são exatamente as inseridas
+    # (total_changes contaria também o que os triggers da view Rallys gravam nos domínios)
+    recusados = 0
+    try:
+        conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        novos = pd.read_sql(selecao, conn)
+        try:
+            conn.execute(f"INSERT OR IGNORE INTO {tabela} ({lista}) {selecao}")
+            conn.commit()
+        except sqlite3.Error:
+            # O destino recusou alguma linha (ex.: flag fora de 0/1 na view Rallys):
+            # as novas entram em lotes / linha a linha e as recusadas vão para a Quarentena
+            conn.rollback()
+            recusados = carregar_em_lote(conn, novos, tabela, tamanho_lote=tamanho_lote, conflito="IGNORE").rejeitados
+            if recusados:
+                fora = pd.MultiIndex.from_frame(pd.read_sql(selecao, conn)[chave])
+                novos = novos[~pd.MultiIndex.from_frame(novos[chave]).isin(fora)].reset_index(drop=True)
+    finally:
+        conn.execute(f"DROP TABLE IF EXISTS temp.{staging}")
+
+    inseridos = len(novos)
+    rejeitados = carga.rejeitados + recusados
+    return ResultadoCarga(inseridos, total - inseridos - rejeitados, rejeitados), novos
@@ -0,0 +1,33 @@
+# Armazenamento compacto dos rallys. As oito flags 0/1 ficam num único inteiro
+# 'flags': o bit i guarda o valor da flag i e o bit 8+i marca que ela está vazia
+# (NULL). Os textos repetidos (tipo de ponto, golpe, direções) vão para tabelas de
+# domínio pequenas e cada rally guarda só o id. A tabela física é Rallys_Compactos;
+# 'Rallys' virou uma view com os nomes de coluna de sempre, e triggers INSTEAD OF
+# traduzem INSERT/UPDATE/DELETE nela, então consultas e importação não mudam.
+# O layout é criado pela migração 11; aqui ficam a medida de espaço e o VACUUM.
+
+# Tabelas que guardam os rallys desde a migração 11 (criar_banco._m011_rallys_compactos)
+TABELAS_RALLYS = ['Rallys_Compactos', 'Tipos_Ponto', 'Golpes_Vencedores', 'Direcoes_Golpe', 'Direcoes_Servico']
+
+def tamanho_rallys(conn):
+    """Bytes ocupados pelos rallys (tabela física, índices e domínios), pelo dbstat"""
+    tabelas = TABELAS_RALLYS
+    marcas = ','.join(['?'] * len(tabelas))
+    return conn.execute(
+        f"SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name IN ({marcas}) OR name IN "
+        f"(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name IN ({marcas}))",
+        tabelas + tabelas
+    ).fetchone()[0]
+
+# Depois da migração as páginas liberadas ficam no arquivo até um VACUUM:
+# python -m tenis.compactacao
+if __name__ == "__main__":
+    from .criar_banco import conectar
+    conn = conectar()
+    n = conn.execute("SELECT COUNT(*) FROM Rallys_Compactos").fetchone()[0]
+    antes = tamanho_rallys(conn)
+    conn.execute("VACUUM")
+    depois = tamanho_rallys(conn)
+    conn.close()
+    print(f"✅ {n} rally(s): {antes / 1024:.0f} KiB -> {depois / 1024:.0f} KiB"
+          + (f" ({depois / n:.1f} bytes por rally)" if n else ""))
@@ -0,0 +1,62 @@
+import pandas as pd
+from .tipos import tipar_rallys
+
+# Colunas de rallys usadas pelo dashboard
+COLUNAS_RALLYS = [
+    'partida_id', 'set_num', 'game_num', 'ordem_ponto', 'ponto_num',
+    'ace', 'servidor', 'primeiro_servico', 'falha_servico',
+    'devolucao_dentro', 'tipo_ponto', 'golpe_vencedor',
+    'direcao_golpe', 'num_trocas', 'direcao_servico', 'placar',
+]
+
+# ===== CONSULTAS DE APOIO AOS FILTROS (pequenas e cobertas por índice) =====
+
+def listar_adversarios(conn):
+    """Adversários com partida cadastrada, em ordem alfabética"""
+    return [linha[0] for linha in conn.execute(
+        "SELECT DISTINCT adversario FROM partidas WHERE adversario IS NOT NULL ORDER BY adversario"
+    )]
+
+def listar_datas(conn, adversario):
+    """Datas das partidas contra um adversário, da mais recente para a mais antiga"""
+    return [linha[0] for linha in conn.execute(
+        "SELECT data FROM partidas WHERE adversario = ? ORDER BY data DESC", (adversario,)
+    )]
+
+def buscar_partida_id(conn, adversario, data):
+    """partida_id de uma partida (adversario, data), ou None"""
+    linha = conn.execute(
+        "SELECT partida_id FROM partidas WHERE adversario = ? AND data = ?", (adversario, data)
+    ).fetchone()
+    return linha[0] if linha else None
+
+def listar_sets(conn, partida_id):
+    """Sets com rallys digitados numa partida"""
+    return [linha[0] for linha in conn.execute(
+        "SELECT DISTINCT set_num FROM rallys WHERE partida_id = ? AND set_num IS NOT NULL ORDER BY set_num",
+        (partida_id,)
+    )]
+
+# ===== CARGA FILTRADA =====
+
+def carregar_partida(conn, partida_id):
+    """Linha da tabela partidas de uma única partida"""
+    return pd.read_sql("SELECT * FROM partidas WHERE partida_id = ?", conn, params=(partida_id,))
+
+def carregar_rallys(conn, partida_id, set_num=None):
+    """Rallys de uma partida (ou de um set dela), na ordem do índice da chave natural
+
+    Já no formato compacto de tipos.tipar_rallys (flags Int8, texto categórico).
+    """
+    condicoes = ["partida_id = ?"]
+    parametros = [partida_id]
+    if set_num is not None:
+        condicoes.append("set_num = ?")
+        parametros.append(set_num)
+    colunas = ', '.join(COLUNAS_RALLYS)
+    return tipar_rallys(pd.read_sql(f"""
+        SELECT {colunas}, COALESCE(ganhador_ponto, ponto_num) AS ganhador_ponto
+        FROM rallys
+        WHERE {' AND '.join(condicoes)}
+        ORDER BY set_num, game_num, ordem_ponto
+    """, conn, params=parametros))
@@ -0,0 +1,540 @@
+import importlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+# Caminhos configuráveis pelas variáveis de ambiente TENIS_DB e TENIS_EXCEL
+DB_PATH = os.environ.get("TENIS_DB", "tenis_analises_db.db")
+EXCEL_PATH = os.environ.get("TENIS_EXCEL", "dados_tenis.xlsx")
+
+def colunas_da_tabela(conn, tabela):
+    """Lista as colunas de uma tabela"""
+    return [col[1] for col in conn.execute(f"PRAGMA table_info({tabela})")]
+
+# ===== MIGRAÇÕES =====
+# Cada passo recebe a conexão e roda dentro da transação aberta por aplicar_migracoes.
+# Os passos são idempotentes para funcionar tanto em bancos novos quanto antigos.
+# O schema de cada passo é SQL fixo, escrito aqui: mudar o código das análises não
+# muda o que uma migração antiga cria. O preenchimento das tabelas materializadas
+# usa o código atual e por isso fica pendente (Preenchimentos_Pendentes) até todas
+# as migrações rodarem, quando o schema já é o que esse código espera.
+
+def _m001_tabelas_base(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Partidas (
+        partida_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        data TEXT,
+        adversario TEXT,
+        ranking_adversario INTEGER,
+        resultado TEXT,
+        duracao_minutos INTEGER,
+        superficie TEXT,
+        clima TEXT,
+        cansaco_pre_jogo INTEGER,
+        qualidade_sono INTEGER,
+        dias_descanso INTEGER,
+        observacoes TEXT
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Rallys (
+        rally_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        partida_id INTEGER,
+        set_num INTEGER,
+        game_num INTEGER,
+        ponto_num INTEGER,
+        ace INTEGER,               -- BOOLEANO (0/1)
+        servidor INTEGER,          -- BOOLEANO (0/1)
+        primeiro_servico INTEGER,  -- BOOLEANO (0/1)
+        falha_servico INTEGER,     -- BOOLEANO (0/1)
+        devolucao_dentro INTEGER,  -- BOOLEANO (0/1)
+        break_point INTEGER,       -- BOOLEANO (0/1)
+        subiu_rede INTEGER,        -- BOOLEANO (0/1)
+        tipo_ponto TEXT,
+        golpe_vencedor TEXT,
+        direcao_golpe TEXT,
+        num_trocas INTEGER,
+        direcao_servico TEXT,
+        placar TEXT,
+        ganhador_ponto INTEGER     -- BOOLEANO (0/1)
+    )
+    """)
+
+def _m002_ganhador_ponto(conn):
+    # Bancos antigos: o comentário "-- NOVO CAMPO," engolia a vírgula e a coluna nunca existiu
+    if 'ganhador_ponto' not in colunas_da_tabela(conn, 'Rallys'):
+        conn.execute("ALTER TABLE Rallys ADD COLUMN ganhador_ponto INTEGER")
+    conn.execute("UPDATE Rallys SET ganhador_ponto = ponto_num WHERE ganhador_ponto IS NULL")
+
+def _m003_quarentena(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Quarentena (
+        quarentena_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tabela TEXT,
+        dados TEXT,          -- linha rejeitada em JSON
+        erro TEXT,
+        registrado_em TEXT
+    )
+    """)
+
+def _m004_chaves_naturais(conn):
+    # 'ponto_num' guarda o ganhador do ponto, então a chave do rally usa 'ordem_ponto'
+    if 'ordem_ponto' not in colunas_da_tabela(conn, 'Rallys'):
+        conn.execute("ALTER TABLE Rallys ADD COLUMN ordem_ponto INTEGER")
+        conn.execute("""
+        UPDATE Rallys SET ordem_ponto = o.n
+        FROM (
+            SELECT rally_id, ROW_NUMBER() OVER (
+                PARTITION BY partida_id, set_num, game_num ORDER BY rally_id
+            ) AS n
+            FROM Rallys
+        ) AS o
+        WHERE o.rally_id = Rallys.rally_id
+        """)
+
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_partidas_data_adversario ON Partidas (data, adversario)")
+    # Também atende a leitura de rallys por partida_id / set_num / game_num, em ordem
+    conn.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_rallys_ponto
+    ON Rallys (partida_id, set_num, game_num, ordem_ponto)
+    """)
+
+def _m005_indices_analiticos(conn):
+    # Cobre os filtros do dashboard: adversários, datas de um adversário e o partida_id escolhido
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS ix_partidas_adversario_data
+    ON Partidas (adversario, data, partida_id)
+    """)
+    conn.execute("ANALYZE")
+
+def _m006_estatisticas(conn):
+    # Tabela materializada; o preenchimento com as partidas existentes fica pendente
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Estatisticas (
+        partida_id INTEGER,
+        set_num INTEGER,
+        jogador INTEGER,           -- 1 = Rodrigo, 0 = adversário
+        total_pontos INTEGER,
+        total_erros INTEGER,
+        erros_backhand INTEGER,
+        erros_forehand INTEGER,
+        total_winners INTEGER,
+        winners_backhand INTEGER,
+        winners_forehand INTEGER,
+        duplas_faltas INTEGER,
+        devolucao_fora INTEGER,
+        pontos_saque INTEGER,
+        pontos_recebimento INTEGER,
+        saques INTEGER,
+        primeiros_servicos INTEGER,
+        segundos_servicos INTEGER,
+        pontos_1serv_ganhos INTEGER,
+        pontos_2serv_ganhos INTEGER,
+        aces INTEGER,
+        PRIMARY KEY (partida_id, set_num, jogador)
+    )
+    """)
+    marcar_preenchimento(conn, 'Estatisticas')
+
+def _m007_geracao(conn):
+    # Contador de gerações: cada importação que grava algo incrementa, e os caches do dashboard
+    # usam o valor como chave em vez de fazer hash dos dados
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Geracao (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        geracao INTEGER NOT NULL,
+        atualizada_em TEXT
+    )
+    """)
+    conn.execute("INSERT OR IGNORE INTO Geracao (id, geracao, atualizada_em) VALUES (1, 0, NULL)")
+
+def _m008_arquivos_importados(conn):
+    # Planilhas já processadas pela importação contínua, pelo hash do conteúdo
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Arquivos_Importados (
+        caminho TEXT PRIMARY KEY,
+        hash TEXT,                 -- sha256 do conteúdo
+        tamanho INTEGER,
+        mtime REAL,
+        status TEXT,               -- 'ok', 'erro' ou 'duplicado'
+        erro TEXT,
+        importado_em TEXT
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_arquivos_hash ON Arquivos_Importados (hash)")
+
+def _m009_sequencias(conn):
+    # Sequências de pontos (run-length) por partida/set; preenchimento pendente
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Sequencias (
+        partida_id INTEGER,
+        set_num INTEGER,
+        inicio INTEGER,            -- posição do 1º ponto no set
+        tamanho INTEGER,
+        ganhador INTEGER,          -- 1 = Rodrigo, 0 = adversário
+        PRIMARY KEY (partida_id, set_num, inicio)
+    )
+    """)
+    marcar_preenchimento(conn, 'Sequencias')
+
+def _m010_historico(conn):
+    # Resumo por partida para as análises entre partidas; preenchimento pendente
+    # (roda depois do de Estatisticas, de onde vêm as contagens)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Historico (
+        partida_id INTEGER PRIMARY KEY,
+        data TEXT,
+        adversario TEXT,
+        ranking_adversario INTEGER,
+        cansaco_pre_jogo INTEGER,
+        qualidade_sono INTEGER,
+        dias_descanso INTEGER,
+        pontos_jogador INTEGER,
+        pontos_adversario INTEGER,
+        games_jogador INTEGER,
+        games_adversario INTEGER,
+        sets_jogador INTEGER,
+        sets_adversario INTEGER,
+        saques_jogador INTEGER,
+        pontos_saque_jogador INTEGER,
+        saques_adversario INTEGER,
+        pontos_recebimento_jogador INTEGER,
+        aces INTEGER,
+        duplas_faltas INTEGER,
+        vitoria INTEGER            -- 1 = Rodrigo venceu, 0 = perdeu, vazio = sem resultado
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_historico_adversario_data ON Historico (adversario, data)")
+    marcar_preenchimento(conn, 'Historico')
+
+# ----- Migração 11: layout compacto dos rallys -----
+# As oito flags 0/1 ficam num único inteiro 'flags': o bit i guarda o valor da flag i
+# e o bit 8+i marca que ela está vazia (NULL). Os textos repetidos vão para tabelas de
+# domínio e cada rally guarda só o id. 'Rallys' vira uma view com os nomes de coluna de
+# sempre, e triggers INSTEAD OF traduzem INSERT/UPDATE/DELETE nela. Este layout é fixo:
+# mudá-lo é uma migração nova, não uma edição destas constantes.
+_FLAGS_M011 = [
+    'ganhador_ponto', 'servidor', 'ace', 'primeiro_servico',
+    'falha_servico', 'devolucao_dentro', 'break_point', 'subiu_rede',
+]
+_BIT_NULO_M011 = 8
+_DOMINIOS_M011 = {
+    'tipo_ponto': 'Tipos_Ponto',
+    'golpe_vencedor': 'Golpes_Vencedores',
+    'direcao_golpe': 'Direcoes_Golpe',
+    'direcao_servico': 'Direcoes_Servico',
+}
+_DIRETAS_M011 = ['partida_id', 'set_num', 'game_num', 'ordem_ponto', 'ponto_num', 'num_trocas', 'placar']
+_VIEW_M011 = [
+    'rally_id', 'partida_id', 'set_num', 'game_num', 'ponto_num', 'ace', 'servidor',
+    'primeiro_servico', 'falha_servico', 'devolucao_dentro', 'break_point', 'subiu_rede',
+    'tipo_ponto', 'golpe_vencedor', 'direcao_golpe', 'num_trocas', 'direcao_servico',
+    'placar', 'ganhador_ponto', 'ordem_ponto',
+]
+
+def _m011_flag_invalida(origem):
+    """Condição SQL verdadeira se alguma flag de 'origem' não é 0, 1 nem NULL"""
+    return "(" + " OR ".join(f"COALESCE({origem}.{flag} NOT IN (0, 1), 0)" for flag in _FLAGS_M011) + ")"
+
+def _m011_valores(origem):
+    """Colunas e expressões de uma linha de Rallys_Compactos a partir de 'origem' (ex.: NEW)"""
+    flags = " | ".join(
+        f"CASE WHEN {origem}.{flag} IS NULL THEN {1 << (_BIT_NULO_M011 + i)} "
+        f"WHEN {origem}.{flag} = 1 THEN {1 << i} ELSE 0 END"
+        for i, flag in enumerate(_FLAGS_M011)
+    )
+    colunas = ['rally_id'] + _DIRETAS_M011 + ['flags'] + [f"{c}_id" for c in _DOMINIOS_M011]
+    expressoes = ([f"{origem}.rally_id"] + [f"{origem}.{c}" for c in _DIRETAS_M011] + [f"({flags})"]
+                  + [f"(SELECT id FROM {t} WHERE nome = {origem}.{c})" for c, t in _DOMINIOS_M011.items()])
+    return colunas, expressoes
+
+def _m011_view_rallys(conn):
+    selecao = []
+    for coluna in _VIEW_M011:
+        if coluna in _FLAGS_M011:
+            i = _FLAGS_M011.index(coluna)
+            selecao.append(f"CASE WHEN (r.flags >> {_BIT_NULO_M011 + i}) & 1 = 0 THEN (r.flags >> {i}) & 1 END AS {coluna}")
+        elif coluna in _DOMINIOS_M011:
+            selecao.append(f"d_{coluna}.nome AS {coluna}")
+        else:
+            selecao.append(f"r.{coluna}")
+    juncoes = "\n".join(f"LEFT JOIN {tabela} d_{coluna} ON d_{coluna}.id = r.{coluna}_id"
+                        for coluna, tabela in _DOMINIOS_M011.items())
+    conn.execute(f"CREATE VIEW Rallys AS SELECT {', '.join(selecao)}\nFROM Rallys_Compactos r\n{juncoes}")
+
+    # Flag fora de 0/1 é recusada (a importação manda a linha para a Quarentena);
+    # NOT EXISTS em vez de OR IGNORE: um INSERT OR REPLACE na view trocaria o id dos valores
+    antes = f"SELECT RAISE(ABORT, 'flag de rally fora de 0/1') WHERE {_m011_flag_invalida('NEW')};\n" + "".join(
+        f"INSERT INTO {tabela} (nome) SELECT NEW.{coluna} WHERE NEW.{coluna} IS NOT NULL "
+        f"AND NOT EXISTS (SELECT 1 FROM {tabela} WHERE nome = NEW.{coluna});\n"
+        for coluna, tabela in _DOMINIOS_M011.items()
+    )
+    colunas, expressoes = _m011_valores('NEW')
+    conn.execute(f"""
+    CREATE TRIGGER rallys_inserir INSTEAD OF INSERT ON Rallys
+    BEGIN
+    {antes}INSERT INTO Rallys_Compactos ({', '.join(colunas)}) VALUES ({', '.join(expressoes)});
+    END
+    """)
+    atribuicoes = ', '.join(f"{c} = {e}" for c, e in zip(colunas, expressoes))
+    conn.execute(f"""
+    CREATE TRIGGER rallys_atualizar INSTEAD OF UPDATE ON Rallys
+    BEGIN
+    {antes}UPDATE Rallys_Compactos SET {atribuicoes} WHERE rally_id = OLD.rally_id;
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER rallys_apagar INSTEAD OF DELETE ON Rallys
+    BEGIN
+    DELETE FROM Rallys_Compactos WHERE rally_id = OLD.rally_id;
+    END
+    """)
+
+def _m011_rallys_compactos(conn):
+    # Flags num inteiro de bits e textos em tabelas de domínio; 'Rallys' vira uma view.
+    # O índice da chave natural muda de tabela (mesmo nome)
+    conn.execute("DROP INDEX IF EXISTS ux_rallys_ponto")
+    for coluna, tabela in _DOMINIOS_M011.items():
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {tabela} (id INTEGER PRIMARY KEY, nome TEXT NOT NULL UNIQUE)")
+        conn.execute(f"INSERT OR IGNORE INTO {tabela} (nome) "
+                     f"SELECT DISTINCT {coluna} FROM Rallys WHERE {coluna} IS NOT NULL")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Rallys_Compactos (
+        rally_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        partida_id INTEGER,
+        set_num INTEGER,
+        game_num INTEGER,
+        ordem_ponto INTEGER,
+        ponto_num INTEGER,
+        num_trocas INTEGER,
+        placar TEXT,
+        flags INTEGER,             -- bits 0-7: ganhador_ponto, servidor, ace, primeiro_servico, falha_servico,
+                                   --   devolucao_dentro, break_point, subiu_rede; bits 8-15: flag vazia
+        tipo_ponto_id INTEGER REFERENCES Tipos_Ponto (id),
+        golpe_vencedor_id INTEGER REFERENCES Golpes_Vencedores (id),
+        direcao_golpe_id INTEGER REFERENCES Direcoes_Golpe (id),
+        direcao_servico_id INTEGER REFERENCES Direcoes_Servico (id)
+    )
+    """)
+    conn.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_rallys_ponto
+    ON Rallys_Compactos (partida_id, set_num, game_num, ordem_ponto)
+    """)
+
+    invalidas = _m011_flag_invalida('Rallys')
+    colunas, expressoes = _m011_valores('Rallys')
+    conn.execute(f"INSERT INTO Rallys_Compactos ({', '.join(colunas)}) "
+                 f"SELECT {', '.join(expressoes)} FROM Rallys WHERE NOT {invalidas} ORDER BY rally_id")
+
+    # Rallys com flag fora de 0/1 não cabem nos bits: vão para a Quarentena
+    antigas = colunas_da_tabela(conn, 'Rallys')
+    recusadas = conn.execute(f"SELECT {', '.join(antigas)} FROM Rallys WHERE {invalidas}").fetchall()
+    if recusadas:
+        agora = datetime.now().isoformat(timespec='seconds')
+        conn.executemany(
+            "INSERT INTO Quarentena (tabela, dados, erro, registrado_em) VALUES ('rallys', ?, ?, ?)",
+            [(json.dumps(dict(zip(antigas, linha)), default=str, ensure_ascii=False), "flag de rally fora de 0/1", agora)
+             for linha in recusadas]
+        )
+        print(f"⚠️ {len(recusadas)} rally(s) com flag fora de 0/1 enviado(s) para a Quarentena")
+
+    conn.execute("DROP TABLE Rallys")
+    _m011_view_rallys(conn)
+    conn.execute("ANALYZE")
+
+def _m012_bases_ordem(conn):
+    # Onde começa a numeração ('ordem_ponto') de cada game em cada origem (planilha): a mesma
+    # origem reimportada cai nas mesmas chaves, uma planilha nova continua depois do que já existe
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Bases_Ordem (
+        origem TEXT NOT NULL,      -- '' = games gravados antes desta tabela (numerados a partir de 1)
+        partida_id INTEGER NOT NULL,
+        set_num INTEGER NOT NULL,  -- -1 quando vazio
+        game_num INTEGER NOT NULL, -- -1 quando vazio
+        base INTEGER NOT NULL,
+        PRIMARY KEY (origem, partida_id, set_num, game_num)
+    )
+    """)
+    conn.execute("""
+    INSERT OR IGNORE INTO Bases_Ordem (origem, partida_id, set_num, game_num, base)
+    SELECT DISTINCT '', partida_id, COALESCE(set_num, -1), COALESCE(game_num, -1), 0
+    FROM Rallys WHERE partida_id IS NOT NULL
+    """)
+
+def _m013_historico_placar(conn):
+    # Games e sets do Historico passam a vir do motor de placar: refaz as linhas gravadas
+    marcar_preenchimento(conn, 'Historico')
+
+def _m014_estatisticas_erros(conn):
+    # erros_backhand/erros_forehand passam a contar só os pontos de erro: refaz as linhas gravadas
+    marcar_preenchimento(conn, 'Estatisticas')
+
+MIGRACOES = [
+    (1, "Tabelas Partidas e Rallys", _m001_tabelas_base),
+    (2, "Coluna ganhador_ponto em Rallys", _m002_ganhador_ponto),
+    (3, "Tabela Quarentena", _m003_quarentena),
+    (4, "Chaves naturais UNIQUE (dedup da importação)", _m004_chaves_naturais),
+    (5, "Índices analíticos do dashboard", _m005_indices_analiticos),
+    (6, "Tabela Estatisticas por partida/set/jogador", _m006_estatisticas),
+    (7, "Contador de geração dos dados", _m007_geracao),
+    (8, "Controle de planilhas importadas (hash)", _m008_arquivos_importados),
+    (9, "Tabela Sequencias por partida/set", _m009_sequencias),
+    (10, "Tabela Historico por partida", _m010_historico),
+    (11, "Rallys compactos (flags em bits, domínios) e view Rallys", _m011_rallys_compactos),
+    (12, "Bases da numeração dos pontos por planilha de origem", _m012_bases_ordem),
+    (13, "Placar final do Historico pelo motor de placar", _m013_historico_placar),
+    (14, "Erros de backhand/forehand só nos pontos de erro", _m014_estatisticas_erros),
+]
+
+# Preenchimento das tabelas materializadas pelo código atual, na ordem de dependência:
+# (tabela, módulo, função). Os módulos de análise (e o pandas) só são importados
+# quando há preenchimento pendente, não a cada conectar()
+PREENCHIMENTOS = [
+    ('Estatisticas', 'estatisticas', 'preencher_estatisticas'),
+    ('Sequencias', 'sequencias', 'preencher_sequencias'),
+    ('Historico', 'historico', 'preencher_historico'),     # usa Estatisticas
+]
+
+def versao_atual(conn):
+    """Versão do schema já aplicada ao banco (0 para banco vazio ou anterior às migrações)"""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Versao_Schema (
+        versao INTEGER PRIMARY KEY,
+        descricao TEXT,
+        aplicada_em TEXT
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS Preenchimentos_Pendentes (
+        tabela TEXT PRIMARY KEY,
+        registrado_em TEXT
+    )
+    """)
+    return conn.execute("SELECT COALESCE(MAX(versao), 0) FROM Versao_Schema").fetchone()[0]
+
+def marcar_preenchimento(conn, tabela):
+    """Registra, na transação da migração, que 'tabela' precisa ser (re)preenchida"""
+    conn.execute("INSERT OR REPLACE INTO Preenchimentos_Pendentes (tabela, registrado_em) VALUES (?, ?)",
+                 (tabela, datetime.now().isoformat(timespec='seconds')))
+
+def aplicar_preenchimentos(conn):
+    """Preenche as tabelas pendentes, cada uma em sua transação junto com a baixa da pendência"""
+    pendentes = {linha[0] for linha in conn.execute("SELECT tabela FROM Preenchimentos_Pendentes")}
+    for tabela, modulo, funcao in PREENCHIMENTOS:
+        if tabela not in pendentes:
+            continue
+        preencher = getattr(importlib.import_module(f".{modulo}", __package__), funcao)
+        try:
+            conn.execute("BEGIN")
+            total = preencher(conn)
+            conn.execute("DELETE FROM Preenchimentos_Pendentes WHERE tabela = ?", (tabela,))
+            conn.commit()
+            print(f"🔧 Tabela {tabela} preenchida ({total} linha(s))")
+        except Exception:
+            # A pendência continua registrada: a próxima conexão tenta de novo
+            conn.rollback()
+            print(f"❌ Falha ao preencher a tabela {tabela}")
+            raise
+
+def aplicar_migracoes(conn):
+    """Aplica, em ordem e cada uma em sua transação, as migrações ainda pendentes"""
+    conn.commit()
+    atual = versao_atual(conn)
+    conn.commit()
+    for versao, descricao, migracao in MIGRACOES:
+        if versao <= atual:
+            continue
+        try:
+            conn.execute("BEGIN")
+            migracao(conn)
+            conn.execute(
+                "INSERT INTO Versao_Schema (versao, descricao, aplicada_em) VALUES (?, ?, ?)",
+                (versao, descricao, datetime.now().isoformat(timespec='seconds'))
+            )
+            conn.commit()
+            print(f"🔧 Migração {versao} aplicada: {descricao}")
+        except Exception:
+            # Erro de SQL ou do Python: a transação aberta pelo BEGIN não pode ficar pendurada
+            conn.rollback()
+            print(f"❌ Falha na migração {versao}: {descricao}")
+            raise
+    aplicar_preenchimentos(conn)
+    return versao_atual(conn)
+
+def geracao_atual(conn):
+    """Geração atual dos dados (muda a cada importação que grava algo)"""
+    return conn.execute("SELECT geracao FROM Geracao WHERE id = 1").fetchone()[0]
+
+def incrementar_geracao(conn):
+    """Marca que os dados mudaram, invalidando os caches que usam a geração como chave"""
+    conn.execute(
+        "UPDATE Geracao SET geracao = geracao + 1, atualizada_em = ? WHERE id = 1",
+        (datetime.now().isoformat(timespec='seconds'),)
+    )
+    conn.commit()
+    return geracao_atual(conn)
+
+def impressao_digital(conn, db_path=None):
+    """Chave barata do estado do banco: (geração, mtime do arquivo)
+
+    A geração cobre as importações; o mtime cobre escritas feitas por fora delas.
+    """
+    caminho = db_path or DB_PATH
+    mtime = os.stat(caminho).st_mtime_ns if os.path.exists(caminho) else 0
+    return geracao_atual(conn), mtime
+
+def conectar(db_path=None):
+    """Abre o banco (criando se não existir) já atualizado para a última versão do schema"""
+    conn = sqlite3.connect(db_path or DB_PATH)
+    aplicar_migracoes(conn)
+    return conn
+
+def criar_banco_completo(db_path=None, excel_path=None):
+    # Configurações
+    db_path = db_path or DB_PATH
+    excel_path = excel_path or EXCEL_PATH
+
+    # Conecta ao banco (cria se não existir) e aplica as migrações pendentes
+    conn = conectar(db_path)
+
+    # ===== CRIA ARQUIVO EXCEL MODELO =====
+    # Não sobrescreve uma planilha de digitação que já existe
+    if os.path.exists(excel_path):
+        conn.close()
+        print(f"✅ Banco atualizado: {db_path} (planilha {excel_path} mantida)")
+        return
+
+    # openpyxl só é importado aqui: abrir o banco (conectar) não paga esse custo
+    from openpyxl import Workbook
+    wb = Workbook()
+
+    # Planilha Partidas (com placar)
+    ws_partidas = wb.active
+    ws_partidas.title = "Partidas"
+    ws_partidas.append([
+        "data", "adversario", "ranking_adversario", "resultado",
+        "duracao_minutos", "superficie", "clima", "cansaco_pre_jogo",
+        "qualidade_sono", "dias_descanso", "observacoes"
+    ])
+
+    # Planilha Rallys
+    ws_rallys = wb.create_sheet("Digitação")
+    ws_rallys.append([
+        "partida_id", "set_num", "game_num", "ponto_num", "ace",
+        "servidor", "primeiro_servico", "falha_servico", "devolucao_dentro",
+        "break_point", "subiu_rede", "tipo_ponto", "golpe_vencedor",
+        "direcao_golpe", "num_trocas", "direcao_servico", "ganhador_ponto","placar"
+    ])
+
+    wb.save(excel_path)
+
+    conn.close()
+    print(f"""✅ Banco criado com sucesso!
+    - Local do banco: {db_path}
+    - Modelo Excel gerado: {excel_path}""")
+
+# Executa a criação
+if __name__ == "__main__":
+    criar_banco_completo()
\ No newline at end of file
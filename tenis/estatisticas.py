@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+from .tipos import tipar_rallys, valores
+
+# Contagens guardadas na tabela Estatisticas, por (partida_id, set_num, jogador).
+# Só contagens: percentuais são derivados na leitura, então somar sets é válido.
+# A tabela é criada pela migração 6 (criar_banco); aqui ficam o cálculo e a carga.
+CONTAGENS = [
+    'total_pontos', 'total_erros', 'erros_backhand', 'erros_forehand',
+    'total_winners', 'winners_backhand', 'winners_forehand', 'duplas_faltas',
+    'devolucao_fora', 'pontos_saque', 'pontos_recebimento',
+    'saques', 'primeiros_servicos', 'segundos_servicos',
+    'pontos_1serv_ganhos', 'pontos_2serv_ganhos', 'aces',
+]
+
+def _codigos(serie, *valores):
+    """Máscaras por valor pedido, comparando só os códigos da coluna categórica
+
+    Os valores são testados uma vez por categoria (não por linha); colunas que
+    ainda são texto (object) são codificadas aqui.
+    """
+    categorias = pd.Categorical(serie)
+    codigos = categorias.codes
+    mascaras = []
+    for valor in valores:
+        # Código -1 (vazio) aponta para a última posição, sempre False
+        if callable(valor):
+            tabela = np.append(np.asarray(valor(categorias.categories), dtype=bool), False)
+        else:
+            tabela = np.append(categorias.categories == valor, False)
+        mascaras.append(tabela[codigos])
+    return mascaras
+
+def _indicadores(rallys):
+    """Matriz 0/1 (linhas x contagens) para cada jogador, numa única passada vetorizada"""
+    ganhador = valores(rallys['ganhador_ponto'])
+    servidor = valores(rallys['servidor'])
+    primeiro = valores(rallys['primeiro_servico'])
+    falha = valores(rallys['falha_servico']) == 1
+    devolucao_fora = valores(rallys['devolucao_dentro']) == 0
+    ace = np.nan_to_num(valores(rallys['ace']))
+
+    erro, winner, dupla_falta = _codigos(
+        rallys['tipo_ponto'], lambda c: c.str.contains('Erro'), 'Winner', 'Dupla Falta'
+    )
+    backhand, forehand = _codigos(rallys['golpe_vencedor'], 'Backhand', 'Forehand')
+
+    colunas = {}
+    for jogador in (1, 0):
+        ganhou = ganhador == jogador
+        perdeu = ganhador == 1 - jogador
+        saca = servidor == jogador
+        recebe = servidor == 1 - jogador
+        contagens = {
+            'total_pontos': ganhou,
+            'total_erros': ganhou & erro,
+            # Só os erros (os golpes dos winners não entram): backhand + forehand <= total_erros
+            'erros_backhand': ganhou & erro & backhand,
+            'erros_forehand': ganhou & erro & forehand,
+            'total_winners': ganhou & winner,
+            'winners_backhand': ganhou & winner & backhand,
+            'winners_forehand': ganhou & winner & forehand,
+            'duplas_faltas': perdeu & dupla_falta & falha,
+            'devolucao_fora': ganhou & recebe & devolucao_fora,
+            'pontos_saque': ganhou & saca,
+            'pontos_recebimento': ganhou & recebe,
+            # Saque do jogador
+            'saques': saca,
+            'primeiros_servicos': saca & (primeiro == 1),
+            'segundos_servicos': saca & (primeiro == 0),
+            'pontos_1serv_ganhos': saca & (primeiro == 1) & ganhou,
+            'pontos_2serv_ganhos': saca & (primeiro == 0) & ganhou,
+            'aces': np.where(saca, ace, 0),
+        }
+        for nome, contagem in contagens.items():
+            colunas[(jogador, nome)] = contagem.astype(np.int64)
+    return pd.DataFrame(colunas, index=rallys.index)
+
+def calcular_estatisticas(rallys, por=('partida_id', 'set_num')):
+    """Contagens por agrupamento e jogador, num único groupby sobre colunas inteiras
+
+    'por' aceita qualquer combinação de colunas dos rallys: partida
+    (['partida_id']), set (padrão), game (['partida_id', 'set_num', 'game_num'])
+    ou lado do saque (['servidor']). Com 'por' vazio soma todos os rallys.
+    Devolve uma linha por grupo e jogador, com as colunas de CONTAGENS.
+    """
+    por = list(por)
+    indicadores = _indicadores(rallys)
+    if por:
+        chaves = [rallys[col] for col in por]
+        somas = indicadores.groupby(chaves, dropna=False, observed=True).sum()
+    else:
+        somas = indicadores.sum().to_frame().T
+
+    # (grupo) x (jogador, contagem) -> uma linha por (grupo, jogador)
+    partes = [somas[jogador].assign(jogador=jogador) for jogador in (1, 0)]
+    linhas = pd.concat(partes).reset_index(drop=not por)
+    if por:
+        linhas.columns = por + list(linhas.columns[len(por):])
+    linhas = linhas.sort_values(por + ['jogador'], ascending=[True] * len(por) + [False], kind='stable')
+    return linhas[por + ['jogador'] + CONTAGENS].reset_index(drop=True)
+
+def derivar_percentuais(linhas):
+    """Acrescenta os percentuais de saque a uma tabela de contagens (vazio quando não há base)"""
+    linhas = linhas.copy()
+    for pct, parte, total in (('pct_primeiro_servico', 'primeiros_servicos', 'saques'),
+                              ('pct_pontos_1serv', 'pontos_1serv_ganhos', 'primeiros_servicos'),
+                              ('pct_pontos_2serv', 'pontos_2serv_ganhos', 'segundos_servicos')):
+        linhas[pct] = linhas[parte] / linhas[total].where(linhas[total] > 0) * 100
+    return linhas
+
+def _ler_rallys(conn, partidas_ids=None):
+    query = """
+        SELECT partida_id, set_num, servidor, primeiro_servico, falha_servico,
+               devolucao_dentro, ace, tipo_ponto, golpe_vencedor,
+               COALESCE(ganhador_ponto, ponto_num) AS ganhador_ponto
+        FROM rallys
+    """
+    if partidas_ids is None:
+        return tipar_rallys(pd.read_sql(query, conn))
+    marcadores = ','.join(['?'] * len(partidas_ids))
+    return tipar_rallys(pd.read_sql(query + f" WHERE partida_id IN ({marcadores})", conn, params=list(partidas_ids)))
+
+def preencher_estatisticas(conn, partidas_ids=None):
+    """Substitui as linhas de Estatisticas das partidas indicadas (todas se None), sem commit"""
+    stats = calcular_estatisticas(_ler_rallys(conn, partidas_ids))
+    if partidas_ids is None:
+        conn.execute("DELETE FROM Estatisticas")
+    else:
+        marcadores = ','.join(['?'] * len(partidas_ids))
+        conn.execute(f"DELETE FROM Estatisticas WHERE partida_id IN ({marcadores})", list(partidas_ids))
+
+    colunas = list(stats.columns)
+    linhas = stats.astype(object).where(stats.notna(), None).itertuples(index=False, name=None)
+    conn.executemany(
+        f"INSERT INTO Estatisticas ({','.join(colunas)}) VALUES ({','.join(['?'] * len(colunas))})",
+        list(linhas)
+    )
+    return len(stats)
+
+def atualizar_estatisticas(conn, partidas_ids):
+    """Recalcula as estatísticas só das partidas tocadas por uma importação"""
+    partidas_ids = [int(p) for p in pd.unique(pd.Series(list(partidas_ids), dtype=float).dropna())]
+    if not partidas_ids:
+        return 0
+    preencher_estatisticas(conn, partidas_ids)
+    conn.commit()
+    return len(partidas_ids)
+
+def reconstruir_estatisticas(conn):
+    """Regera a tabela Estatisticas inteira a partir dos rallys"""
+    total = preencher_estatisticas(conn)
+    conn.commit()
+    return total
+
+def carregar_estatisticas(conn, partida_id, set_num=None):
+    """Linhas de Estatisticas de uma partida (ou de um set), por jogador"""
+    query = "SELECT * FROM Estatisticas WHERE partida_id = ?"
+    parametros = [partida_id]
+    if set_num is not None:
+        query += " AND set_num = ?"
+        parametros.append(set_num)
+    return pd.read_sql(query, conn, params=parametros)
+
+def montar_stats(linhas, jogador):
+    """Soma as linhas de um jogador e deriva os percentuais exibidos no dashboard"""
+    totais = linhas.loc[linhas['jogador'] == jogador, CONTAGENS].sum().to_frame().T.astype(int)
+    stats = derivar_percentuais(totais).iloc[0].to_dict()
+    return {c: int(v) if c in CONTAGENS else float(v) for c, v in stats.items()}
+
+# Regera a tabela a partir dos rallys: python -m tenis.estatisticas
+if __name__ == "__main__":
+    from .criar_banco import conectar, incrementar_geracao
+    conn = conectar()
+    total = reconstruir_estatisticas(conn)
+    incrementar_geracao(conn)
+    conn.close()
+    print(f"✅ Estatísticas reconstruídas: {total} linha(s)")
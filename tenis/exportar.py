@@ -0,0 +1,159 @@
+import os
+import pandas as pd
+from .placar import ContinuacaoPlacar, calcular_placar
+
+# Exportação em fluxo dos rallys para CSV, JSON lines ou Parquet: um cursor SQLite
+# lido com fetchmany, bloco a bloco, e cada bloco já vai para o arquivo. A memória
+# depende do tamanho do bloco, não do número de rallys (temporadas inteiras).
+# Cada rally sai com os dados da partida e o placar calculado antes do ponto (o
+# mesmo motor do dashboard, levando o estado de um bloco para o outro).
+
+TAMANHO_BLOCO = 10000
+
+COLUNAS_PARTIDA = [
+    'data', 'adversario', 'ranking_adversario', 'resultado', 'duracao_minutos', 'superficie',
+    'clima', 'cansaco_pre_jogo', 'qualidade_sono', 'dias_descanso', 'observacoes',
+]
+COLUNAS_RALLY = [
+    'partida_id', 'set_num', 'game_num', 'ordem_ponto', 'ganhador_ponto', 'servidor', 'ace',
+    'primeiro_servico', 'falha_servico', 'devolucao_dentro', 'break_point', 'subiu_rede',
+    'tipo_ponto', 'golpe_vencedor', 'direcao_golpe', 'direcao_servico', 'num_trocas', 'placar',
+]
+COLUNAS_PLACAR = [
+    'placar_antes', 'games_jogador', 'games_adversario', 'sets_jogador', 'sets_adversario',
+    'tiebreak', 'pressao',
+]
+COLUNAS_EXPORTACAO = ['partida_id'] + COLUNAS_PARTIDA + COLUNAS_RALLY[1:] + COLUNAS_PLACAR
+
+# Tipos fixos (anuláveis) para todos os blocos terem o mesmo esquema
+_TEXTO = {'data', 'adversario', 'resultado', 'superficie', 'clima', 'observacoes', 'tipo_ponto',
+          'golpe_vencedor', 'direcao_golpe', 'direcao_servico', 'placar', 'placar_antes', 'pressao'}
+TIPOS_EXPORTACAO = {
+    col: 'string' if col in _TEXTO else 'boolean' if col == 'tiebreak' else 'Int64'
+    for col in COLUNAS_EXPORTACAO
+}
+
+def filtrar_partidas(inicio=None, fim=None, adversario=None, partidas=None):
+    """Condição SQL sobre a tabela partidas e seus parâmetros (datas inclusivas, AAAA-MM-DD)"""
+    condicoes, parametros = [], []
+    if inicio:
+        condicoes.append("data >= ?")
+        parametros.append(str(inicio))
+    if fim:
+        condicoes.append("data <= ?")
+        parametros.append(str(fim))
+    if adversario:
+        condicoes.append("adversario = ?")
+        parametros.append(adversario)
+    if partidas:
+        condicoes.append(f"partida_id IN ({','.join(['?'] * len(partidas))})")
+        parametros.extend(int(p) for p in partidas)
+    return ' AND '.join(condicoes) or '1', parametros
+
+# ===== ESCRITORES (um bloco por vez) =====
+
+class EscritorCSV:
+    def __init__(self, destino):
+        self.arquivo = open(destino, 'w', encoding='utf-8', newline='')
+        self.cabecalho = True
+
+    def escrever(self, bloco):
+        bloco.to_csv(self.arquivo, header=self.cabecalho, index=False)
+        self.cabecalho = False
+
+    def fechar(self):
+        self.arquivo.close()
+
+class EscritorJSONL:
+    def __init__(self, destino):
+        self.arquivo = open(destino, 'w', encoding='utf-8')
+
+    def escrever(self, bloco):
+        if bloco.empty:
+            return
+        texto = bloco.to_json(orient='records', lines=True, force_ascii=False)
+        self.arquivo.write(texto if texto.endswith('\n') else texto + '\n')
+
+    def fechar(self):
+        self.arquivo.close()
+
+class EscritorParquet:
+    """Um row group por bloco, com o esquema do primeiro (os tipos são fixos)"""
+
+    def __init__(self, destino):
+        # pyarrow só é importado quando o destino é Parquet
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa, self.pq = pa, pq
+        self.destino = destino
+        self.escritor = None
+
+    def escrever(self, bloco):
+        if self.escritor is None:
+            tabela = self.pa.Table.from_pandas(bloco, preserve_index=False)
+            self.escritor = self.pq.ParquetWriter(self.destino, tabela.schema)
+        else:
+            tabela = self.pa.Table.from_pandas(bloco, schema=self.escritor.schema, preserve_index=False)
+        self.escritor.write_table(tabela)
+
+    def fechar(self):
+        if self.escritor is not None:
+            self.escritor.close()
+
+ESCRITORES = {'.csv': EscritorCSV, '.jsonl': EscritorJSONL, '.json': EscritorJSONL, '.parquet': EscritorParquet}
+
+def abrir_escritor(destino):
+    """Escritor incremental para o destino; o formato vem da extensão"""
+    extensao = os.path.splitext(destino)[1].lower()
+    if extensao not in ESCRITORES:
+        raise ValueError(f"Formato não suportado: {extensao} (use .csv, .jsonl ou .parquet)")
+    return ESCRITORES[extensao](destino)
+
+# ===== EXPORTAÇÃO =====
+
+def blocos_rallys(conn, inicio=None, fim=None, adversario=None, partidas=None, tamanho_bloco=TAMANHO_BLOCO):
+    """Gera blocos de rallys (COLUNAS_EXPORTACAO) das partidas filtradas, em ordem"""
+    condicao, parametros = filtrar_partidas(inicio, fim, adversario, partidas)
+    # Partidas é pequena: os dados da partida entram por lookup em memória, sem JOIN por rally
+    dados_partidas = pd.read_sql(f"SELECT partida_id, {', '.join(COLUNAS_PARTIDA)} FROM partidas WHERE {condicao}",
+                                 conn, params=parametros).set_index('partida_id')
+    colunas = ', '.join('COALESCE(ganhador_ponto, ponto_num)' if col == 'ganhador_ponto' else col
+                        for col in COLUNAS_RALLY)
+    cursor = conn.execute(f"""
+        SELECT {colunas}
+        FROM rallys
+        WHERE partida_id IN (SELECT partida_id FROM partidas WHERE {condicao})
+        ORDER BY partida_id, set_num, game_num, ordem_ponto
+    """, parametros)
+    continuacao = ContinuacaoPlacar()
+    try:
+        while True:
+            linhas = cursor.fetchmany(tamanho_bloco)
+            if not linhas:
+                break
+            bloco = pd.DataFrame.from_records(linhas, columns=COLUNAS_RALLY).astype(
+                {col: TIPOS_EXPORTACAO[col] for col in COLUNAS_RALLY})
+            placar = calcular_placar(bloco, 'ganhador_ponto', continuacao)
+            for col in COLUNAS_PLACAR:
+                bloco[col] = placar[col].astype(str) if col == 'pressao' else placar[col]
+            for col in COLUNAS_PARTIDA:
+                bloco[col] = bloco['partida_id'].map(dados_partidas[col])
+            yield bloco[COLUNAS_EXPORTACAO].astype(TIPOS_EXPORTACAO)
+    finally:
+        cursor.close()
+
+def exportar_rallys(conn, destino, inicio=None, fim=None, adversario=None, partidas=None,
+                    tamanho_bloco=TAMANHO_BLOCO):
+    """Grava os rallys filtrados (com partida e placar) em destino, bloco a bloco; devolve o nº de linhas"""
+    escritor = abrir_escritor(destino)
+    total = 0
+    try:
+        for bloco in blocos_rallys(conn, inicio, fim, adversario, partidas, tamanho_bloco):
+            escritor.escrever(bloco)
+            total += len(bloco)
+        if not total:
+            # Sem rallys: CSV só com o cabeçalho, Parquet só com o esquema
+            escritor.escrever(pd.DataFrame(columns=COLUNAS_EXPORTACAO).astype(TIPOS_EXPORTACAO))
+    finally:
+        escritor.fechar()
+    return total
@@ -0,0 +1,173 @@
+import sys
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from .placar import calcular_placar, tabelas
+
+# Gerador de partidas sintéticas, no mesmo layout das abas Partidas/Digitação e
+# do banco. O placar é simulado ponto a ponto pelas tabelas do motor de placar,
+# então sets, games, saque e break points são coerentes entre si.
+
+COLUNAS_PARTIDAS = [
+    "data", "adversario", "ranking_adversario", "resultado",
+    "duracao_minutos", "superficie", "clima", "cansaco_pre_jogo",
+    "qualidade_sono", "dias_descanso", "observacoes"
+]
+COLUNAS_DIGITACAO = [
+    "partida_id", "set_num", "game_num", "ponto_num", "ace",
+    "servidor", "primeiro_servico", "falha_servico", "devolucao_dentro",
+    "break_point", "subiu_rede", "tipo_ponto", "golpe_vencedor",
+    "direcao_golpe", "num_trocas", "direcao_servico", "ganhador_ponto", "placar"
+]
+
+ADVERSARIOS = ["Jefferson", "Marcos", "Bruno", "Thiago", "Felipe", "Gustavo", "Lucas", "André",
+               "Rafael", "Diego", "Caio", "Vitor", "Henrique", "Pedro", "Mateus", "Renato"]
+SUPERFICIES = ["Saibro", "Rápida", "Grama"]
+CLIMAS = ["Sol", "Nublado", "Vento", "Calor"]
+SETS_PARA_VENCER = 2
+
+def _simular_partida(rng, p_saque_jogador, p_saque_adversario, sacador_inicial):
+    """Sequência de pontos de uma partida: (set, game, servidor, ganhador, break_point) e o resultado"""
+    t = tabelas()
+    proximo, fecha_game = t.proximo, t.fecha_game_np
+    sj, sa, gj, ga = t.sets_jogador, t.sets_adversario, t.games_jogador, t.games_adversario
+    tiebreak = t.tiebreak
+
+    pontos = []
+    resultado = []
+    estado, set_num, game_num = 0, 1, 1
+    sacador_game, ponto_tiebreak = sacador_inicial, 0
+    while sj[estado] < SETS_PARA_VENCER and sa[estado] < SETS_PARA_VENCER:
+        if tiebreak[estado]:
+            # No tiebreak o saque troca depois do 1º ponto e então a cada 2
+            servidor = sacador_game if ((ponto_tiebreak + 1) // 2) % 2 == 0 else 1 - sacador_game
+            ponto_tiebreak += 1
+            break_point = 0
+        else:
+            servidor = sacador_game
+            break_point = int(fecha_game[estado][1 - servidor])
+        p = p_saque_jogador if servidor == 1 else p_saque_adversario
+        ganhador = servidor if rng.random() < p else 1 - servidor
+        pontos.append((set_num, game_num, servidor, ganhador, break_point))
+
+        games_antes = (gj[estado], ga[estado])
+        fechou = fecha_game[estado][ganhador]
+        estado = proximo[estado][ganhador]
+        if fechou:
+            sacador_game, ponto_tiebreak = 1 - sacador_game, 0
+            if gj[estado] == ga[estado] == 0:
+                # Fim de set: guarda o placar em games ("63", "76"...)
+                gj_fim = games_antes[0] + (ganhador == 1)
+                ga_fim = games_antes[1] + (ganhador == 0)
+                resultado.append(f"{gj_fim}{ga_fim}")
+                set_num, game_num = set_num + 1, 1
+            else:
+                game_num += 1
+    return pontos, "-".join(resultado)
+
+def _escolher(rng, opcoes, pesos, n):
+    return rng.choice(np.array(opcoes, dtype=object), size=n, p=pesos)
+
+def _detalhar(rng, servidor, ganhador):
+    """Flags, tipo do ponto e golpes coerentes com quem sacou e quem ganhou"""
+    n = len(servidor)
+    saque_venceu = ganhador == servidor
+    sorteio = rng.random(n)
+    ace = saque_venceu & (sorteio < 0.08)
+    devolucao_fora = saque_venceu & ~ace & (sorteio < 0.22)
+    dupla_falta = ~saque_venceu & (sorteio < 0.07)
+    rally = ~(ace | devolucao_fora | dupla_falta)
+
+    primeiro_servico = np.where(dupla_falta, 0, (rng.random(n) < 0.62).astype(int))
+    num_trocas = np.where(rally, 2 + rng.geometric(0.25, n), np.where(dupla_falta, 0, 1))
+
+    tipo_ponto = _escolher(rng, ["Winner", "Erro", "Erro_Forcado"], [0.3, 0.5, 0.2], n)
+    tipo_ponto[ace] = "Ace"
+    tipo_ponto[devolucao_fora] = "Erro"
+    tipo_ponto[dupla_falta] = "Dupla Falta"
+    golpe = _escolher(rng, ["Forehand", "Backhand", "Voleio", "Smash"], [0.52, 0.35, 0.09, 0.04], n)
+    golpe[ace] = "Saque"
+    golpe[dupla_falta] = None
+    direcao = _escolher(rng, ["Paralela", "Cruzado", "Inside_Out", "Meio"], [0.35, 0.4, 0.15, 0.1], n)
+    direcao[~rally] = None
+
+    return pd.DataFrame({
+        "ace": ace.astype(int),
+        "primeiro_servico": primeiro_servico,
+        "falha_servico": dupla_falta.astype(int),
+        "devolucao_dentro": np.where(ace | devolucao_fora, 0, np.where(dupla_falta, np.nan, 1)),
+        "subiu_rede": (rally & (rng.random(n) < 0.15)).astype(int),
+        "tipo_ponto": tipo_ponto,
+        "golpe_vencedor": golpe,
+        "direcao_golpe": direcao,
+        "num_trocas": num_trocas,
+        "direcao_servico": _escolher(rng, ["T", "Aberto", "Corpo"], [0.4, 0.4, 0.2], n),
+    })
+
+def gerar_dados(n_rallys, semente=0, partida_inicial=1, data_inicial=date(2021, 1, 10)):
+    """Gera partidas até somar pelo menos 'n_rallys' pontos
+
+    Retorna (partidas, rallys) nos layouts das abas Partidas e Digitação;
+    'partida_id' dos rallys começa em 'partida_inicial' e segue a ordem das partidas.
+    """
+    rng = np.random.default_rng(semente)
+    partidas, blocos = [], []
+    total, partida_id, dia = 0, partida_inicial, data_inicial
+    while total < n_rallys:
+        pontos, resultado = _simular_partida(
+            rng, rng.normal(0.63, 0.05), rng.normal(0.60, 0.05), int(rng.integers(0, 2))
+        )
+        pontos = np.array(pontos, dtype=np.int64)
+        blocos.append(pd.DataFrame({
+            "partida_id": partida_id,
+            "set_num": pontos[:, 0],
+            "game_num": pontos[:, 1],
+            "servidor": pontos[:, 2],
+            "ponto_num": pontos[:, 3],
+            "break_point": pontos[:, 4],
+        }))
+        # Datas distintas por adversário (chave natural data + adversário)
+        dia += timedelta(days=int(rng.integers(1, 4)))
+        partidas.append({
+            "data": dia.isoformat(),
+            "adversario": ADVERSARIOS[int(rng.integers(len(ADVERSARIOS)))],
+            "ranking_adversario": int(rng.integers(1, 50)),
+            "resultado": resultado,
+            "duracao_minutos": int(len(pontos) * rng.uniform(0.6, 0.9)),
+            "superficie": SUPERFICIES[int(rng.integers(len(SUPERFICIES)))],
+            "clima": CLIMAS[int(rng.integers(len(CLIMAS)))],
+            "cansaco_pre_jogo": int(rng.integers(1, 6)),
+            "qualidade_sono": int(rng.integers(50, 100)),
+            "dias_descanso": int(rng.integers(0, 5)),
+            "observacoes": "Sintético",
+        })
+        total += len(pontos)
+        partida_id += 1
+
+    rallys = pd.concat(blocos, ignore_index=True)
+    detalhes = _detalhar(rng, rallys["servidor"].to_numpy(), rallys["ponto_num"].to_numpy())
+    rallys = pd.concat([rallys, detalhes], axis=1)
+    rallys["ganhador_ponto"] = rallys["ponto_num"]
+    rallys["placar"] = calcular_placar(rallys, "ponto_num")["placar"]
+    return pd.DataFrame(partidas, columns=COLUNAS_PARTIDAS), rallys[COLUNAS_DIGITACAO]
+
+def escrever_planilha(partidas, rallys, caminho):
+    """Grava as abas Partidas e Digitação (mesmo layout do modelo do criar_banco)"""
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    for nome, df, colunas in (("Partidas", partidas, COLUNAS_PARTIDAS),
+                              ("Digitação", rallys, COLUNAS_DIGITACAO)):
+        ws = wb.create_sheet(nome)
+        ws.append(colunas)
+        valores = df[colunas].astype(object).where(df[colunas].notna(), None)
+        for linha in valores.itertuples(index=False, name=None):
+            ws.append(linha)
+    wb.save(caminho)
+
+# python -m tenis.gerar_dados N_RALLYS ARQUIVO.xlsx [SEMENTE]
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        raise SystemExit("Uso: python -m tenis.gerar_dados N_RALLYS ARQUIVO.xlsx [SEMENTE]")
+    partidas, rallys = gerar_dados(int(float(sys.argv[1])), semente=int(sys.argv[3]) if len(sys.argv) > 3 else 0)
+    escrever_planilha(partidas, rallys, sys.argv[2])
+    print(f"✅ {len(partidas)} partida(s) e {len(rallys)} rally(s) gravados em {sys.argv[2]}")
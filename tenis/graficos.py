@@ -0,0 +1,36 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# Linhas do tempo longas (vários sets, temporadas) em WebGL e com orçamento fixo de
+# pontos por série: acima dele a série é reduzida no servidor, guardando o mínimo e
+# o máximo de cada faixa do eixo x (os picos continuam visíveis), e o navegador
+# recebe sempre no máximo ORCAMENTO_PONTOS pontos por série.
+ORCAMENTO_PONTOS = 2000
+
+def decimar(x, y, orcamento=ORCAMENTO_PONTOS):
+    """Reduz (x, y) a no máximo ~orcamento pontos, mantendo mínimo e máximo de cada faixa
+
+    'x' deve estar em ordem crescente; o primeiro e o último ponto são mantidos.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= orcamento:
+        return x, y
+    faixas = max((orcamento - 2) // 2, 1)
+    faixa = np.arange(n) * faixas // n
+    # Ordena por (faixa, y): a primeira e a última posição de cada faixa são o mínimo e o máximo
+    ordem = np.lexsort((y, faixa))
+    fim = np.flatnonzero(np.diff(faixa[ordem], append=faixas))
+    inicio = np.concatenate(([0], fim[:-1] + 1))
+    manter = np.unique(np.concatenate(([0, n - 1], ordem[inicio], ordem[fim])))
+    return x[manter], y[manter]
+
+def linhas_gl(series, titulo, rotulo_x, rotulo_y, orcamento=ORCAMENTO_PONTOS):
+    """Figura de linhas Scattergl; 'series' é uma lista de (nome, x, y, cor), cada uma decimada"""
+    figura = go.Figure()
+    for nome, x, y, cor in series:
+        x, y = decimar(x, y, orcamento)
+        figura.add_trace(go.Scattergl(x=x, y=y, mode='lines', name=nome, line=dict(color=cor)))
+    figura.update_layout(title=titulo, xaxis_title=rotulo_x, yaxis_title=rotulo_y, showlegend=len(series) > 1)
+    return figura
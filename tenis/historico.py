@@ -0,0 +1,209 @@
+import numpy as np
+import pandas as pd
+from .importancia import SETS_PARA_VENCER
+from .placar import ContinuacaoPlacar, calcular_placar, tabelas
+from .tipos import valores
+
+# Resumo de cada partida guardado na tabela Historico: dados da partida (adversário,
+# ranking e bem-estar) e contagens de Rodrigo, para análises entre partidas sem
+# reagregar os rallys. Só contagens: as taxas são derivadas na leitura, então
+# somar partidas (confronto direto, janelas, faixas) é válido. A tabela é criada
+# pela migração 10 (criar_banco).
+COLUNAS_PARTIDA = [
+    'data', 'adversario', 'ranking_adversario', 'cansaco_pre_jogo', 'qualidade_sono', 'dias_descanso',
+]
+CONTAGENS_HISTORICO = [
+    'pontos_jogador', 'pontos_adversario', 'games_jogador', 'games_adversario',
+    'sets_jogador', 'sets_adversario',
+    'saques_jogador', 'pontos_saque_jogador',              # pontos de Rodrigo no próprio saque
+    'saques_adversario', 'pontos_recebimento_jogador',     # pontos de Rodrigo na devolução
+    'aces', 'duplas_faltas',
+]
+# 'vitoria': 1/0 quando alguém fechou SETS_PARA_VENCER sets digitados, vazio senão
+COLUNAS_HISTORICO = ['partida_id'] + COLUNAS_PARTIDA + CONTAGENS_HISTORICO + ['vitoria']
+
+# Faixas padrão dos fatores analisados (limites superiores inclusivos)
+FAIXAS = {
+    'ranking_adversario': ([0, 10, 25, 50, 100, np.inf], ['1-10', '11-25', '26-50', '51-100', '100+']),
+    'cansaco_pre_jogo': ([0, 2, 3, np.inf], ['Baixo (1-2)', 'Médio (3)', 'Alto (4+)']),
+    'qualidade_sono': ([0, 60, 80, np.inf], ['Ruim (até 60)', 'Regular (61-80)', 'Boa (81+)']),
+    'dias_descanso': ([-1, 0, 1, 3, np.inf], ['0', '1', '2-3', '4+']),
+}
+# Janela padrão da forma recente (últimas N partidas)
+JANELA_FORMA = 5
+
+def _filtro(partidas_ids, coluna='partida_id'):
+    if partidas_ids is None:
+        return "", []
+    return f"WHERE {coluna} IN ({','.join(['?'] * len(partidas_ids))})", list(partidas_ids)
+
+def _placar_final(conn, partidas_ids=None):
+    """Games e sets de cada jogador por partida, pelo motor de placar (o mesmo da importação)"""
+    filtro, parametros = _filtro(partidas_ids)
+    rallys = pd.read_sql(f"""
+        SELECT partida_id, set_num, game_num, servidor, COALESCE(ganhador_ponto, ponto_num) AS ganhador_ponto
+        FROM rallys
+        {filtro}
+        ORDER BY partida_id, set_num, game_num, ordem_ponto
+    """, conn, params=parametros)
+    continuacao = ContinuacaoPlacar()
+    placar = calcular_placar(rallys, 'ganhador_ponto', continuacao)
+
+    # Games: pontos que fecham um game ("Game"), para quem ganhou o ponto
+    ganhador = valores(rallys['ganhador_ponto'])
+    fecha = (placar['placar'] == "Game").to_numpy()
+    games = pd.DataFrame({
+        'games_jogador': fecha & (ganhador == 1),
+        'games_adversario': fecha & (ganhador == 0),
+    }).groupby(rallys['partida_id'].to_numpy()).sum()
+
+    # Sets: a contagem do motor depois do último ponto de cada partida
+    t = tabelas()
+    finais = pd.Series({partida: estado for partida, (estado, _) in continuacao.partidas.items()}, dtype=np.int64)
+    sets = pd.DataFrame({
+        'sets_jogador': t.sets_jogador[finais.to_numpy()].astype(np.int64),
+        'sets_adversario': t.sets_adversario[finais.to_numpy()].astype(np.int64),
+    }, index=finais.index)
+    return games.join(sets).astype(np.int64)
+
+def _contagens(conn, partidas_ids=None):
+    """Pontos, saque e devolução de Rodrigo por partida, somando os sets de Estatisticas"""
+    filtro, parametros = _filtro(partidas_ids)
+    linhas = pd.read_sql(f"""
+        SELECT partida_id, jogador, SUM(total_pontos) AS pontos, SUM(saques) AS saques,
+               SUM(pontos_saque) AS pontos_saque, SUM(pontos_recebimento) AS pontos_recebimento,
+               SUM(aces) AS aces, SUM(duplas_faltas) AS duplas_faltas
+        FROM Estatisticas
+        {filtro}
+        GROUP BY partida_id, jogador
+    """, conn, params=parametros).set_index(['partida_id', 'jogador'])
+    jogador = linhas.xs(1, level='jogador') if len(linhas) else linhas.droplevel('jogador')
+    adversario = linhas.xs(0, level='jogador') if len(linhas) else linhas.droplevel('jogador')
+    return pd.DataFrame({
+        'pontos_jogador': jogador['pontos'],
+        'pontos_adversario': adversario['pontos'],
+        'saques_jogador': jogador['saques'],
+        'pontos_saque_jogador': jogador['pontos_saque'],
+        'saques_adversario': adversario['saques'],
+        'pontos_recebimento_jogador': jogador['pontos_recebimento'],
+        'aces': jogador['aces'],
+        'duplas_faltas': jogador['duplas_faltas'],
+    })
+
+def calcular_historico(conn, partidas_ids=None):
+    """Uma linha por partida (todas se None) com os dados da partida e as contagens
+
+    Lê as contagens já materializadas em Estatisticas (atualize-as antes) e só a
+    coluna do ganhador dos rallys, para o placar final.
+    """
+    filtro, parametros = _filtro(partidas_ids)
+    partidas = pd.read_sql(f"SELECT partida_id, {', '.join(COLUNAS_PARTIDA)} FROM Partidas {filtro}",
+                           conn, params=parametros).set_index('partida_id')
+    historico = partidas.join(_contagens(conn, partidas_ids)).join(_placar_final(conn, partidas_ids))
+    historico[CONTAGENS_HISTORICO] = historico[CONTAGENS_HISTORICO].fillna(0).astype(np.int64)
+    sets_j, sets_a = historico['sets_jogador'], historico['sets_adversario']
+    historico['vitoria'] = pd.Series(np.select(
+        [sets_j >= SETS_PARA_VENCER, sets_a >= SETS_PARA_VENCER], [1, 0], -1
+    ), index=historico.index).replace(-1, pd.NA).astype('Int8')
+    return historico.reset_index()[COLUNAS_HISTORICO]
+
+def preencher_historico(conn, partidas_ids=None):
+    """Substitui as linhas de Historico das partidas indicadas (todas se None), sem commit"""
+    historico = calcular_historico(conn, partidas_ids)
+    filtro, parametros = _filtro(partidas_ids)
+    conn.execute(f"DELETE FROM Historico {filtro}", parametros)
+    linhas = historico.astype(object).where(historico.notna(), None).itertuples(index=False, name=None)
+    conn.executemany(
+        f"INSERT INTO Historico ({','.join(COLUNAS_HISTORICO)}) VALUES ({','.join(['?'] * len(COLUNAS_HISTORICO))})",
+        list(linhas)
+    )
+    return len(historico)
+
+def atualizar_historico(conn, partidas_ids):
+    """Recalcula o resumo das partidas tocadas por uma importação
+
+    Partidas cadastradas que ainda não estão na tabela (ex.: importadas sem
+    rallys) entram junto, para o histórico listar todas.
+    """
+    novas = [linha[0] for linha in conn.execute(
+        "SELECT partida_id FROM Partidas WHERE partida_id NOT IN (SELECT partida_id FROM Historico)"
+    )]
+    partidas_ids = [int(p) for p in pd.unique(pd.Series(list(partidas_ids) + novas, dtype=float).dropna())]
+    if not partidas_ids:
+        return 0
+    preencher_historico(conn, partidas_ids)
+    conn.commit()
+    return len(partidas_ids)
+
+def reconstruir_historico(conn):
+    """Regera a tabela Historico inteira a partir de Partidas, Estatisticas e rallys"""
+    total = preencher_historico(conn)
+    conn.commit()
+    return total
+
+def carregar_historico(conn):
+    """Todas as partidas do histórico, da mais antiga para a mais recente"""
+    historico = pd.read_sql("SELECT * FROM Historico ORDER BY data, partida_id", conn)
+    historico['vitoria'] = historico['vitoria'].astype('Int8')
+    return historico
+
+# ===== ANÁLISES ENTRE PARTIDAS (sobre a tabela pequena, uma linha por partida) =====
+
+def derivar_taxas(linhas):
+    """Acrescenta as taxas de vitórias e pontos a uma tabela de contagens (vazio quando não há base)"""
+    linhas = linhas.copy()
+    decididas = linhas['vitorias'] + linhas['derrotas']
+    linhas['pct_vitorias'] = linhas['vitorias'] / decididas.where(decididas > 0) * 100
+    for pct, parte, total in (
+        ('pct_pontos', 'pontos_jogador', linhas['pontos_jogador'] + linhas['pontos_adversario']),
+        ('pct_pontos_saque', 'pontos_saque_jogador', linhas['saques_jogador']),
+        ('pct_pontos_devolucao', 'pontos_recebimento_jogador', linhas['saques_adversario']),
+    ):
+        linhas[pct] = linhas[parte] / total.where(total > 0) * 100
+    return linhas
+
+def _somas(historico):
+    somas = historico[CONTAGENS_HISTORICO].copy()
+    somas['partidas'] = 1
+    somas['vitorias'] = (historico['vitoria'] == 1).fillna(False).astype(np.int64)
+    somas['derrotas'] = (historico['vitoria'] == 0).fillna(False).astype(np.int64)
+    return somas
+
+def confronto_direto(historico):
+    """Retrospecto contra cada adversário: partidas, vitórias, contagens somadas e taxas"""
+    somas = _somas(historico)
+    grupos = somas.groupby(historico['adversario'])
+    linhas = grupos.sum()
+    linhas['ultima_partida'] = historico.groupby('adversario')['data'].max()
+    linhas = derivar_taxas(linhas).reset_index()
+    return linhas.sort_values(['partidas', 'ultima_partida'], ascending=False, kind='stable').reset_index(drop=True)
+
+def forma_recente(historico, janela=JANELA_FORMA):
+    """Taxas somando as últimas 'janela' partidas até cada partida (em ordem de data)"""
+    historico = historico.sort_values(['data', 'partida_id'], kind='stable')
+    somas = _somas(historico).rolling(janela, min_periods=1).sum().astype(np.int64)
+    forma = derivar_taxas(somas)
+    forma.insert(0, 'partida_id', historico['partida_id'])
+    forma.insert(1, 'data', historico['data'])
+    forma.insert(2, 'adversario', historico['adversario'])
+    return forma.reset_index(drop=True)
+
+def desempenho_por_faixa(historico, fator, faixas=None):
+    """Contagens somadas e taxas por faixa de um fator da partida (ranking ou bem-estar)
+
+    'faixas' é (limites, rótulos) no formato do pd.cut; por padrão, as de FAIXAS.
+    Partidas sem o fator preenchido ficam de fora.
+    """
+    limites, rotulos = faixas or FAIXAS[fator]
+    faixa = pd.cut(pd.to_numeric(historico[fator], errors='coerce'), limites, labels=rotulos)
+    linhas = _somas(historico).groupby(faixa, observed=False).sum()
+    return derivar_taxas(linhas).rename_axis('faixa').reset_index()
+
+# Regera a tabela a partir de Partidas, Estatisticas e rallys: python -m tenis.historico
+if __name__ == "__main__":
+    from .criar_banco import conectar, incrementar_geracao
+    conn = conectar()
+    total = reconstruir_historico(conn)
+    incrementar_geracao(conn)
+    conn.close()
+    print(f"✅ Histórico reconstruído: {total} partida(s)")
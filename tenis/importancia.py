@@ -0,0 +1,146 @@
+import functools
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from .placar import tabelas
+
+# Modelo de Markov sobre os estados do motor de placar (placar.tabelas()).
+# Dadas as taxas de pontos ganhos no saque de cada jogador, calcula para cada
+# estado e sacador do ponto a probabilidade de Rodrigo vencer o game, o set e a
+# partida, e a importância do ponto: quanto essa probabilidade muda entre ganhar e
+# perder o ponto. As tabelas são memoizadas por par de taxas (arredondadas);
+# marcar rallys é só indexação por [estado, servidor].
+#
+# No tiebreak o saque troca após os pontos de índice par (1º, 3º, 5º...), o que só
+# depende da paridade de pontos jogados e é preservado pela compressão de 6-6.
+# Quem saca o 1º game do set seguinte a um tiebreak é aproximado (troca simples).
+
+SETS_PARA_VENCER = 2
+CASAS_TAXA = 2          # taxas arredondadas: poucas variações de modelo em cache
+TAXA_PADRAO = 0.6       # pontos ganhos no saque quando não há dados
+PESO_PADRAO = 20        # pontos "fictícios" na taxa padrão ao estimar de poucos dados
+TOLERANCIA = 1e-10
+NIVEIS = ('game', 'set', 'partida')
+# Fração dos pontos de maior importância considerados "pontos importantes"
+FRACAO_IMPORTANTES = 0.1
+
+# Para cada nível: prob[estado, servidor] (Rodrigo vence antes do ponto) e
+# importancia[estado, servidor] (prob. se Rodrigo ganha o ponto - se perde)
+ModeloImportancia = namedtuple('ModeloImportancia', ['taxa_jogador', 'taxa_adversario', 'prob', 'importancia'])
+
+def _transicoes():
+    """Próximo estado [estado, vencedor] e próximo sacador [estado, servidor, vencedor]."""
+    t = tabelas()
+    proximo = t.proximo_np[:, :2]
+    fecha = t.fecha_game_np[:, :2]
+    servidor = np.array([0, 1])[None, :, None]
+    troca_tiebreak = (t.tiebreak & ((t.pontos_jogador + t.pontos_adversario) % 2 == 0))[:, None, None]
+    troca = fecha[:, None, :] | troca_tiebreak
+    return proximo, np.where(troca, 1 - servidor, servidor)
+
+def _terminais(nivel):
+    """Pontos que encerram o nível [estado, vencedor]; quem vence o ponto final vence o nível."""
+    t = tabelas()
+    proximo = t.proximo_np[:, :2]
+    fecha = t.fecha_game_np[:, :2]
+    if nivel == 'game':
+        return fecha
+    fecha_set = fecha & (t.games_jogador[proximo] == 0) & (t.games_adversario[proximo] == 0)
+    if nivel == 'set':
+        return fecha_set
+    return fecha_set & (np.maximum(t.sets_jogador[proximo], t.sets_adversario[proximo]) >= SETS_PARA_VENCER)
+
+def _resolver(p_ponto, proximo, proximo_servidor, terminal):
+    """Iteração de valor: prob. de Rodrigo vencer o nível a partir de [estado, servidor]."""
+    n = len(proximo)
+    # Índices planos de valor[próximo estado, próximo sacador] para cada [e, s, w]
+    indice = (proximo[:, None, :] * 2 + proximo_servidor).reshape(n * 2, 2)
+    terminal = np.broadcast_to(terminal[:, None, :], (n, 2, 2)).reshape(n * 2, 2)
+    # Peso de cada resultado do ponto [e, s, w] e o valor já conhecido dos pontos finais
+    peso = np.tile(np.stack([1 - p_ponto, p_ponto], axis=1), (n, 1))
+    continua = np.where(terminal, 0.0, peso)
+    fixo = np.where(terminal, peso * np.array([0.0, 1.0]), 0.0).sum(axis=1)
+    valor = np.full(n * 2, 0.5)
+    for _ in range(100000):
+        novo = fixo + (continua * valor[indice]).sum(axis=1)
+        if np.abs(novo - valor).max() < TOLERANCIA:
+            break
+        valor = novo
+    depois = np.where(terminal, np.array([0.0, 1.0]), novo[indice])
+    return novo.reshape(n, 2), (depois[:, 1] - depois[:, 0]).reshape(n, 2)
+
+@functools.lru_cache(maxsize=64)
+def _construir(taxa_jogador, taxa_adversario):
+    proximo, proximo_servidor = _transicoes()
+    # Probabilidade de Rodrigo ganhar o ponto: [servidor] (0 = adversário saca)
+    p_ponto = np.array([1 - taxa_adversario, taxa_jogador])
+    prob, importancia = {}, {}
+    for nivel in NIVEIS:
+        prob[nivel], importancia[nivel] = _resolver(p_ponto, proximo, proximo_servidor, _terminais(nivel))
+    return ModeloImportancia(taxa_jogador, taxa_adversario, prob, importancia)
+
+def modelo(taxa_jogador=TAXA_PADRAO, taxa_adversario=TAXA_PADRAO):
+    """Tabelas de probabilidade e importância para as taxas de pontos ganhos no saque"""
+    arredondar = lambda taxa: round(min(max(float(taxa), 0.01), 0.99), CASAS_TAXA)
+    return _construir(arredondar(taxa_jogador), arredondar(taxa_adversario))
+
+def _servidor(df):
+    # Mesmo critério do calcular_placar: sem servidor definido, conta como Rodrigo
+    return pd.to_numeric(df['servidor'], errors='coerce').fillna(1).to_numpy().astype(np.int8)
+
+def taxas_saque(rallys, coluna_ganhador='ganhador_ponto'):
+    """(taxa do jogador, taxa do adversário) de pontos ganhos no próprio saque
+
+    Com poucos pontos a estimativa puxa para TAXA_PADRAO (PESO_PADRAO pontos a mais).
+    """
+    ganhador = pd.to_numeric(rallys[coluna_ganhador], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    servidor = pd.to_numeric(rallys['servidor'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    taxas = []
+    for jogador in (1, 0):
+        sacando = (servidor == jogador) & np.isin(ganhador, (0, 1))
+        ganhos = np.count_nonzero(sacando & (ganhador == jogador))
+        taxas.append((ganhos + TAXA_PADRAO * PESO_PADRAO) / (np.count_nonzero(sacando) + PESO_PADRAO))
+    return tuple(taxas)
+
+def marcar_importancia(df, modelo_importancia, nivel='partida'):
+    """Probabilidade, importância e break/game points de cada rally, por indexação
+
+    'df' precisa de 'estado' (coluna do calcular_placar) e 'servidor'; serve
+    para uma partida ou uma temporada inteira (o placar reinicia a cada partida).
+    """
+    t = tabelas()
+    estado = df['estado'].to_numpy()
+    servidor = _servidor(df)
+    fecha = t.fecha_game_np[estado]
+    sem_tiebreak = ~t.tiebreak[estado]
+    return pd.DataFrame({
+        'prob_vitoria': modelo_importancia.prob[nivel][estado, servidor],
+        'importancia': modelo_importancia.importancia[nivel][estado, servidor],
+        'importancia_game': modelo_importancia.importancia['game'][estado, servidor],
+        # Break point: o recebedor fecha o game se ganhar o ponto
+        'break_point': fecha[np.arange(len(estado)), 1 - servidor] & sem_tiebreak,
+        'game_point_jogador': fecha[:, 1],
+        'game_point_adversario': fecha[:, 0],
+    }, index=df.index)
+
+def resumir_importancia(df, jogador, coluna_ganhador='ganhador_ponto'):
+    """Métricas de alavancagem de um jogador sobre rallys já marcados"""
+    ganhou = pd.to_numeric(df[coluna_ganhador], errors='coerce').to_numpy(dtype=float, na_value=np.nan) == jogador
+    servidor = _servidor(df)
+    break_point = df['break_point'].to_numpy()
+    a_favor = break_point & (servidor != jogador)
+    contra = break_point & (servidor == jogador)
+    game_point = df['game_point_jogador' if jogador == 1 else 'game_point_adversario'].to_numpy()
+    importancia = df['importancia'].to_numpy()
+    importantes = importancia >= np.quantile(importancia, 1 - FRACAO_IMPORTANTES) if len(df) else importancia > 0
+    return {
+        'break_points': int(a_favor.sum()),
+        'break_points_convertidos': int((a_favor & ganhou).sum()),
+        'break_points_contra': int(contra.sum()),
+        'break_points_salvos': int((contra & ganhou).sum()),
+        'game_points': int(game_point.sum()),
+        'game_points_convertidos': int((game_point & ganhou).sum()),
+        'pontos_importantes': int(importantes.sum()),
+        'pontos_importantes_ganhos': int((importantes & ganhou).sum()),
+        'importancia_media': float(importancia.mean()) if len(df) else 0.0,
+    }
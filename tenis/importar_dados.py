@@ -0,0 +1,589 @@
+import pandas as pd
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .placar import ContinuacaoPlacar, calcular_placar
+from .carga import inserir_novos
+from .criar_banco import DB_PATH, EXCEL_PATH, conectar, incrementar_geracao
+from .backup import gravar_segmento, limpar_abas, novo_lote
+from .estatisticas import atualizar_estatisticas
+from .sequencias import atualizar_sequencias
+from .historico import atualizar_historico
+from .tipos import tipar_flags
+from .regras import MOTOR, resumir_contradicoes
+from .medicao import etapa
+from . import snapshot
+
+# Etapas informadas ao 'progresso' do enviar_dados_streaming, em ordem
+ETAPAS_IMPORTACAO = ['partidas', 'rallys', 'estatisticas', 'snapshot']
+
+# Chaves naturais (índices UNIQUE) usadas para deduplicar no banco
+CHAVE_PARTIDAS = ['data', 'adversario']
+CHAVE_RALLYS = ['partida_id', 'set_num', 'game_num', 'ordem_ponto']
+
+def aplicar_regras_logicas(df, copiar=True, continuacao=None, relatorio=False, placar=True):
+    """Preenche automaticamente campos baseado em regras do tênis
+
+    Na importação em blocos, 'continuacao' (ContinuacaoPlacar) leva o placar de
+    um bloco para o seguinte e 'copiar=False' evita duplicar cada bloco.
+    Com 'relatorio=True' devolve (df, Relatorio): a regra que preencheu cada
+    célula e as células digitadas que contradizem as regras.
+    'placar=False' deixa a Regra 6 para aplicar_placar (a importação a aplica
+    depois de saber onde o placar de cada partida parou no banco).
+    """
+    if copiar:
+        df = df.copy()
+
+    # Flags 0/1 (e servidor/ganhador) como Int8 anulável, em vez de float64
+    tipar_flags(df)
+    
+    # Converter a coluna 'placar' para string ANTES de começar a preencher
+    if 'placar' in df.columns:
+        df['placar'] = df['placar'].astype(str)
+    
+    # Regras 1 a 5 (ace, primeiro saque, devolução fora, dupla falta, rally):
+    # tabela declarativa em regras.py, compilada e aplicada em uma passada
+    resultado_regras = MOTOR.aplicar(df, relatorio)
+
+    # ponto_num guarda o ganhador do ponto; ganhador_ponto é a coluna explícita
+    df['ganhador_ponto'] = df['ponto_num']
+
+    if placar:
+        aplicar_placar(df, continuacao)
+
+    return (df, resultado_regras) if relatorio else df
+
+def aplicar_placar(df, continuacao=None):
+    """Regra 6: Lógica do placar (game, set e tiebreak pelo motor compartilhado)
+
+    As inferências de ganhador por devolução fora / falha de saque já foram
+    feitas pelas Regras 3 e 4; pontos sem ganhador mantêm o placar digitado.
+    """
+    resultado = calcular_placar(df, 'ponto_num', continuacao)
+    ponto_definido = df['ponto_num'].notna()
+    if 'placar' in df.columns:
+        df['placar'] = resultado['placar'].where(ponto_definido, df['placar'])
+    else:
+        df['placar'] = resultado['placar'].where(ponto_definido)
+    return df
+
+def numerar_pontos(df, contagem=None):
+    """Preenche 'ordem_ponto' (posição do ponto no game, na ordem da planilha)
+
+    'contagem' guarda quantos pontos de cada game já foram vistos, para a
+    numeração continuar entre blocos. Retorna a contagem atualizada.
+    """
+    contagem = {} if contagem is None else contagem
+    colunas = ['partida_id', 'set_num', 'game_num']
+    chave = df[colunas].astype('float64').fillna(-1)
+    ordem = chave.groupby(colunas, sort=False).cumcount() + 1
+    if contagem:
+        anteriores = pd.DataFrame([k + (v,) for k, v in contagem.items()], columns=colunas + ['base'])
+        ordem += chave.merge(anteriores, how='left', on=colunas)['base'].fillna(0).astype(int).to_numpy()
+    df['ordem_ponto'] = ordem
+    contagem.update(chave.assign(ordem=ordem).groupby(colunas)['ordem'].max().to_dict())
+    return contagem
+
+# ===== CONTINUAÇÃO ENTRE IMPORTAÇÕES =====
+# Um game pode começar numa planilha e terminar em outra (ou na mesma planilha
+# depois de limpa). A numeração de cada game numa origem parte de uma base
+# guardada em Bases_Ordem: na primeira vez, o maior 'ordem_ponto' já gravado.
+# Reimportar a mesma origem reaproveita a base (as chaves coincidem e a
+# deduplicação continua valendo); depois que a aba é limpa, as bases da origem
+# são liberadas e a próxima digitação continua depois do que já existe.
+
+def _marcas(valores):
+    return ','.join(['?'] * len(valores))
+
+def semear_contagem(conn, df, origem, contagem):
+    """Completa 'contagem' (de numerar_pontos) com a base de cada game do df ainda não visto"""
+    colunas = ['partida_id', 'set_num', 'game_num']
+    games = [g for g in df[colunas].astype('float64').fillna(-1).drop_duplicates().itertuples(index=False, name=None)
+             if g[0] != -1 and g not in contagem]
+    if not games:
+        return contagem
+    ids = sorted({int(g[0]) for g in games})
+    bases = {}
+    # Games anteriores às bases (origem '') seguem numerados a partir de 1 até a aba ser limpa
+    for dono, p, s, g, base in conn.execute(
+            f"SELECT origem, partida_id, set_num, game_num, base FROM Bases_Ordem "
+            f"WHERE origem IN (?, '') AND partida_id IN ({_marcas(ids)}) ORDER BY origem = ?",
+            [origem, *ids, origem]):
+        bases[(float(p), float(s), float(g))] = base
+    maximos = {
+        (float(p), float(s), float(g)): m
+        for p, s, g, m in conn.execute(
+            f"SELECT partida_id, COALESCE(set_num, -1), COALESCE(game_num, -1), MAX(ordem_ponto) FROM rallys "
+            f"WHERE partida_id IN ({_marcas(ids)}) GROUP BY 1, 2, 3", ids)
+    }
+    novas = []
+    for game in games:
+        if game not in bases:
+            bases[game] = maximos.get(game, 0)
+            novas.append((origem, *(int(v) for v in game), bases[game]))
+        contagem[game] = bases[game]
+    conn.executemany("INSERT OR IGNORE INTO Bases_Ordem (origem, partida_id, set_num, game_num, base) "
+                     "VALUES (?, ?, ?, ?, ?)", novas)
+    conn.commit()
+    return contagem
+
+def descartar_existentes(conn, df):
+    """Tira do df os pontos cuja chave natural já está gravada; devolve (df, nº descartado)"""
+    ids = sorted({int(p) for p in df['partida_id'].dropna()})
+    if not ids:
+        return df, 0
+    gravadas = pd.read_sql(f"SELECT {', '.join(CHAVE_RALLYS)} FROM rallys WHERE partida_id IN ({_marcas(ids)})",
+                           conn, params=ids)
+    existe = pd.MultiIndex.from_frame(df[CHAVE_RALLYS].astype('float64').fillna(-1)).isin(
+        pd.MultiIndex.from_frame(gravadas.astype('float64').fillna(-1)))
+    if not existe.any():
+        return df, 0
+    return df[~existe].copy(), int(existe.sum())
+
+def continuar_do_banco(conn, df, continuacao):
+    """Guarda em continuacao.partidas onde parou o placar de cada partida do df já gravada
+
+    Refaz o placar sobre os rallys gravados (na ordem da chave, como a exportação),
+    só das partidas que a continuação ainda não conhece.
+    """
+    ids = sorted({int(p) for p in df['partida_id'].dropna()} - set(continuacao.partidas))
+    if not ids:
+        return continuacao
+    gravados = pd.read_sql(
+        f"SELECT partida_id, set_num, game_num, servidor, COALESCE(ganhador_ponto, ponto_num) AS ganhador_ponto "
+        f"FROM rallys WHERE partida_id IN ({_marcas(ids)}) ORDER BY partida_id, set_num, game_num, ordem_ponto",
+        conn, params=ids)
+    if not gravados.empty:
+        refeito = ContinuacaoPlacar()
+        calcular_placar(gravados, 'ganhador_ponto', refeito)
+        continuacao.partidas.update(refeito.partidas)
+    return continuacao
+
+def liberar_bases(conn, origem):
+    """Depois de limpar a aba de digitação: a próxima planilha da origem continua os games"""
+    conn.execute("DELETE FROM Bases_Ordem WHERE origem IN (?, '')", (origem,))
+    conn.commit()
+
+def publicar_snapshot(conn, geracao, tocadas):
+    """Publica o snapshot colunar da nova geração; uma falha aqui não desfaz a importação
+
+    Só as partições (temporada/adversário) das partidas com rallys novos são regravadas.
+    """
+    if not snapshot.disponivel():
+        return
+    try:
+        caminho = snapshot.publicar_snapshot(conn, geracao, partidas_ids=tocadas)
+        print(f"🗂️ Snapshot Parquet publicado em {caminho}")
+    except Exception as e:
+        # O dashboard volta a ler do SQLite enquanto o snapshot não for da geração atual
+        print(f"⚠️ Snapshot não publicado: {e}")
+
+def ler_blocos(ws, tamanho_bloco):
+    """Lê uma aba em modo read_only e devolve DataFrames de até 'tamanho_bloco' linhas"""
+    linhas = ws.iter_rows(values_only=True)
+    cabecalho = next(linhas, None)
+    if cabecalho is None:
+        return
+    indices = [i for i, c in enumerate(cabecalho) if c is not None]
+    colunas = [str(cabecalho[i]) for i in indices]
+
+    def montar(bloco):
+        df = pd.DataFrame(bloco, columns=colunas).infer_objects()
+        # Colunas vazias no bloco viram NaN numérico, como no pd.read_excel
+        vazias = df.columns[df.isna().all()]
+        df[vazias] = df[vazias].astype(float)
+        return df
+
+    bloco = []
+    for linha in linhas:
+        # Em read_only as linhas podem vir sem as células vazias do fim
+        linha = tuple(linha[i] if i < len(linha) else None for i in indices)
+        if all(v is None for v in linha):
+            continue
+        bloco.append(linha)
+        if len(bloco) >= tamanho_bloco:
+            yield montar(bloco)
+            bloco = []
+    if bloco:
+        yield montar(bloco)
+
+def enviar_dados_streaming(excel_path=None, db_path=None, tamanho_bloco=5000, limpar_planilha=False,
+                           progresso=None, origem=None, origem_bases=None):
+    """Importa a planilha em blocos de tamanho fixo, com memória limitada
+
+    Lê as abas com openpyxl em modo read_only e, para cada bloco, aplica as
+    regras (levando o placar e a numeração dos pontos de um bloco para o outro,
+    e continuando as partidas que já têm pontos gravados) e já grava no banco, antes de terminar de ler o arquivo. O backup de cada
+    bloco vira um segmento próprio; com 'limpar_planilha' as abas de digitação
+    são esvaziadas no fim (isso carrega a planilha inteira uma vez).
+    'progresso(etapa, linhas)' é chamado a cada bloco e etapa (ETAPAS_IMPORTACAO);
+    'origem' é o nome registrado nos backups (padrão: excel_path) e
+    'origem_bases' a origem da numeração dos pontos em Bases_Ordem (padrão:
+    'origem' ou o caminho absoluto da planilha).
+    """
+    progresso = progresso or (lambda etapa, linhas: None)
+    excel_path = excel_path or EXCEL_PATH
+    db_path = db_path or DB_PATH
+    if not os.path.exists(excel_path):
+        raise FileNotFoundError(f"Arquivo Excel não encontrado: {excel_path}")
+
+    from openpyxl import load_workbook
+    conn = conectar(db_path)
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    origem_bases = origem_bases or origem or os.path.abspath(excel_path)
+    origem = origem or excel_path
+    totais = {'partidas': 0, 'rallys': 0, 'ignorados': 0, 'rejeitados': 0}
+    lidas = {'partidas': 0, 'rallys': 0}
+    lote = novo_lote()
+    try:
+        # Partidas primeiro: os rallys só entram se a partida_id existir
+        progresso('partidas', 0)
+        for parte, bloco in enumerate(ler_blocos(wb["Partidas"], tamanho_bloco)):
+            resultado, novas = inserir_novos(conn, bloco, "partidas", CHAVE_PARTIDAS, tamanho_lote=tamanho_bloco)
+            gravar_segmento(novas, "partidas", lote, parte, origem=origem)
+            totais['partidas'] += resultado.inseridos
+            totais['rejeitados'] += resultado.rejeitados
+            lidas['partidas'] += len(bloco)
+            progresso('partidas', lidas['partidas'])
+
+        continuacao = ContinuacaoPlacar()
+        contagem = {}
+        tocadas = set()
+        progresso('rallys', 0)
+        for parte, bloco in enumerate(ler_blocos(wb["Digitação"], tamanho_bloco)):
+            bloco = bloco.rename(columns={"set": "set_num", "game": "game_num", "ponto": "ponto_num"})
+            bloco = aplicar_regras_logicas(bloco, copiar=False, placar=False)
+            numerar_pontos(bloco, semear_contagem(conn, bloco, origem_bases, contagem))
+            # Pontos já gravados saem antes do placar, que continua de onde cada partida parou
+            bloco, existentes = descartar_existentes(conn, bloco)
+            aplicar_placar(bloco, continuar_do_banco(conn, bloco, continuacao))
+            resultado, novos = inserir_novos(
+                conn, bloco, "rallys", CHAVE_RALLYS,
+                filtro="s.partida_id IN (SELECT partida_id FROM partidas)",
+                tamanho_lote=tamanho_bloco, synchronous="NORMAL"
+            )
+            gravar_segmento(novos, "rallys", lote, parte, origem=origem)
+            tocadas.update(novos['partida_id'].dropna().astype(int))
+            totais['rallys'] += resultado.inseridos
+            totais['ignorados'] += resultado.ignorados + existentes
+            totais['rejeitados'] += resultado.rejeitados
+            lidas['rallys'] += len(bloco)
+            progresso('rallys', lidas['rallys'])
+            print(f"   ... {totais['rallys']} rally(s) inserido(s) até agora")
+
+        # Estatísticas e sequências materializadas só das partidas que receberam rallys
+        progresso('estatisticas', totais['rallys'])
+        atualizar_estatisticas(conn, tocadas)
+        atualizar_sequencias(conn, tocadas)
+        atualizar_historico(conn, tocadas)
+        if totais['partidas'] or totais['rallys']:
+            progresso('snapshot', totais['rallys'])
+            publicar_snapshot(conn, incrementar_geracao(conn), tocadas)
+    finally:
+        wb.close()
+        conn.close()
+
+    print(f"\n✅ {totais['partidas']} partida(s) e {totais['rallys']} rally(s) inserido(s), "
+          f"{totais['ignorados']} rally(s) ignorado(s), {totais['rejeitados']} na Quarentena")
+
+    if limpar_planilha:
+        limpar_abas(excel_path, ["Partidas", "Digitação"])
+        conn = conectar(db_path)
+        liberar_bases(conn, origem_bases)
+        conn.close()
+
+    return totais
+
+@etapa("importar.total")
+def enviar_dados():
+    # Configurações
+    excel_path = EXCEL_PATH
+    db_path = DB_PATH
+    tamanho_lote = 5000
+    
+    try:
+        # ===== 1. VALIDAÇÃO INICIAL =====
+        if not os.path.exists(excel_path):
+            raise FileNotFoundError(f"Arquivo Excel não encontrado: {excel_path}")
+        
+        # ===== 2. CONEXÃO COM O BANCO =====
+        # Abre o banco já migrado para a última versão do schema
+        conn = conectar(db_path)
+        cursor = conn.cursor()
+        
+        # ===== 3. CARREGAR DADOS DO EXCEL =====
+        with etapa("importar.3 ler excel") as medida:
+            df_partidas = pd.read_excel(excel_path, sheet_name="Partidas")
+            df_rallys = pd.read_excel(excel_path, sheet_name="Digitação")
+            medida.linhas = len(df_partidas) + len(df_rallys)
+        
+        # Padroniza nomes de colunas
+        df_rallys = df_rallys.rename(columns={
+            "set": "set_num",
+            "game": "game_num",
+            "ponto": "ponto_num"
+        })
+        
+        # ===== 4. APLICA REGRAS LÓGICAS =====
+        with etapa("importar.4 regras", len(df_rallys)):
+            df_rallys, resultado_regras = aplicar_regras_logicas(df_rallys, relatorio=True, placar=False)
+        
+        # Células digitadas que as regras corrigiram (ou regras em conflito na mesma célula)
+        if not resultado_regras.contradicoes.empty:
+            print(f"\n⚠️ {len(resultado_regras.contradicoes)} célula(s) em contradição com as regras:")
+            print(resumir_contradicoes(resultado_regras.contradicoes).to_string(index=False))
+        
+        # Posição de cada ponto dentro do game, na ordem da planilha (parte da chave natural),
+        # continuando os games que já têm pontos gravados
+        origem = os.path.abspath(excel_path)
+        with etapa("importar.4 numerar pontos", len(df_rallys)):
+            numerar_pontos(df_rallys, semear_contagem(conn, df_rallys, origem, {}))
+        
+        # Pontos já gravados (planilha reimportada) saem antes do placar, que continua
+        # de onde cada partida parou no banco em vez de 0-0
+        df_rallys, existentes = descartar_existentes(conn, df_rallys)
+        with etapa("importar.4 placar", len(df_rallys)):
+            aplicar_placar(df_rallys, continuar_do_banco(conn, df_rallys, ContinuacaoPlacar()))
+        
+        # ===== 5. VERIFICAÇÃO DE COLUNAS =====
+        # Obter colunas existentes na tabela rallys
+        cursor.execute("PRAGMA table_info(rallys)")
+        colunas_rallys = [col[1] for col in cursor.fetchall()]
+        
+        # Adiciona colunas faltantes com None
+        for col in colunas_rallys:
+            if col not in df_rallys.columns:
+                df_rallys[col] = None
+        
+        # Mantém apenas as colunas que existem na tabela
+        df_rallys = df_rallys[[col for col in df_rallys.columns if col in colunas_rallys]]
+        
+        # Backups do lote vão como segmentos novos; as abas são limpas de uma vez no fim
+        lote = novo_lote()
+        abas_para_limpar = []
+        houve_mudanca = False
+        tocadas = []
+        
+        # ===== 6. INSERIR PARTIDAS =====
+        # Deduplicação no banco pela chave natural (data, adversario)
+        if not df_partidas.empty:
+            # Converter para tipos adequados
+            df_partidas = df_partidas.astype({
+                'ranking_adversario': 'Int64',
+                'duracao_minutos': 'Int64',
+                'cansaco_pre_jogo': 'Int64',
+                'qualidade_sono': 'Int64',
+                'dias_descanso': 'Int64'
+            })
+            
+            # Inserção em lote só das partidas novas (rejeitadas vão para a Quarentena)
+            with etapa("importar.6 inserir partidas", len(df_partidas)):
+                resultado, df_partidas_novas = inserir_novos(conn, df_partidas, "partidas", CHAVE_PARTIDAS,
+                                                             tamanho_lote=tamanho_lote)
+            total_inseridos = resultado.inseridos
+            print(f"\n✅ {total_inseridos} nova(s) partida(s) inserida(s), {resultado.ignorados} já existente(s)")
+            
+            if total_inseridos > 0:
+                # Backup das partidas (só após inserção bem-sucedida)
+                with etapa("importar.6 backup partidas", total_inseridos):
+                    gravar_segmento(df_partidas_novas, "partidas", lote, origem=excel_path)
+                houve_mudanca = True
+            # A aba só fica como está se nenhuma partida entrou e houve rejeitadas
+            if total_inseridos > 0 or resultado.rejeitados == 0:
+                abas_para_limpar.append("Partidas")
+        else:
+            print("\n⏭️ Nenhuma partida para inserir")
+
+        # ===== 7. INSERIR RALLYS =====
+        # Deduplicação no banco pela chave natural; só entram rallys de partidas cadastradas
+        if not df_rallys.empty:
+            with etapa("importar.7 inserir rallys", len(df_rallys)):
+                resultado, df_rallys_novos = inserir_novos(
+                    conn, df_rallys, "rallys", CHAVE_RALLYS,
+                    filtro="s.partida_id IN (SELECT partida_id FROM partidas)",
+                    tamanho_lote=tamanho_lote, synchronous="NORMAL"
+                )
+            total_inseridos = resultado.inseridos
+            print(f"\n✅ {total_inseridos} novo(s) rally(s) inserido(s), {resultado.ignorados + existentes} ignorado(s) "
+                  f"(já existentes ou partida_id inválido)")
+            
+            if total_inseridos > 0:
+                # Backup dos rallys inseridos
+                with etapa("importar.7 backup rallys", total_inseridos):
+                    gravar_segmento(df_rallys_novos, "rallys", lote, origem=excel_path)
+                houve_mudanca = True
+                
+                # Recalcula as estatísticas e sequências materializadas só das partidas tocadas
+                with etapa("importar.7 estatisticas", total_inseridos):
+                    atualizadas = atualizar_estatisticas(conn, df_rallys_novos['partida_id'])
+                    atualizar_sequencias(conn, df_rallys_novos['partida_id'])
+                tocadas = df_rallys_novos['partida_id']
+                print(f"📊 Estatísticas atualizadas para {atualizadas} partida(s)")
+            else:
+                print("\n⏭️ Nenhum rally novo inserido (todos já existem ou partida_id inválido)")
+            # Como na aba Partidas: só fica como está se nada entrou e houve rejeitados
+            if total_inseridos > 0 or resultado.rejeitados == 0:
+                abas_para_limpar.append("Digitação")
+        else:
+            if existentes:
+                print(f"\n⏭️ Nenhum rally novo: os {existentes} da planilha já estão no banco")
+            else:
+                print("\n⏭️ Nenhum rally para inserir")
+            # Limpa a aba mesmo sem novos dados
+            abas_para_limpar.append("Digitação")
+
+        # Nova geração dos dados: os caches do dashboard passam a ler o que acabou de entrar
+        if houve_mudanca:
+            # Resumo por partida do histórico: partidas com rallys novos e partidas novas
+            with etapa("importar.7 historico"):
+                atualizar_historico(conn, tocadas)
+            with etapa("importar.7 snapshot"):
+                publicar_snapshot(conn, incrementar_geracao(conn), tocadas)
+
+        # ===== 8. LIMPA AS ABAS DE DIGITAÇÃO (uma única regravação da planilha) =====
+        with etapa("importar.8 limpar abas"):
+            limpar_abas(excel_path, abas_para_limpar)
+        if "Digitação" in abas_para_limpar:
+            liberar_bases(conn, origem)
+
+        print("\n🔄 Processo concluído com sucesso!")
+
+    except Exception as e:
+        print(f"\n❌ ERRO GRAVE: {str(e)}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        if 'conn' in locals():
+            conn.close()
+
+# ===== IMPORTAÇÃO EM LOTE (várias planilhas) =====
+
+def listar_planilhas(entradas):
+    """Expande pastas e arquivos em uma lista ordenada de planilhas .xlsx"""
+    planilhas = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            planilhas += sorted(
+                os.path.join(entrada, nome) for nome in os.listdir(entrada)
+                if nome.lower().endswith('.xlsx') and not nome.startswith('~$')
+            )
+        else:
+            planilhas.append(entrada)
+    return planilhas
+
+def ler_planilha(caminho):
+    """Lê uma planilha e aplica as regras (menos o placar); roda nos processos do pool (sem acesso ao banco)"""
+    df_partidas = pd.read_excel(caminho, sheet_name="Partidas")
+    df_rallys = pd.read_excel(caminho, sheet_name="Digitação")
+    df_rallys = df_rallys.rename(columns={"set": "set_num", "game": "game_num", "ponto": "ponto_num"})
+    if not df_rallys.empty:
+        # O placar depende do que já está gravado: fica para o escritor (aplicar_placar)
+        df_rallys = aplicar_regras_logicas(df_rallys, copiar=False, placar=False)
+    inteiras = ['ranking_adversario', 'duracao_minutos', 'cansaco_pre_jogo', 'qualidade_sono', 'dias_descanso']
+    df_partidas = df_partidas.astype({col: 'Int64' for col in inteiras if col in df_partidas.columns})
+    return df_partidas, df_rallys
+
+def enviar_lote(entradas, db_path=None, processos=None, tamanho_lote=5000):
+    """Importa várias planilhas: leitura e regras em paralelo, gravação por um único escritor
+
+    As planilhas são lidas num pool de processos (uma por tarefa). A conexão de
+    escrita é só deste processo: primeiro entram as partidas de todas as planilhas
+    (assim um arquivo pode trazer rallys de partidas de outro), depois os rallys,
+    cada planilha em transações de lote. As planilhas de origem não são limpas.
+    'ordem_ponto' é numerada aqui, na ordem das planilhas: um game pode continuar
+    de um arquivo para outro, e reimportar um arquivo cai nas mesmas chaves.
+    Retorna o resumo por arquivo.
+    """
+    planilhas = listar_planilhas(entradas)
+    resumo = {caminho: {'status': 'ok', 'partidas': 0, 'rallys': 0, 'ignorados': 0, 'rejeitados': 0}
+              for caminho in planilhas}
+    lidas = {}
+
+    # ===== 1. LEITURA E REGRAS EM PARALELO =====
+    if processos == 1 or len(planilhas) <= 1:
+        # Uma planilha só (caso comum da importação contínua): sem custo de subir o pool
+        for caminho in planilhas:
+            try:
+                lidas[caminho] = ler_planilha(caminho)
+            except Exception as e:
+                resumo[caminho].update(status='erro', erro=str(e))
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            tarefas = {pool.submit(ler_planilha, caminho): caminho for caminho in planilhas}
+            for tarefa in as_completed(tarefas):
+                caminho = tarefas[tarefa]
+                try:
+                    lidas[caminho] = tarefa.result()
+                except Exception as e:
+                    resumo[caminho].update(status='erro', erro=str(e))
+
+    # ===== 2. ESCRITOR ÚNICO =====
+    conn = conectar(db_path)
+    lote = novo_lote()
+    tocadas = set()
+    try:
+        for etapa, tabela in ((0, "partidas"), (1, "rallys")):
+            for parte, caminho in enumerate(planilhas):
+                if caminho not in lidas:
+                    continue
+                df = lidas[caminho][etapa]
+                if df.empty:
+                    continue
+                try:
+                    if tabela == "partidas":
+                        resultado, novos = inserir_novos(conn, df, tabela, CHAVE_PARTIDAS, tamanho_lote=tamanho_lote)
+                    else:
+                        numerar_pontos(df, semear_contagem(conn, df, os.path.abspath(caminho), {}))
+                        df, existentes = descartar_existentes(conn, df)
+                        aplicar_placar(df, continuar_do_banco(conn, df, ContinuacaoPlacar()))
+                        resultado, novos = inserir_novos(
+                            conn, df, tabela, CHAVE_RALLYS,
+                            filtro="s.partida_id IN (SELECT partida_id FROM partidas)",
+                            tamanho_lote=tamanho_lote, synchronous="NORMAL"
+                        )
+                        tocadas.update(novos['partida_id'].dropna().astype(int))
+                        resumo[caminho]['ignorados'] += resultado.ignorados + existentes
+                    gravar_segmento(novos, tabela, lote, parte, origem=caminho)
+                    resumo[caminho][tabela] += resultado.inseridos
+                    resumo[caminho]['rejeitados'] += resultado.rejeitados
+                except Exception as e:
+                    conn.rollback()
+                    resumo[caminho].update(status='erro', erro=str(e))
+
+        atualizar_estatisticas(conn, tocadas)
+        atualizar_sequencias(conn, tocadas)
+        atualizar_historico(conn, tocadas)
+        if any(r['partidas'] or r['rallys'] for r in resumo.values()):
+            publicar_snapshot(conn, incrementar_geracao(conn), tocadas)
+    finally:
+        conn.close()
+
+    # ===== 3. RESUMO POR ARQUIVO =====
+    for caminho, r in resumo.items():
+        if r['status'] == 'ok':
+            print(f"✅ {caminho}: {r['partidas']} partida(s), {r['rallys']} rally(s), "
+                  f"{r['ignorados']} ignorado(s), {r['rejeitados']} na Quarentena")
+        else:
+            print(f"❌ {caminho}: {r['erro']}")
+    falhas = sum(r['status'] != 'ok' for r in resumo.values())
+    print(f"\n📦 {len(planilhas) - falhas} de {len(planilhas)} planilha(s) importada(s)")
+    return resumo
+
+# Executa a importação:
+#   python -m tenis.importar_dados                  -> planilha de digitação (dados_tenis.xlsx)
+#   python -m tenis.importar_dados --streaming      -> a mesma, em blocos (planilhas grandes)
+#   python -m tenis.importar_dados --lote PASTA|ARQUIVOS [--processos N]
+# (ou pela linha de comando do pacote: python -m tenis import ...)
+if __name__ == "__main__":
+    if "--lote" in sys.argv:
+        argumentos = sys.argv[sys.argv.index("--lote") + 1:]
+        processos = None
+        if "--processos" in argumentos:
+            i = argumentos.index("--processos")
+            processos = int(argumentos[i + 1])
+            argumentos = argumentos[:i] + argumentos[i + 2:]
+        enviar_lote(argumentos, processos=processos)
+    elif "--streaming" in sys.argv:
+        enviar_dados_streaming(limpar_planilha=True)
+    else:
+        enviar_dados()
\ No newline at end of file
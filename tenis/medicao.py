@@ -0,0 +1,163 @@
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Instrumentação opcional: etapas cronometradas com linhas, tempo e pico de memória.
+# Desligada por padrão (custo zero); liga com a variável de ambiente
+# TENIS_METRICAS=arquivo.jsonl (grava cada etapa no arquivo) ou com ativar().
+# ativar_sessao() liga só no contexto atual (uma sessão do dashboard), com as
+# etapas numa coleção da sessão, sem mexer na configuração do processo.
+ARQUIVO_METRICAS = os.environ.get("TENIS_METRICAS") or None
+# Últimas etapas guardadas em memória (painel de diagnóstico do dashboard)
+MAX_REGISTROS = 500
+
+_config = {'ativo': ARQUIVO_METRICAS is not None, 'arquivo': ARQUIVO_METRICAS, 'memoria': True}
+_registros = deque(maxlen=MAX_REGISTROS)
+_sequencia = itertools.count(1)
+_trava = threading.Lock()
+_local = threading.local()
+# Coleção da sessão que está medindo neste contexto (None = sessão sem medição)
+_sessao = contextvars.ContextVar('medicao_sessao', default=None)
+# Coleções das sessões que pediram o tracemalloc; uma sessão encerrada sai sozinha
+_sessoes_memoria = weakref.WeakValueDictionary()
+
+class Etapa:
+    """Etapa em andamento; 'linhas' pode ser preenchido dentro do bloco"""
+    __slots__ = ('nome', 'linhas', 'inicio', 'base', 'pico')
+
+    def __init__(self, nome, linhas=None):
+        self.nome = nome
+        self.linhas = linhas
+        self.inicio = self.base = self.pico = 0
+
+# Devolvida quando a instrumentação está desligada: aceita 'linhas' e não mede nada
+_INATIVA = Etapa(None)
+
+def ativar(arquivo=None, memoria=True):
+    """Liga a medição; com 'memoria', o tracemalloc mede o pico de cada etapa (mais lento)"""
+    _config.update(ativo=True, memoria=memoria, arquivo=arquivo or _config['arquivo'])
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def _parar_memoria():
+    # O tracemalloc só para quando ninguém mais o usa (sessões e medição do processo)
+    with _trava:
+        em_uso = len(_sessoes_memoria) or (_config['ativo'] and _config['memoria'])
+    if not em_uso and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+def desativar():
+    _config['ativo'] = False
+    _parar_memoria()
+
+def ativar_sessao(coleta, memoria=True):
+    """Liga a medição só no contexto atual; as etapas vão para 'coleta' (ex.: uma deque)
+
+    Com 'memoria' a sessão entra na contagem de quem usa o tracemalloc; ele para
+    quando a última delas chama desativar_sessao (ou é encerrada).
+    """
+    _sessao.set(coleta)
+    with _trava:
+        if memoria:
+            _sessoes_memoria[id(coleta)] = coleta
+        else:
+            _sessoes_memoria.pop(id(coleta), None)
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _parar_memoria()
+
+def desativar_sessao(coleta=None):
+    """Desliga a medição no contexto atual e libera o tracemalloc pedido por 'coleta'"""
+    _sessao.set(None)
+    if coleta is not None:
+        with _trava:
+            _sessoes_memoria.pop(id(coleta), None)
+    _parar_memoria()
+
+def ativo():
+    return _config['ativo'] or _sessao.get() is not None
+
+def _abertas():
+    if not hasattr(_local, 'pilha'):
+        _local.pilha = []
+    return _local.pilha
+
+def _atualizar_picos(pilha):
+    # O pico do tracemalloc é global: repassa o atual às etapas abertas antes de zerá-lo
+    atual, pico = tracemalloc.get_traced_memory()
+    for aberta in pilha:
+        aberta.pico = max(aberta.pico, pico)
+    tracemalloc.reset_peak()
+    return atual
+
+@contextmanager
+def etapa(nome, linhas=None):
+    """Mede o bloco: with etapa("importar.4 regras", len(df)) as e: ... (e.linhas = n)"""
+    if not ativo():
+        yield _INATIVA
+        return
+    pilha = _abertas()
+    medida = Etapa(nome, linhas)
+    memoria = tracemalloc.is_tracing()
+    if memoria:
+        medida.base = _atualizar_picos(pilha)
+    pilha.append(medida)
+    medida.inicio = time.perf_counter()
+    try:
+        yield medida
+    finally:
+        segundos = time.perf_counter() - medida.inicio
+        if memoria and tracemalloc.is_tracing():
+            _atualizar_picos(pilha)
+        pilha.pop()
+        _registrar({
+            'seq': next(_sequencia),
+            'quando': datetime.now().isoformat(timespec='milliseconds'),
+            'pid': os.getpid(),
+            'etapa': nome,
+            'nivel': len(pilha),
+            'linhas': None if medida.linhas is None else int(medida.linhas),
+            'segundos': round(segundos, 6),
+            'pico_mb': round((medida.pico - medida.base) / 2**20, 2) if memoria else None,
+        })
+
+def _registrar(registro):
+    coleta = _sessao.get()
+    if coleta is not None:
+        coleta.append(registro)
+    if not _config['ativo']:
+        return
+    _registros.append(registro)
+    if _config['arquivo']:
+        with _trava, open(_config['arquivo'], 'a', encoding='utf-8') as arquivo:
+            arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+def marca(coleta=None):
+    """Número da última etapa registrada (para pegar só as etapas que vierem depois)"""
+    coleta = _registros if coleta is None else coleta
+    return coleta[-1]['seq'] if coleta else 0
+
+def registros(desde=0, coleta=None):
+    """Etapas registradas em memória (neste processo, ou na coleta de uma sessão), em ordem de término"""
+    coleta = _registros if coleta is None else coleta
+    return [r for r in list(coleta) if r['seq'] > desde]
+
+def ler_metricas(arquivo=None, limite=200):
+    """Últimas etapas gravadas no arquivo JSON lines (ex.: as da última importação)"""
+    arquivo = arquivo or _config['arquivo']
+    if not arquivo or not os.path.exists(arquivo):
+        return []
+    with open(arquivo, encoding='utf-8') as entrada:
+        return [json.loads(linha) for linha in deque(entrada, maxlen=limite) if linha.strip()]
+
+# Ligada pela variável de ambiente: já começa a rastrear a memória na importação do módulo
+if ARQUIVO_METRICAS:
+    ativar(ARQUIVO_METRICAS)
@@ -0,0 +1,264 @@
+import functools
+import numpy as np
+import pandas as pd
+
+# Convenção usada em todo o projeto: 1 = Rodrigo, 0 = adversário
+# (vale para 'servidor', 'ponto_num' e 'ganhador_ponto').
+
+GAMES_POR_SET = 6
+PONTOS_GAME = 4          # 0, 15, 30, 40 -> o 4º ponto fecha o game (com 2 de vantagem)
+PONTOS_TIEBREAK = 7
+LIMITE_SETS = 3          # contagem de sets saturada, só para exibição
+
+SEM_VENCEDOR = 2         # código do ganhador quando o ponto não tem vencedor definido
+
+# Níveis de reinício quando a numeração digitada muda
+REINICIO_NENHUM = 0
+REINICIO_SAQUE = 1       # troca de sacador fora do tiebreak (comportamento antigo)
+REINICIO_GAME = 2
+REINICIO_SET = 3
+REINICIO_PARTIDA = 4
+
+NOMES_PONTOS = ['0', '15', '30', '40']
+
+# Situação do game antes do ponto, do ponto de vista de quem saca (código = posição)
+NOMES_PRESSAO = ['Frente', 'Empate', 'Atras', 'Vantagem']
+
+def _avancar(estado, vencedor):
+    """Aplica um ponto a um estado (pj, pa, gj, ga, sj, sa). Usado só para montar a tabela."""
+    pj, pa, gj, ga, sj, sa = estado
+    tiebreak = gj == ga == GAMES_POR_SET
+    alvo = PONTOS_TIEBREAK if tiebreak else PONTOS_GAME
+
+    if vencedor == 1:
+        pj += 1
+    else:
+        pa += 1
+
+    if max(pj, pa) >= alvo and abs(pj - pa) >= 2:
+        if pj > pa:
+            gj += 1
+        else:
+            ga += 1
+        pj = pa = 0
+        if tiebreak or (max(gj, ga) >= GAMES_POR_SET and abs(gj - ga) >= 2):
+            if gj > ga:
+                sj = min(sj + 1, LIMITE_SETS)
+            else:
+                sa = min(sa + 1, LIMITE_SETS)
+            gj = ga = 0
+        return (pj, pa, gj, ga, sj, sa), True
+
+    # Deuce: 40-40 (ou 6-6 no tiebreak) e as vantagens voltam sempre ao mesmo estado
+    excesso = min(pj, pa) - (alvo - 1)
+    if excesso > 0:
+        pj -= excesso
+        pa -= excesso
+    return (pj, pa, gj, ga, sj, sa), False
+
+def _texto(estado, sacador_primeiro):
+    """Placar do game no formato sacador-receptor ("30-15", "40-ADV", "5-4" no tiebreak)."""
+    pj, pa, gj, ga, _, _ = estado
+    sac, rec = (pj, pa) if sacador_primeiro else (pa, pj)
+    if gj == ga == GAMES_POR_SET:
+        return f"{sac}-{rec}"
+    if min(sac, rec) >= PONTOS_GAME - 1 and sac != rec:
+        return "ADV-40" if sac > rec else "40-ADV"
+    return f"{NOMES_PONTOS[sac]}-{NOMES_PONTOS[rec]}"
+
+def _pressao(texto):
+    """Código em NOMES_PRESSAO de um placar sacador-receptor ("30-15", "40-ADV", "5-4")."""
+    sac, rec = texto.split('-')
+    if 'ADV' in (sac, rec):
+        return NOMES_PRESSAO.index('Vantagem')
+    if sac == rec:
+        return NOMES_PRESSAO.index('Empate')
+    return NOMES_PRESSAO.index('Frente' if int(sac) > int(rec) else 'Atras')
+
+class TabelasPlacar:
+    """Tabela de transição pré-calculada sobre todos os estados alcançáveis de uma partida."""
+
+    def __init__(self):
+        estados = []
+        indice = {}
+
+        def registrar(estado):
+            if estado not in indice:
+                indice[estado] = len(estados)
+                estados.append(estado)
+            return indice[estado]
+
+        registrar((0, 0, 0, 0, 0, 0))
+        proximo = []
+        fecha_game = []
+        i = 0
+        # Busca em largura: cada estado novo entra no fim da lista
+        while i < len(estados):
+            estado = estados[i]
+            destinos = []
+            fechou = []
+            for vencedor in (0, 1):
+                novo, fim = _avancar(estado, vencedor)
+                destinos.append(registrar(novo))
+                fechou.append(fim)
+            # Ponto sem vencedor definido não altera o placar
+            proximo.append(destinos + [i])
+            fecha_game.append(fechou + [False])
+            i += 1
+
+        pj, pa, gj, ga, sj, sa = (np.array(c, dtype=np.int8) for c in zip(*estados))
+        reinicio_game = [registrar((0, 0) + e[2:]) for e in estados]
+        reinicio_set = [registrar((0, 0, 0, 0) + e[4:]) for e in estados]
+        # No tiebreak o saque alterna dentro do game, então a troca não zera os pontos
+        reinicio_saque = [i if e[2] == e[3] == GAMES_POR_SET else reinicio_game[i]
+                          for i, e in enumerate(estados)]
+
+        self.estados = estados
+        # Listas Python para o laço; arrays numpy para as consultas vetorizadas
+        self.proximo = proximo
+        self.reinicio = [list(range(len(estados))), reinicio_saque, reinicio_game,
+                         reinicio_set, [0] * len(estados)]
+        self.proximo_np = np.array(proximo, dtype=np.int32)
+        self.fecha_game_np = np.array(fecha_game, dtype=bool)
+        self.pontos_jogador = pj
+        self.pontos_adversario = pa
+        self.games_jogador = gj
+        self.games_adversario = ga
+        self.sets_jogador = sj
+        self.sets_adversario = sa
+        self.tiebreak = (gj == GAMES_POR_SET) & (ga == GAMES_POR_SET)
+        # texto[estado, servidor]: servidor 0 = adversário saca, 1 = Rodrigo saca
+        self.texto = np.array([[_texto(e, False), _texto(e, True)] for e in estados], dtype=object)
+        # pressao[estado, servidor]: código em NOMES_PRESSAO (consulta por índice, sem parse)
+        self.pressao = np.vectorize(_pressao, otypes=[np.int8])(self.texto)
+
+@functools.lru_cache(maxsize=None)
+def tabelas():
+    """Constrói (uma única vez) as tabelas de transição do placar."""
+    return TabelasPlacar()
+
+def codificar_ganhador(serie):
+    """Converte a coluna de ganhador (0/1/NaN) em códigos 0, 1 ou SEM_VENCEDOR."""
+    valores = pd.to_numeric(serie, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    return np.select([valores == 0, valores == 1], [0, 1], SEM_VENCEDOR).astype(np.int8)
+
+COLUNAS_REINICIO = ((REINICIO_SAQUE, 'servidor'), (REINICIO_GAME, 'game_num'),
+                    (REINICIO_SET, 'set_num'), (REINICIO_PARTIDA, 'partida_id'))
+
+class ContinuacaoPlacar:
+    """Estado do placar levado de um bloco de rallys para o seguinte (importação em blocos)."""
+
+    def __init__(self):
+        self.estado = 0
+        self.ultima_linha = None   # últimos valores de servidor/game/set/partida vistos
+        # partida_id -> (estado, ultima_linha) depois do último ponto visto da partida; uma
+        # partida que volta a aparecer (ou já gravada no banco) continua daí, não de 0-0
+        self.partidas = {}
+
+def marcar_reinicios(df, anterior=None):
+    """Nível de reinício de cada linha, a partir de mudanças em servidor/partida_id/set_num/game_num.
+
+    'anterior' são os valores da última linha do bloco anterior; sem ele a
+    primeira linha sempre começa uma partida nova.
+    """
+    reinicio = np.zeros(len(df), dtype=np.int8)
+    for nivel, coluna in COLUNAS_REINICIO:
+        if coluna not in df.columns:
+            continue
+        valores = df[coluna].ffill()
+        if anterior is not None:
+            valores = valores.fillna(anterior.get(coluna, -1))
+        valores = valores.fillna(-1)
+        deslocado = valores.shift()
+        if anterior is not None and len(valores):
+            deslocado.iloc[0] = anterior.get(coluna, -1)
+        # Em colunas anuláveis (Int8/Int16) a comparação com o deslocado pode dar <NA>
+        mudou = valores.ne(deslocado).fillna(True).to_numpy(dtype=bool)
+        reinicio = np.where(mudou, np.maximum(reinicio, nivel), reinicio)
+    if len(reinicio) and anterior is None:
+        reinicio[0] = REINICIO_PARTIDA
+    return reinicio
+
+def _ultima_linha(df, anterior):
+    """Últimos valores (não nulos) das colunas de reinício, para o próximo bloco."""
+    ultima = dict(anterior or {})
+    for _, coluna in COLUNAS_REINICIO:
+        if coluna in df.columns:
+            valores = df[coluna].dropna()
+            if len(valores):
+                ultima[coluna] = valores.iloc[-1]
+    return ultima
+
+def percorrer(ganhador, reinicio, estado=0):
+    """Única passada sequencial: devolve o estado antes de cada ponto e o estado final."""
+    t = tabelas()
+    proximo, reinicios = t.proximo, t.reinicio
+    antes = []
+    guardar = antes.append
+    for vencedor, nivel in zip(ganhador.tolist(), reinicio.tolist()):
+        estado = reinicios[nivel][estado]
+        guardar(estado)
+        estado = proximo[estado][vencedor]
+    return np.array(antes, dtype=np.int32), estado
+
+def _percorrer_partidas(df, ganhador, continuacao):
+    """percorrer() trecho a trecho (um por partida), partindo do estado guardado de cada partida"""
+    reinicio = marcar_reinicios(df, continuacao.ultima_linha)
+    partidas = df['partida_id'].ffill() if 'partida_id' in df.columns else pd.Series(np.nan, index=df.index)
+    inicios = np.flatnonzero(reinicio == REINICIO_PARTIDA)
+    cortes = [0, *inicios[inicios > 0].tolist(), len(df)]
+    trechos = []
+    for a, b in zip(cortes[:-1], cortes[1:]):
+        nivel = reinicio[a:b]
+        anterior = continuacao.ultima_linha
+        if b > a and nivel[0] == REINICIO_PARTIDA:
+            anterior = None
+            guardada = continuacao.partidas.get(partidas.iloc[a]) if pd.notna(partidas.iloc[a]) else None
+            if guardada is not None:
+                # Partida já começada: o reinício é medido contra o último ponto dela
+                continuacao.estado, anterior = guardada
+                nivel = nivel.copy()
+                nivel[0] = marcar_reinicios(df.iloc[a:a + 1], anterior)[0]
+        antes, continuacao.estado = percorrer(ganhador[a:b], nivel, continuacao.estado)
+        continuacao.ultima_linha = _ultima_linha(df.iloc[a:b], anterior)
+        partida = continuacao.ultima_linha.get('partida_id')
+        if partida is not None and pd.notna(partida):
+            continuacao.partidas[partida] = (continuacao.estado, continuacao.ultima_linha)
+        trechos.append(antes)
+    return np.concatenate(trechos) if trechos else np.zeros(0, dtype=np.int32)
+
+def calcular_placar(df, coluna_ganhador='ponto_num', continuacao=None):
+    """Calcula placar do game, games/sets e tiebreak de cada rally, na ordem das linhas.
+
+    'placar_antes' é o placar antes do ponto e 'placar' o placar depois dele
+    ("Game" quando o ponto fecha o game), ambos no formato sacador-receptor.
+    'estado' é o índice inteiro do placar antes do ponto nas tabelas() (para
+    consultas vetorizadas, ex.: importancia.py) e 'pressao' a situação do sacador.
+    Com uma ContinuacaoPlacar, o cálculo parte do estado do bloco anterior e a
+    atualiza no fim, para processar uma partida em vários blocos; uma partida
+    que está em continuacao.partidas continua do placar guardado dela.
+    """
+    t = tabelas()
+    ganhador = codificar_ganhador(df[coluna_ganhador])
+    if continuacao is None:
+        antes, _ = percorrer(ganhador, marcar_reinicios(df))
+    else:
+        antes = _percorrer_partidas(df, ganhador, continuacao)
+    depois = t.proximo_np[antes, ganhador]
+
+    # Sem servidor definido, o placar é exibido com Rodrigo primeiro
+    servidor = pd.to_numeric(df['servidor'], errors='coerce').fillna(1).to_numpy().astype(np.int8)
+    placar_depois = t.texto[depois, servidor]
+    placar_depois[t.fecha_game_np[antes, ganhador]] = "Game"
+
+    return pd.DataFrame({
+        'estado': antes,
+        'placar_antes': t.texto[antes, servidor],
+        'placar': placar_depois,
+        'games_jogador': t.games_jogador[antes],
+        'games_adversario': t.games_adversario[antes],
+        'sets_jogador': t.sets_jogador[antes],
+        'sets_adversario': t.sets_adversario[antes],
+        'tiebreak': t.tiebreak[antes],
+        'pressao': pd.Categorical.from_codes(t.pressao[antes, servidor], categories=NOMES_PRESSAO),
+    }, index=df.index)
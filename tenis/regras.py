@@ -0,0 +1,255 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from .tipos import valores
+
+# Regras de preenchimento do tênis como tabela declarativa: condições -> atribuições.
+# MotorRegras compila a tabela uma vez (colunas em ordem de dependência) e a aplica
+# em uma passada: cada coluna alvo é calculada uma única vez com np.select, na
+# ordem de prioridade, e cada condição é avaliada uma única vez.
+#
+# Semântica:
+# - Regras que escrevem a mesma célula: vence a de maior 'prioridade'.
+# - A prioridade também é a ordem de leitura, como se as regras rodassem em
+#   sequência: uma regra vê as colunas como o digitado e as regras de menor
+#   prioridade as deixaram (ex.: Regra 5 lê 'num_trocas' depois que a Regra 1 o
+#   fixou em 1, mas a Regra 3 lê 'devolucao_dentro' antes da Regra 5).
+# - Regra nova = linha nova na tabela; o laço de aplicação não muda.
+#
+# Condições: (coluna, operador, valor), combinadas com "e"; ou uma função que
+# recebe ler(coluna) -> array e devolve a máscara (declare as colunas em 'usa').
+# Valores: constante, Coluna(nome), Oposto(nome) (1 - coluna), SeVazio(valor)
+# (só preenche célula vazia) ou uma função ler -> array.
+
+Regra = namedtuple('Regra', ['nome', 'prioridade', 'condicoes', 'atribuicoes', 'usa'], defaults=[()])
+Coluna = namedtuple('Coluna', ['nome'])
+Oposto = namedtuple('Oposto', ['nome'])
+SeVazio = namedtuple('SeVazio', ['valor'])
+
+# origem: DataFrame (mesmo índice) com a regra que definiu cada célula das colunas alvo
+# contradicoes: uma linha por célula em que o digitado ou outra regra foi descartado
+Relatorio = namedtuple('Relatorio', ['origem', 'contradicoes'])
+
+REGRAS = [
+    Regra("Regra 1: ace", 1, [('ace', '==', 1)], {
+        'tipo_ponto': SeVazio("Ace"),
+        'golpe_vencedor': SeVazio("Saque"),
+        'direcao_golpe': None,
+        'num_trocas': 1,
+        'devolucao_dentro': 0,
+        'falha_servico': 0,
+        'ponto_num': Coluna('servidor'),
+    }),
+    Regra("Regra 2: primeiro saque dentro", 2, [('primeiro_servico', '==', 1)], {
+        'falha_servico': 0,
+    }),
+    Regra("Regra 3: devolução fora", 3, [('devolucao_dentro', '==', 0)], {
+        'ponto_num': Coluna('servidor'),
+    }),
+    Regra("Regra 4: dupla falta", 4, [('falha_servico', '==', 1)], {
+        'ponto_num': Oposto('servidor'),
+    }),
+    Regra("Regra 5: rally com devolução", 5, [('num_trocas', '>', 2)], {
+        'devolucao_dentro': 1,
+    }),
+]
+
+OPERADORES = {
+    '==': lambda a, v: a == v,
+    '!=': lambda a, v: (a != v) & ~pd.isna(a),
+    '>': lambda a, v: a > v,
+    '>=': lambda a, v: a >= v,
+    '<': lambda a, v: a < v,
+    '<=': lambda a, v: a <= v,
+    'em': lambda a, v: np.isin(a, list(v)),
+}
+
+COLUNAS_CONTRADICOES = ['linha', 'coluna', 'tipo', 'regra', 'descartado', 'valor']
+
+def _numerica(serie):
+    return pd.api.types.is_numeric_dtype(serie.dtype) and not pd.api.types.is_bool_dtype(serie.dtype)
+
+def _iguais(a, b):
+    return np.asarray((a == b) | (pd.isna(a) & pd.isna(b)), dtype=bool)
+
+def _so_vazias(mascara, atual):
+    # Restringe a máscara às células vazias, olhando só as linhas marcadas
+    linhas = np.flatnonzero(mascara)
+    restrita = np.zeros_like(mascara)
+    restrita[linhas[pd.isna(atual[linhas])]] = True
+    return restrita
+
+def _serie(novo, tipo, indice, texto):
+    # Devolve a coluna no tipo original (Int8 anulável sem passar por astype)
+    if texto:
+        return pd.Series(novo, index=indice)
+    faltando = np.isnan(novo)
+    if pd.api.types.is_extension_array_dtype(tipo) and pd.api.types.is_integer_dtype(tipo):
+        inteiros = np.where(faltando, 0, novo).astype(tipo.numpy_dtype)
+        return pd.Series(pd.arrays.IntegerArray(inteiros, faltando), index=indice)
+    if tipo.kind in 'iu' and faltando.any():
+        tipo = 'float64'
+    return pd.Series(novo, index=indice).astype(tipo)
+
+class MotorRegras:
+    """Tabela de regras compilada: colunas alvo em ordem de dependência e, para
+    cada uma, as regras que a escrevem da maior para a menor prioridade"""
+
+    def __init__(self, regras):
+        self.regras = list(regras)
+        nomes = [regra.nome for regra in self.regras]
+        if len(set(nomes)) != len(nomes):
+            raise ValueError("Nomes de regra repetidos na tabela")
+        for regra in self.regras:
+            for condicao in regra.condicoes:
+                if not callable(condicao) and condicao[1] not in OPERADORES:
+                    raise ValueError(f"{regra.nome}: operador desconhecido {condicao[1]!r}")
+
+        self.escritores = {}
+        for regra in sorted(self.regras, key=lambda r: -r.prioridade):
+            for coluna, valor in regra.atribuicoes.items():
+                self.escritores.setdefault(coluna, []).append((regra, valor))
+        self.ordem = self._ordenar()
+
+    @staticmethod
+    def _lidas(regra, valor):
+        colunas = set(regra.usa)
+        colunas.update(c[0] for c in regra.condicoes if not callable(c))
+        if isinstance(valor, (Coluna, Oposto)):
+            colunas.add(valor.nome)
+        return colunas
+
+    def _ordenar(self):
+        # Uma coluna só é calculada depois das colunas alvo que suas regras leem
+        pendentes = {
+            coluna: set().union(*(self._lidas(r, v) for r, v in escritores)) & self.escritores.keys() - {coluna}
+            for coluna, escritores in self.escritores.items()
+        }
+        ordem = []
+        while pendentes:
+            prontas = [c for c, dependencias in pendentes.items() if dependencias.issubset(ordem)]
+            if not prontas:
+                raise ValueError(f"Dependência circular entre as regras nas colunas {sorted(pendentes)}")
+            for coluna in prontas:
+                ordem.append(coluna)
+                del pendentes[coluna]
+        return ordem
+
+    @staticmethod
+    def _relatar(df, coluna, escritores, mascaras_coluna, escolhas, codigo, atual, novo, origem, contradicoes):
+        nomes = np.asarray([regra.nome for regra, _ in escritores], dtype=object)
+        origem[coluna] = pd.Categorical.from_codes(codigo, categories=nomes)
+
+        # Comparações só nas células decididas por regra (poucas em dados limpos)
+        linhas = np.flatnonzero(codigo >= 0)
+        linhas = linhas[~pd.isna(atual[linhas]) & ~_iguais(novo[linhas], atual[linhas])]
+        if len(linhas):
+            contradicoes.append((df.index[linhas], coluna, 'digitado', nomes[codigo[linhas]],
+                                 atual[linhas], novo[linhas]))
+        for i in range(len(escritores)):
+            for j in range(i + 1, len(escritores)):
+                linhas = np.flatnonzero(mascaras_coluna[i] & mascaras_coluna[j] & (codigo == i))
+                linhas = linhas[~_iguais(escolhas[i][linhas], escolhas[j][linhas])]
+                if len(linhas):
+                    descartado = [f"{nomes[j]}: {v}" for v in escolhas[j][linhas]]
+                    contradicoes.append((df.index[linhas], coluna, 'conflito', nomes[i],
+                                         descartado, novo[linhas]))
+
+    def aplicar(self, df, relatorio=True):
+        """Aplica a tabela no próprio df e devolve o Relatorio (origem e contradições)
+
+        Com 'relatorio=False' só preenche (mais rápido) e devolve None.
+        """
+        n = len(df)
+        lidas = {}
+        # Coluna alvo já calculada -> (prioridades, máscaras, escolhas, digitado) das suas regras
+        etapas = {}
+
+        def ler(coluna, antes=None):
+            # Valor da coluna depois das regras com prioridade menor que 'antes' (None = digitado)
+            if coluna not in lidas:
+                serie = df[coluna]
+                lidas[coluna] = valores(serie) if _numerica(serie) else serie.to_numpy(dtype=object)
+            if antes is None or coluna not in etapas:
+                return lidas[coluna]
+            chave = (coluna, antes)
+            if chave not in lidas:
+                prioridades, mascaras_coluna, escolhas, digitado = etapas[coluna]
+                anteriores = [i for i, p in enumerate(prioridades) if p < antes]
+                lidas[chave] = np.select([mascaras_coluna[i] for i in anteriores],
+                                         [escolhas[i] for i in anteriores], default=digitado)
+            return lidas[chave]
+
+        mascaras = {}
+
+        def condicao(regra):
+            if regra.nome not in mascaras:
+                mascara = np.ones(n, dtype=bool)
+                ler_regra = lambda coluna: ler(coluna, regra.prioridade)
+                for c in regra.condicoes:
+                    mascara &= np.asarray(c(ler_regra) if callable(c) else OPERADORES[c[1]](ler_regra(c[0]), c[2]),
+                                          dtype=bool)
+                mascaras[regra.nome] = mascara
+            return mascaras[regra.nome]
+
+        origem = pd.DataFrame(index=df.index)
+        contradicoes = []
+        for coluna in self.ordem:
+            escritores = self.escritores[coluna]
+            original = df[coluna] if coluna in df.columns else pd.Series(np.nan, index=df.index)
+            texto = not _numerica(original) or any(
+                isinstance(v.valor if isinstance(v, SeVazio) else v, str) for _, v in escritores
+            )
+            atual = original.to_numpy(dtype=object) if texto else valores(original)
+
+            mascaras_coluna, escolhas = [], []
+            for regra, valor in escritores:
+                mascara = condicao(regra)
+                if isinstance(valor, SeVazio):
+                    mascara, valor = _so_vazias(mascara, atual), valor.valor
+                if isinstance(valor, Coluna):
+                    valor = ler(valor.nome, regra.prioridade)
+                elif isinstance(valor, Oposto):
+                    valor = 1 - ler(valor.nome, regra.prioridade)
+                elif callable(valor):
+                    valor = valor(lambda nome: ler(nome, regra.prioridade))
+                elif valor is None and not texto:
+                    valor = np.nan
+                mascaras_coluna.append(mascara)
+                escolhas.append(np.broadcast_to(np.asarray(valor, dtype=object if texto else float), (n,)))
+
+            # A primeira máscara verdadeira (maior prioridade) decide a célula
+            codigo = np.select(mascaras_coluna, np.arange(len(escritores)), default=-1)
+            novo = np.select(mascaras_coluna, escolhas, default=atual)
+            if relatorio:
+                self._relatar(df, coluna, escritores, mascaras_coluna, escolhas, codigo, atual, novo,
+                              origem, contradicoes)
+
+            etapas[coluna] = ([regra.prioridade for regra, _ in escritores], mascaras_coluna, escolhas, atual)
+            if coluna not in df.columns or (texto and _numerica(original)):
+                df[coluna] = _serie(novo, original.dtype, df.index, texto)
+            else:
+                # Só as células decididas por regra, no próprio bloco (sem recriar a coluna)
+                linhas = np.flatnonzero(codigo >= 0)
+                if len(linhas):
+                    df.iloc[linhas, df.columns.get_loc(coluna)] = _serie(novo[linhas], original.dtype, None, texto).to_numpy()
+
+        if not relatorio:
+            return None
+        partes = [[], [], [], [], [], []]
+        for contradicao in contradicoes:
+            n_linhas = len(contradicao[0])
+            for parte, campo in zip(partes, contradicao):
+                parte.append(np.asarray(campo, dtype=object) if np.ndim(campo) else np.full(n_linhas, campo, dtype=object))
+        contradicoes = pd.DataFrame({
+            nome: np.concatenate(parte) if parte else np.array([], dtype=object)
+            for nome, parte in zip(COLUNAS_CONTRADICOES, partes)
+        })
+        contradicoes = contradicoes.sort_values(['linha', 'coluna'], kind='stable').reset_index(drop=True)
+        return Relatorio(origem, contradicoes)
+
+MOTOR = MotorRegras(REGRAS)
+
+def resumir_contradicoes(contradicoes):
+    """Contagem de contradições por regra, coluna e tipo"""
+    return contradicoes.groupby(['regra', 'coluna', 'tipo']).size().rename('celulas').reset_index()
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+from .tipos import valores
+
+# Sequências de pontos (run-length) guardadas na tabela Sequencias: uma linha por
+# sequência de pontos seguidos do mesmo jogador dentro de (partida_id, set_num).
+# 'inicio' é a posição do 1º ponto da sequência no set (0 = primeiro ponto).
+# Pontos sem ganhador 0/1 interrompem a sequência e não entram em nenhuma; pontos
+# sem partida_id ou set_num ficam de fora do cálculo. A tabela é criada pela
+# migração 9 (criar_banco).
+COLUNAS_SEQUENCIAS = ['partida_id', 'set_num', 'inicio', 'tamanho', 'ganhador']
+# Tamanho mínimo de uma sequência para contar como mudança de momento
+MINIMO_MOMENTO = 3
+
+def calcular_sequencias(rallys):
+    """Tabela de sequências a partir de rallys ordenados, numa única passada vetorizada"""
+    ganhador = valores(rallys['ganhador_ponto'])
+    partida = valores(rallys['partida_id'])
+    set_num = valores(rallys['set_num'])
+    # Chave nula não tem set nem posição (e não pode chegar aos casts para int64)
+    chave = ~np.isnan(partida) & ~np.isnan(set_num)
+    if not chave.all():
+        ganhador, partida, set_num = ganhador[chave], partida[chave], set_num[chave]
+    n = len(partida)
+    if n == 0:
+        return pd.DataFrame(columns=COLUNAS_SEQUENCIAS, dtype='int64')
+
+    # Começo de cada set (ou partida) e posição de cada ponto dentro dele
+    novo_set = np.ones(n, dtype=bool)
+    novo_set[1:] = (partida[1:] != partida[:-1]) | (set_num[1:] != set_num[:-1])
+    inicio_set = np.maximum.accumulate(np.where(novo_set, np.arange(n), 0))
+    posicao = np.arange(n) - inicio_set
+
+    # Sequência nova: novo set, ponto anterior sem ganhador ou ganhador diferente
+    valido = (ganhador == 0) | (ganhador == 1)
+    comeca = valido.copy()
+    comeca[1:] &= novo_set[1:] | ~valido[:-1] | (ganhador[1:] != ganhador[:-1])
+    inicios = np.flatnonzero(comeca)
+    sequencia = np.cumsum(comeca) - 1
+    tamanho = np.bincount(sequencia[valido], minlength=len(inicios))
+
+    return pd.DataFrame({
+        'partida_id': partida[inicios].astype(np.int64),
+        'set_num': set_num[inicios].astype(np.int64),
+        'inicio': posicao[inicios].astype(np.int64),
+        'tamanho': tamanho.astype(np.int64),
+        'ganhador': ganhador[inicios].astype(np.int64),
+    })
+
+def _ler_rallys(conn, partidas_ids=None):
+    # Na ordem da chave natural (índice UNIQUE): a posição no set sai da ordem das linhas
+    query = """
+        SELECT partida_id, set_num, COALESCE(ganhador_ponto, ponto_num) AS ganhador_ponto
+        FROM rallys
+        {filtro}
+        ORDER BY partida_id, set_num, game_num, ordem_ponto
+    """
+    if partidas_ids is None:
+        return pd.read_sql(query.format(filtro=""), conn)
+    marcadores = ','.join(['?'] * len(partidas_ids))
+    return pd.read_sql(query.format(filtro=f"WHERE partida_id IN ({marcadores})"), conn,
+                       params=list(partidas_ids))
+
+def preencher_sequencias(conn, partidas_ids=None):
+    """Substitui as linhas de Sequencias das partidas indicadas (todas se None), sem commit"""
+    sequencias = calcular_sequencias(_ler_rallys(conn, partidas_ids))
+    if partidas_ids is None:
+        conn.execute("DELETE FROM Sequencias")
+    else:
+        marcadores = ','.join(['?'] * len(partidas_ids))
+        conn.execute(f"DELETE FROM Sequencias WHERE partida_id IN ({marcadores})", list(partidas_ids))
+    conn.executemany(
+        f"INSERT INTO Sequencias ({','.join(COLUNAS_SEQUENCIAS)}) VALUES ({','.join(['?'] * len(COLUNAS_SEQUENCIAS))})",
+        sequencias.itertuples(index=False, name=None)
+    )
+    return len(sequencias)
+
+def atualizar_sequencias(conn, partidas_ids):
+    """Recalcula as sequências só das partidas tocadas por uma importação"""
+    partidas_ids = [int(p) for p in pd.unique(pd.Series(list(partidas_ids), dtype=float).dropna())]
+    if not partidas_ids:
+        return 0
+    preencher_sequencias(conn, partidas_ids)
+    conn.commit()
+    return len(partidas_ids)
+
+def reconstruir_sequencias(conn):
+    """Regera a tabela Sequencias inteira a partir dos rallys"""
+    total = preencher_sequencias(conn)
+    conn.commit()
+    return total
+
+def carregar_sequencias(conn, partida_id, set_num=None):
+    """Sequências de uma partida (ou de um set), na ordem dos pontos"""
+    query = "SELECT * FROM Sequencias WHERE partida_id = ?"
+    parametros = [partida_id]
+    if set_num is not None:
+        query += " AND set_num = ?"
+        parametros.append(set_num)
+    return pd.read_sql(query + " ORDER BY set_num, inicio", conn, params=parametros)
+
+def resumir_sequencias(sequencias, jogador, minimo=MINIMO_MOMENTO):
+    """Maior sequência, sequências longas e viradas de momento de um jogador
+
+    Uma virada é uma sequência de pelo menos 'minimo' pontos logo depois (no
+    mesmo set) de uma sequência longa do outro jogador.
+    """
+    do_jogador = sequencias['ganhador'] == jogador
+    longas = sequencias[sequencias['tamanho'] >= minimo]
+    anterior = longas.groupby(['partida_id', 'set_num'])['ganhador'].shift()
+    viradas = anterior.notna() & (longas['ganhador'] != anterior)
+    return {
+        'maior_sequencia': int(sequencias.loc[do_jogador, 'tamanho'].max()) if do_jogador.any() else 0,
+        'sequencias_longas': int((longas['ganhador'] == jogador).sum()),
+        'viradas': int((viradas & (longas['ganhador'] == jogador)).sum()),
+    }
+
+def linha_do_tempo(sequencias):
+    """Um ponto por linha: posição na seleção, pontos seguidos até ali e ganhador
+
+    Os sets ficam em sequência no eixo; pontos sem ganhador deixam um buraco.
+    """
+    if sequencias.empty:
+        return pd.DataFrame({'posicao': [], 'acumulado': [], 'ganhador': []}, dtype='int64')
+    fim_set = (sequencias['inicio'] + sequencias['tamanho']).groupby(sequencias['set_num']).max()
+    deslocamento = fim_set.cumsum().shift(fill_value=0)
+    tamanho = sequencias['tamanho'].to_numpy()
+    inicio = (sequencias['inicio'] + sequencias['set_num'].map(deslocamento)).to_numpy()
+    # Dentro de cada sequência: 0, 1, 2... somado ao início
+    passo = np.arange(tamanho.sum()) - np.repeat(np.cumsum(tamanho) - tamanho, tamanho)
+    return pd.DataFrame({
+        'posicao': np.repeat(inicio, tamanho) + passo,
+        'acumulado': passo + 1,
+        'ganhador': np.repeat(sequencias['ganhador'].to_numpy(), tamanho),
+    })
+
+# Regera a tabela a partir dos rallys: python -m tenis.sequencias
+if __name__ == "__main__":
+    from .criar_banco import conectar, incrementar_geracao
+    conn = conectar()
+    total = reconstruir_sequencias(conn)
+    incrementar_geracao(conn)
+    conn.close()
+    print(f"✅ Sequências reconstruídas: {total} linha(s)")
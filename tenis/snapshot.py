@@ -0,0 +1,209 @@
+import json
+import os
+import shutil
+from functools import lru_cache
+from urllib.parse import unquote
+import pandas as pd
+from .consultas import COLUNAS_RALLYS
+from .tipos import tipar_rallys
+
+# pyarrow é opcional (sem ele o dashboard continua lendo só do SQLite) e só é
+# importado na primeira chamada de disponivel(): importar o pacote não paga o custo
+pa = ds = fs = None
+
+# Pasta do snapshot colunar, configurável pela variável de ambiente TENIS_SNAPSHOT
+SNAPSHOT_DIR = os.environ.get("TENIS_SNAPSHOT", "snapshot")
+PONTEIRO = "ATUAL.json"
+TAMANHO_LOTE = 50000
+
+def _esquema():
+    inteiros = {'partida_id': pa.int32(), 'set_num': pa.int8(), 'game_num': pa.int8(),
+                'ordem_ponto': pa.int16(), 'num_trocas': pa.int16()}
+    campos = []
+    for col in COLUNAS_RALLYS + ['ganhador_ponto']:
+        if col in inteiros:
+            campos.append((col, inteiros[col]))
+        elif col in ('tipo_ponto', 'golpe_vencedor', 'direcao_golpe', 'direcao_servico', 'placar'):
+            campos.append((col, pa.string()))
+        else:
+            campos.append((col, pa.int8()))
+    campos += [('temporada', pa.int16()), ('adversario', pa.string())]
+    return pa.schema(campos)
+
+def _particionamento():
+    # Partições: temporada (ano da partida) / adversário
+    return ds.partitioning(pa.schema([('temporada', pa.int16()), ('adversario', pa.string())]), flavor='hive')
+
+@lru_cache(maxsize=None)
+def disponivel():
+    """True se o pyarrow está instalado"""
+    global pa, ds, fs
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+    except ImportError:
+        return False
+    return True
+
+def ler_ponteiro(pasta=None):
+    """Versão publicada do snapshot ({'versao', 'geracao'}), ou None"""
+    caminho = os.path.join(pasta or SNAPSHOT_DIR, PONTEIRO)
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+def snapshot_atual(geracao, pasta=None):
+    """Caminho do snapshot se ele corresponde à geração do banco; senão None (usar o SQLite)"""
+    if not disponivel():
+        return None
+    ponteiro = ler_ponteiro(pasta)
+    if not ponteiro or ponteiro['geracao'] != geracao:
+        return None
+    caminho = os.path.join(pasta or SNAPSHOT_DIR, ponteiro['versao'])
+    return caminho if os.path.isdir(caminho) else None
+
+def _partidas(conn):
+    return pd.read_sql("""
+        SELECT partida_id, CAST(substr(data, 1, 4) AS INTEGER) AS temporada, adversario FROM partidas
+    """, conn).set_index('partida_id')
+
+def _lotes(conn, esquema, partidas, partidas_ids=None):
+    # Partidas é pequena: temporada/adversário entram por lookup em memória, sem JOIN por rally
+    colunas = ', '.join(COLUNAS_RALLYS)
+    filtro, parametros = "partida_id IN (SELECT partida_id FROM partidas)", []
+    if partidas_ids is not None:
+        filtro = f"partida_id IN ({','.join(['?'] * len(partidas_ids))})"
+        parametros = list(partidas_ids)
+    consulta = pd.read_sql(f"""
+        SELECT {colunas}, COALESCE(ganhador_ponto, ponto_num) AS ganhador_ponto
+        FROM rallys
+        WHERE {filtro}
+        ORDER BY partida_id, set_num, game_num, ordem_ponto
+    """, conn, params=parametros, chunksize=TAMANHO_LOTE)
+    for bloco in consulta:
+        bloco = tipar_rallys(bloco)
+        bloco['temporada'] = bloco['partida_id'].map(partidas['temporada']).astype('Int16')
+        bloco['adversario'] = bloco['partida_id'].map(partidas['adversario'])
+        for col in COLUNAS_RALLYS:
+            if isinstance(bloco[col].dtype, pd.CategoricalDtype):
+                bloco[col] = bloco[col].astype(object)
+        yield pa.RecordBatch.from_pandas(bloco, schema=esquema, preserve_index=False)
+
+def _particao(relativo):
+    """(temporada, adversario) de um arquivo do snapshot, pelo caminho hive relativo à versão"""
+    valores = {}
+    for parte in relativo.split(os.sep)[:-1]:
+        nome, _, valor = parte.partition('=')
+        valor = unquote(valor)
+        valores[nome] = None if valor == '__HIVE_DEFAULT_PARTITION__' else valor
+    temporada = valores.get('temporada')
+    return (int(temporada) if temporada is not None else None), valores.get('adversario')
+
+def _reaproveitar(anterior, destino, tocadas):
+    """Liga (hard link; cópia se não der) na nova versão os arquivos das partições não tocadas"""
+    for raiz, _, arquivos in os.walk(anterior):
+        for nome in arquivos:
+            origem = os.path.join(raiz, nome)
+            relativo = os.path.relpath(origem, anterior)
+            if _particao(relativo) in tocadas:
+                continue
+            alvo = os.path.join(destino, relativo)
+            os.makedirs(os.path.dirname(alvo), exist_ok=True)
+            try:
+                os.link(origem, alvo)
+            except OSError:
+                shutil.copy2(origem, alvo)
+
+def publicar_snapshot(conn, geracao, pasta=None, partidas_ids=None):
+    """Grava um snapshot Parquet particionado por temporada/adversário e o publica
+
+    Cada publicação vai para uma pasta nova; o ponteiro ATUAL.json só é trocado
+    no fim (troca atômica) e as versões anteriores são apagadas em seguida.
+    Com 'partidas_ids' (as partidas que a importação tocou) e o snapshot da geração
+    anterior publicado, só as partições dessas partidas são regravadas; as outras
+    entram por hard link da versão anterior.
+    """
+    if not disponivel():
+        return None
+    pasta = pasta or SNAPSHOT_DIR
+    versao = f"g{geracao:06d}"
+    destino = os.path.join(pasta, versao)
+    shutil.rmtree(destino, ignore_errors=True)
+    os.makedirs(pasta, exist_ok=True)
+
+    partidas = _partidas(conn)
+    regravar = None
+    ponteiro = ler_ponteiro(pasta)
+    anterior = os.path.join(pasta, ponteiro['versao']) if ponteiro else None
+    # Só a geração imediatamente anterior serve de base: outra pode não ter tudo o que o banco tem
+    if partidas_ids is not None and ponteiro and ponteiro['geracao'] == geracao - 1 and os.path.isdir(anterior):
+        ids = {int(p) for p in pd.Series(list(partidas_ids), dtype=float).dropna()}
+        chaves = pd.Series(list(zip(partidas['temporada'].astype(object).where(partidas['temporada'].notna(), None),
+                                    partidas['adversario'].where(partidas['adversario'].notna(), None))),
+                           index=partidas.index)
+        tocadas = set(chaves[chaves.index.isin(ids)])
+        regravar = chaves.index[chaves.isin(tocadas)].tolist()
+        _reaproveitar(anterior, destino, tocadas)
+
+    # Um arquivo por lote e partição; cada lote é gravado nesta thread (a conexão
+    # SQLite não pode ser lida pelas threads de escrita do pyarrow)
+    esquema = _esquema()
+    for numero, lote in enumerate(_lotes(conn, esquema, partidas, regravar)):
+        ds.write_dataset(
+            pa.Table.from_batches([lote], schema=esquema), destino, format='parquet',
+            partitioning=_particionamento(), basename_template=f"parte-{numero:05d}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore'
+        )
+
+    temporario = os.path.join(pasta, PONTEIRO + ".tmp")
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump({'versao': versao, 'geracao': geracao}, arquivo)
+    os.replace(temporario, os.path.join(pasta, PONTEIRO))
+
+    for nome in os.listdir(pasta):
+        if nome != versao and os.path.isdir(os.path.join(pasta, nome)):
+            shutil.rmtree(os.path.join(pasta, nome), ignore_errors=True)
+    return destino
+
+@lru_cache(maxsize=2)
+def abrir_snapshot(caminho):
+    """Dataset de uma versão publicada; a listagem das partições é feita uma vez por versão"""
+    if not disponivel():
+        raise ImportError("pyarrow não instalado (pip install pyarrow)")
+    return ds.dataset(caminho, format='parquet', partitioning=_particionamento(),
+                      filesystem=fs.LocalFileSystem(use_mmap=True))
+
+def carregar_rallys(caminho, temporada, adversario, partida_id, set_num=None, colunas=None):
+    """Rallys de uma partida lidos do snapshot (memory-map, só as partições e colunas pedidas)"""
+    dataset = abrir_snapshot(caminho)
+    filtro = (ds.field('temporada') == temporada) & (ds.field('adversario') == adversario) & \
+             (ds.field('partida_id') == partida_id)
+    if set_num is not None:
+        filtro &= ds.field('set_num') == set_num
+    tabela = dataset.to_table(columns=colunas or COLUNAS_RALLYS + ['ganhador_ponto'], filter=filtro)
+    rallys = tabela.to_pandas().sort_values(['set_num', 'game_num', 'ordem_ponto'], kind='stable')
+    return tipar_rallys(rallys.reset_index(drop=True))
+
+def carregar_periodo(caminho, temporadas=None, adversario=None, colunas=None):
+    """Rallys de várias partidas para análises entre temporadas; só lê as partições pedidas"""
+    dataset = abrir_snapshot(caminho)
+    filtro = None
+    if temporadas is not None:
+        filtro = ds.field('temporada').isin(list(temporadas))
+    if adversario is not None:
+        condicao = ds.field('adversario') == adversario
+        filtro = condicao if filtro is None else filtro & condicao
+    tabela = dataset.to_table(columns=colunas, filter=filtro)
+    return tipar_rallys(tabela.to_pandas())
+
+# Publica o snapshot do banco atual: python -m tenis.snapshot
+if __name__ == "__main__":
+    from .criar_banco import conectar, geracao_atual
+    if not disponivel():
+        raise SystemExit("❌ pyarrow não instalado (pip install pyarrow)")
+    conn = conectar()
+    caminho = publicar_snapshot(conn, geracao_atual(conn))
+    conn.close()
+    print(f"✅ Snapshot publicado em {caminho}")
@@ -0,0 +1,126 @@
+import hashlib
+import itertools
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+# Importações em segundo plano (upload pelo dashboard). Cada planilha passa pelo
+# mesmo pipeline do enviar_dados_streaming num processo separado: a leitura com
+# openpyxl (Python puro) não disputa o GIL com o servidor do Streamlit, e quem está
+# só olhando o dashboard não sente a importação. Uma importação por vez (o SQLite
+# tem um único escritor); as outras esperam na fila. O banco fica em modo WAL para
+# as leituras do dashboard não esperarem o escritor.
+
+NA_FILA = 'na fila'
+IMPORTANDO = 'importando'
+CONCLUIDA = 'concluída'
+ERRO = 'erro'
+FINAIS = (CONCLUIDA, ERRO)
+
+# Fila de progresso do processo de importação (definida pelo initializer do pool)
+_progresso = None
+
+def _iniciar(fila):
+    global _progresso
+    _progresso = fila
+
+def _importar(tarefa_id, excel_path, db_path, origem, origem_bases):
+    """Roda no processo de importação: devolve os totais e a geração dos dados no fim"""
+    from .criar_banco import conectar, geracao_atual
+    from .importar_dados import enviar_dados_streaming
+    from .vigia import ativar_wal
+
+    conn = conectar(db_path)
+    ativar_wal(conn)
+    conn.close()
+    totais = enviar_dados_streaming(excel_path, db_path, progresso=lambda etapa, linhas: _progresso.put(
+        (tarefa_id, etapa, linhas)), origem=origem, origem_bases=origem_bases)
+    conn = conectar(db_path)
+    geracao = geracao_atual(conn)
+    conn.close()
+    return totais, geracao
+
+class Importador:
+    """Fila de importações em segundo plano, compartilhada por todas as sessões do dashboard
+
+    Com 'em_processo=False' a importação roda numa thread do próprio processo
+    (ambientes sem multiprocessing).
+    """
+
+    def __init__(self, db_path=None, em_processo=True):
+        self.db_path = db_path
+        self.tarefas = {}
+        self._ids = itertools.count(1)
+        self._trava = threading.Lock()
+        if em_processo:
+            # spawn: o processo filho não herda as threads do servidor
+            contexto = multiprocessing.get_context('spawn')
+            self._fila = contexto.Queue()
+            self._executor = ProcessPoolExecutor(1, mp_context=contexto, initializer=_iniciar,
+                                                 initargs=(self._fila,))
+        else:
+            self._fila = queue.Queue()
+            self._executor = ThreadPoolExecutor(1, initializer=_iniciar, initargs=(self._fila,))
+        threading.Thread(target=self._ouvir, daemon=True).start()
+
+    def enviar(self, conteudo, nome):
+        """Grava o conteúdo do upload num arquivo temporário e põe a importação na fila; devolve o id"""
+        descritor, caminho = tempfile.mkstemp(prefix="upload_", suffix=".xlsx")
+        with os.fdopen(descritor, 'wb') as arquivo:
+            arquivo.write(conteudo)
+        with self._trava:
+            tarefa_id = next(self._ids)
+            self.tarefas[tarefa_id] = {
+                'id': tarefa_id, 'arquivo': nome, 'estado': NA_FILA, 'etapa': None, 'linhas': 0,
+                'enviada_em': datetime.now().isoformat(timespec='seconds'), 'concluida_em': None,
+                'totais': None, 'geracao': None, 'erro': None,
+            }
+        # A numeração dos pontos segue o conteúdo, não o nome: o mesmo arquivo reenviado
+        # cai nas mesmas chaves, e outro 'jogo.xlsx' com pontos novos continua os games
+        origem_bases = f"upload:{hashlib.sha256(conteudo).hexdigest()}"
+        futuro = self._executor.submit(_importar, tarefa_id, caminho, self.db_path, nome, origem_bases)
+        futuro.add_done_callback(lambda f: self._concluir(tarefa_id, caminho, f))
+        return tarefa_id
+
+    def _ouvir(self):
+        while True:
+            tarefa_id, etapa, linhas = self._fila.get()
+            with self._trava:
+                tarefa = self.tarefas.get(tarefa_id)
+                # Mensagem atrasada de uma importação que já terminou não a reabre
+                if tarefa and tarefa['estado'] not in FINAIS:
+                    tarefa.update(estado=IMPORTANDO, etapa=etapa, linhas=linhas)
+
+    def _concluir(self, tarefa_id, caminho, futuro):
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+        fim = {'concluida_em': datetime.now().isoformat(timespec='seconds')}
+        try:
+            totais, geracao = futuro.result()
+            fim.update(estado=CONCLUIDA, totais=totais, geracao=geracao)
+        except Exception as e:
+            fim.update(estado=ERRO, erro=str(e) or type(e).__name__)
+        with self._trava:
+            self.tarefas[tarefa_id].update(fim)
+
+    def situacao(self, tarefa_id):
+        """Cópia do estado de uma importação (ou None)"""
+        with self._trava:
+            tarefa = self.tarefas.get(tarefa_id)
+            return dict(tarefa) if tarefa else None
+
+    def recentes(self, limite=5):
+        """Últimas importações enviadas, da mais nova para a mais antiga"""
+        with self._trava:
+            return [dict(t) for t in sorted(self.tarefas.values(), key=lambda t: -t['id'])[:limite]]
+
+    def em_andamento(self):
+        """True se há importação na fila ou rodando"""
+        with self._trava:
+            return any(t['estado'] not in FINAIS for t in self.tarefas.values())
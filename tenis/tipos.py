@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+# Flags 0/1 (podem faltar): inteiro anulável de 1 byte em vez de float64
+COLUNAS_FLAG = [
+    'ponto_num', 'ganhador_ponto', 'servidor', 'ace', 'primeiro_servico',
+    'falha_servico', 'devolucao_dentro', 'break_point', 'subiu_rede',
+]
+
+# Números pequenos: o menor inteiro anulável que comporta os valores
+COLUNAS_INTEIRAS = {
+    'partida_id': 'Int32',
+    'set_num': 'Int8',
+    'game_num': 'Int8',
+    'ordem_ponto': 'Int16',
+    'num_trocas': 'Int16',
+}
+
+# Texto com poucos valores distintos: dicionário (categoria) + códigos inteiros
+COLUNAS_TEXTO = ['tipo_ponto', 'golpe_vencedor', 'direcao_golpe', 'direcao_servico', 'placar']
+
+def tipar_flags(df):
+    """Converte as flags 0/1 presentes em df para Int8 anulável (no próprio df)"""
+    for col in COLUNAS_FLAG:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col]).astype('Int8')
+    return df
+
+def tipar_rallys(df):
+    """Representação compacta dos rallys: flags Int8, números pequenos e texto categórico"""
+    tipar_flags(df)
+    for col, tipo in COLUNAS_INTEIRAS.items():
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col]).astype(tipo)
+    for col in COLUNAS_TEXTO:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+def valores(serie):
+    """Array float de uma coluna numérica (anulável ou não), com NaN onde falta valor"""
+    return serie.to_numpy(dtype=float, na_value=np.nan)
@@ -0,0 +1,112 @@
+import hashlib
+import os
+import sys
+import time
+from datetime import datetime
+from .criar_banco import DB_PATH, conectar
+from .importar_dados import enviar_lote, listar_planilhas
+
+# Importação contínua: vigia uma pasta e importa só planilhas novas ou alteradas
+INTERVALO_SEGUNDOS = 5
+# Arquivos modificados há menos que isso podem estar sendo copiados/salvos
+TEMPO_ESTAVEL = 2
+
+def hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    """sha256 do conteúdo, lido em blocos"""
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+def ativar_wal(conn):
+    """Modo WAL (persistente no arquivo): leitores do dashboard não esperam o escritor"""
+    return conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+
+def planilhas_pendentes(conn, pasta):
+    """Planilhas da pasta cujo conteúdo ainda não foi processado: [(caminho, hash, tamanho, mtime)]"""
+    pendentes = []
+    agora = time.time()
+    for caminho in listar_planilhas([pasta]):
+        info = os.stat(caminho)
+        if agora - info.st_mtime < TEMPO_ESTAVEL:
+            continue
+        # Mesmo caminho, tamanho e mtime já registrados: nem precisa ler o arquivo
+        if conn.execute(
+            "SELECT 1 FROM Arquivos_Importados WHERE caminho = ? AND mtime = ? AND tamanho = ?",
+            (caminho, info.st_mtime, info.st_size)
+        ).fetchone():
+            continue
+        digest = hash_arquivo(caminho)
+        anterior = conn.execute(
+            "SELECT caminho FROM Arquivos_Importados WHERE hash = ? AND status != 'duplicado'", (digest,)
+        ).fetchone()
+        if anterior and anterior[0] != caminho:
+            # Mesmo conteúdo de outra planilha já processada (cópia): registra e não reimporta
+            registrar(conn, [(caminho, digest, info.st_size, info.st_mtime)],
+                      {caminho: {'status': 'duplicado', 'erro': f"igual a {anterior[0]}"}})
+            continue
+        if anterior:
+            # Só o mtime mudou (arquivo tocado/salvo sem alteração)
+            conn.execute("UPDATE Arquivos_Importados SET mtime = ?, tamanho = ? WHERE caminho = ?",
+                         (info.st_mtime, info.st_size, caminho))
+            conn.commit()
+            continue
+        pendentes.append((caminho, digest, info.st_size, info.st_mtime))
+    return pendentes
+
+def registrar(conn, arquivos, resumo):
+    """Grava o resultado de cada planilha; com erro, ela só volta a ser tentada se mudar"""
+    agora = datetime.now().isoformat(timespec='seconds')
+    conn.executemany(
+        "INSERT OR REPLACE INTO Arquivos_Importados "
+        "(caminho, hash, tamanho, mtime, status, erro, importado_em) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(caminho, digest, tamanho, mtime, resumo[caminho]['status'], resumo[caminho].get('erro'), agora)
+         for caminho, digest, tamanho, mtime in arquivos]
+    )
+    conn.commit()
+
+def ciclo(pasta, db_path=None):
+    """Uma varredura da pasta: importa as planilhas pendentes e devolve o resumo"""
+    conn = conectar(db_path)
+    try:
+        pendentes = planilhas_pendentes(conn, pasta)
+    finally:
+        conn.close()
+    if not pendentes:
+        return {}
+
+    # A importação em lote atualiza estatísticas, geração e snapshot
+    resumo = enviar_lote([caminho for caminho, *_ in pendentes], db_path=db_path)
+
+    conn = conectar(db_path)
+    try:
+        registrar(conn, pendentes, resumo)
+    finally:
+        conn.close()
+    return resumo
+
+def vigiar(pasta, db_path=None, intervalo=INTERVALO_SEGUNDOS):
+    """Laço de importação contínua (Ctrl+C para sair)"""
+    conn = conectar(db_path)
+    modo = ativar_wal(conn)
+    conn.close()
+    print(f"👀 Vigiando {pasta} a cada {intervalo}s (banco {db_path or DB_PATH}, journal {modo})")
+    try:
+        while True:
+            ciclo(pasta, db_path)
+            time.sleep(intervalo)
+    except KeyboardInterrupt:
+        print("\n⏹️ Importação contínua encerrada")
+
+# python -m tenis.vigia PASTA [--intervalo SEGUNDOS]
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    intervalo = INTERVALO_SEGUNDOS
+    if "--intervalo" in argumentos:
+        i = argumentos.index("--intervalo")
+        intervalo = float(argumentos[i + 1])
+        argumentos = argumentos[:i] + argumentos[i + 2:]
+    if not argumentos:
+        raise SystemExit("Uso: python -m tenis.vigia PASTA [--intervalo SEGUNDOS]")
+    vigiar(argumentos[0], intervalo=intervalo)
@@ -0,0 +1,13 @@
+from tenis.estatisticas import calcular_estatisticas
+from tenis.gerar_dados import gerar_dados
+
+def test_erros_por_golpe_cabem_no_total_de_erros():
+    _, rallys = gerar_dados(3000, semente=1)
+    stats = calcular_estatisticas(rallys)
+    outros = stats['total_erros'] - stats['erros_backhand'] - stats['erros_forehand']
+    assert (outros >= 0).all()
+    # Nos dados sintéticos há erros de backhand e de forehand
+    assert stats['erros_backhand'].sum() > 0 and stats['erros_forehand'].sum() > 0
+    # Golpe de winner não conta como erro
+    winners = rallys['tipo_ponto'] == 'Winner'
+    assert (calcular_estatisticas(rallys[winners])[['erros_backhand', 'erros_forehand']] == 0).all().all()
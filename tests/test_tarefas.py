@@ -0,0 +1,45 @@
+import sqlite3
+import time
+import pandas as pd
+from tenis.gerar_dados import COLUNAS_DIGITACAO, COLUNAS_PARTIDAS, escrever_planilha
+from tenis.tarefas import FINAIS, Importador
+
+PARTIDAS = pd.DataFrame([["2025-03-01", "Jefferson", 120, "V", 90, "Saibro", "Sol", 2, 4, 1, ""]],
+                        columns=COLUNAS_PARTIDAS)
+
+def rallys(ganhadores):
+    """Pontos do game 1 da partida 1, na ordem, sem as colunas que as regras preenchem"""
+    df = pd.DataFrame({col: [None] * len(ganhadores) for col in COLUNAS_DIGITACAO})
+    df['partida_id'] = 1
+    df['set_num'] = 1
+    df['game_num'] = 1
+    df['servidor'] = 1
+    df['ponto_num'] = ganhadores
+    df['num_trocas'] = range(3, 3 + len(ganhadores))
+    return df
+
+def enviar(importador, caminho, partidas, pontos, nome):
+    escrever_planilha(partidas, pontos, caminho)
+    with open(caminho, 'rb') as arquivo:
+        tarefa_id = importador.enviar(arquivo.read(), nome)
+    while importador.situacao(tarefa_id)['estado'] not in FINAIS:
+        time.sleep(0.05)
+    return importador.situacao(tarefa_id)
+
+def test_uploads_diferentes_com_o_mesmo_nome(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = str(tmp_path / "tenis.db")
+    importador = Importador(db, em_processo=False)
+    planilha = str(tmp_path / "jogo.xlsx")
+    enviar(importador, planilha, PARTIDAS, rallys([1, 0, 1]), "jogo.xlsx")
+    # Outro 'jogo.xlsx', só com os pontos novos do mesmo game
+    segunda = enviar(importador, planilha, PARTIDAS.iloc[:0], rallys([1, 1, 0]), "jogo.xlsx")
+    # Reenviar o mesmo arquivo não duplica
+    terceira = enviar(importador, planilha, PARTIDAS.iloc[:0], rallys([1, 1, 0]), "jogo.xlsx")
+
+    assert segunda['totais']['rallys'] == 3 and segunda['totais']['ignorados'] == 0
+    assert terceira['totais']['rallys'] == 0
+    conn = sqlite3.connect(db)
+    ordem = [linha[0] for linha in conn.execute("SELECT ordem_ponto FROM rallys ORDER BY ordem_ponto")]
+    conn.close()
+    assert ordem == [1, 2, 3, 4, 5, 6]